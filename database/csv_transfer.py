@@ -0,0 +1,263 @@
+# src/database/csv_transfer.py
+"""
+Bulk CSV import and export for tasks.
+
+Importing happens in two steps so the slow part can run off the GUI thread:
+
+1. parse_task_csv() streams the file and builds a TaskImportPlan. It only
+   touches the file, so it is safe to run on a worker thread.
+2. insert_import_plan() resolves categories and parent titles with a
+   handful of queries and inserts every task, link and file with
+   executemany in one transaction, on the thread that owns the database
+   connection.
+
+export_tasks_csv() streams tasks with their links and files from a cursor
+in fetchmany() chunks, so memory use does not grow with the database. It
+should be given its own connection when run on a worker thread.
+
+Links and files are written one per line inside their cell.
+"""
+
+import csv
+import os
+import tempfile
+from collections import namedtuple
+
+from database.task_queries import MAX_IN_CLAUSE_IDS, ORDER_GAP, next_display_order, _in_transaction
+from utils.debug_logger import get_debug_logger
+debug = get_debug_logger()
+
+CSV_COLUMNS = ['Title', 'Description', 'Link', 'Status', 'Priority',
+               'Due Date', 'Category', 'Parent', 'Completed At']
+EXPORT_COLUMNS = CSV_COLUMNS + ['Files']
+
+# Rows between progress callbacks
+PROGRESS_INTERVAL = 500
+
+# Rows fetched from the cursor at a time while exporting
+EXPORT_CHUNK_SIZE = 500
+
+ImportedTask = namedtuple("ImportedTask", ["title", "description", "links", "files", "status", "priority",
+                                           "due_date", "category", "parent_title", "completed_at"])
+
+
+class TransferCancelled(Exception):
+    """Raised when a CSV transfer is cancelled part way through"""
+
+
+class TaskImportPlan:
+    """Tasks read from a CSV file, in file order, ready to insert"""
+
+    def __init__(self):
+        self.tasks = []
+        # Title -> index of the first task with that title, for parent lookups
+        self.index_by_title = {}
+
+    def add(self, task):
+        self.index_by_title.setdefault(task.title, len(self.tasks))
+        self.tasks.append(task)
+
+    def __len__(self):
+        return len(self.tasks)
+
+
+def parse_task_csv(file_path, progress=None, is_cancelled=None):
+    """Stream a task CSV (see CSV_COLUMNS) into a TaskImportPlan.
+
+    progress(rows_read) is called every PROGRESS_INTERVAL rows. Raises
+    TransferCancelled if is_cancelled() becomes true. Rows without a title
+    are skipped.
+    """
+    plan = TaskImportPlan()
+    with open(file_path, 'r', newline='') as file:
+        for row_number, row in enumerate(csv.DictReader(file), 1):
+            if row_number % PROGRESS_INTERVAL == 0:
+                if is_cancelled and is_cancelled():
+                    raise TransferCancelled(f"Import cancelled after {row_number} rows")
+                if progress:
+                    progress(row_number)
+
+            title = (row.get('Title') or '').strip()
+            if not title:
+                continue
+            plan.add(ImportedTask(
+                title=title,
+                description=row.get('Description') or '',
+                links=_split_cell(row.get('Link')),
+                files=_split_cell(row.get('Files')),
+                status=row.get('Status') or 'Not Started',
+                priority=row.get('Priority') or 'Medium',
+                due_date=row.get('Due Date') or '',
+                category=row.get('Category') or '',
+                parent_title=(row.get('Parent') or '').strip(),
+                completed_at=row.get('Completed At') or None
+            ))
+
+    if progress:
+        progress(len(plan))
+    debug.debug(f"Parsed {len(plan)} tasks from {file_path}")
+    return plan
+
+
+def _split_cell(value):
+    """Non-empty lines of a multi-value cell"""
+    return [line.strip() for line in (value or '').splitlines() if line.strip()]
+
+
+def _existing_ids_by_title(cursor, titles):
+    """Map titles to the oldest existing task with that title"""
+    titles = list(titles)
+    found = {}
+    for start in range(0, len(titles), MAX_IN_CLAUSE_IDS):
+        chunk = titles[start:start + MAX_IN_CLAUSE_IDS]
+        cursor.execute(f"""
+            SELECT title, MIN(id) FROM tasks
+            WHERE title IN ({', '.join('?' * len(chunk))})
+            GROUP BY title
+        """, chunk)
+        found.update(cursor.fetchall())
+    return found
+
+
+def _break_parent_cycles(parents):
+    """Drop parent links that would make tasks in the file each other's ancestors.
+
+    parents maps task index -> parent index within the file (or None).
+    """
+    settled = set()
+    for index in range(len(parents)):
+        chain = []
+        current = index
+        while current is not None and current not in settled and current not in chain:
+            chain.append(current)
+            current = parents[current]
+        if current is not None and current in chain:
+            debug.warning(f"Ignoring circular parent for imported task {current}")
+            parents[current] = None
+        settled.update(chain)
+
+
+def insert_import_plan(conn, plan):
+    """Insert every task, link and file of plan in one transaction.
+
+    Parents are matched by title, first among the imported tasks and then
+    among existing tasks. Categories that do not exist are left empty.
+    Returns the list of new task IDs in file order.
+    """
+    if not plan.tasks:
+        return []
+
+    def work(cursor):
+        cursor.execute("SELECT name, id FROM categories")
+        category_ids = dict(cursor.fetchall())
+
+        parent_titles = {task.parent_title for task in plan.tasks if task.parent_title}
+        existing_parents = _existing_ids_by_title(
+            cursor, (title for title in parent_titles if title not in plan.index_by_title))
+
+        # New IDs are allocated up front so children can refer to parents
+        # that appear later in the file
+        cursor.execute("SELECT COALESCE(MAX(id), 0) FROM tasks")
+        first_id = cursor.fetchone()[0] + 1
+
+        in_file_parents = []
+        for index, task in enumerate(plan.tasks):
+            parent_index = plan.index_by_title.get(task.parent_title)
+            in_file_parents.append(parent_index if parent_index != index else None)
+        _break_parent_cycles(in_file_parents)
+
+        next_orders = {}
+        task_rows = []
+        link_rows = []
+        file_rows = []
+        for index, task in enumerate(plan.tasks):
+            task_id = first_id + index
+            if in_file_parents[index] is not None:
+                parent_id = first_id + in_file_parents[index]
+            else:
+                parent_id = existing_parents.get(task.parent_title)
+
+            # Append after existing siblings, in file order
+            if parent_id not in next_orders:
+                next_orders[parent_id] = (ORDER_GAP if parent_id is not None and parent_id >= first_id
+                                          else next_display_order(conn, parent_id))
+            display_order = next_orders[parent_id]
+            next_orders[parent_id] += ORDER_GAP
+
+            task_rows.append((task_id, task.title, task.description, task.status, task.priority,
+                              task.due_date, category_ids.get(task.category), parent_id,
+                              display_order, task.completed_at))
+            link_rows.extend((task_id, url, None, order) for order, url in enumerate(task.links))
+            file_rows.extend((task_id, path, os.path.basename(path), order)
+                             for order, path in enumerate(task.files))
+
+        cursor.executemany("""
+            INSERT INTO tasks (id, title, description, status, priority, due_date,
+                               category_id, parent_id, display_order, completed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, task_rows)
+        cursor.executemany(
+            "INSERT INTO links (task_id, url, label, display_order) VALUES (?, ?, ?, ?)", link_rows)
+        cursor.executemany(
+            "INSERT INTO files (task_id, file_path, file_name, display_order) VALUES (?, ?, ?, ?)", file_rows)
+        return [row[0] for row in task_rows]
+
+    new_ids = _in_transaction(conn, work)
+    debug.debug(f"Imported {len(new_ids)} tasks")
+    return new_ids
+
+
+def export_tasks_csv(conn, file_path, progress=None, is_cancelled=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """Write every task, with its links and files, to file_path (see EXPORT_COLUMNS).
+
+    Rows are streamed in chunk_size batches. progress(rows_written, total)
+    is called after each batch. The file is written to a temporary name and
+    only replaces file_path once complete; if is_cancelled() becomes true the
+    partial file is removed and TransferCancelled is raised. Returns the
+    number of tasks written.
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT COUNT(*) FROM tasks")
+        total = cursor.fetchone()[0]
+
+        # Correlated subqueries use the task_id indexes, so each task's links
+        # and files arrive on its own row without a GROUP BY over everything
+        cursor.execute("""
+            SELECT t.title, t.description,
+                   (SELECT group_concat(url, char(10)) FROM
+                       (SELECT url FROM links WHERE task_id = t.id ORDER BY display_order)),
+                   t.status, t.priority, t.due_date, c.name, p.title, t.completed_at,
+                   (SELECT group_concat(file_path, char(10)) FROM
+                       (SELECT file_path FROM files WHERE task_id = t.id ORDER BY display_order))
+            FROM tasks t
+            LEFT JOIN categories c ON t.category_id = c.id
+            LEFT JOIN tasks p ON t.parent_id = p.id
+            ORDER BY t.id
+        """)
+
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(file_path)), suffix='.csv.tmp')
+        written = 0
+        try:
+            with os.fdopen(fd, 'w', newline='') as file:
+                writer = csv.writer(file)
+                writer.writerow(EXPORT_COLUMNS)
+                while True:
+                    if is_cancelled and is_cancelled():
+                        raise TransferCancelled(f"Export cancelled after {written} rows")
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    writer.writerows(rows)
+                    written += len(rows)
+                    if progress:
+                        progress(written, total)
+            os.replace(temp_path, file_path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+    finally:
+        cursor.close()
+
+    debug.debug(f"Exported {written} tasks to {file_path}")
+    return written
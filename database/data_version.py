@@ -0,0 +1,105 @@
+# src/database/data_version.py
+"""
+A version number that changes whenever task data in the memory database changes.
+
+TEMP triggers on the tables the task trees show append the affected task ID
+to a TEMP changelog (NULL for category changes, which can affect any task);
+the data version is the changelog's last sequence number. A tree remembers
+the version it was loaded at and skips reloading while it still matches,
+and changed_task_ids() tells whether everything changed since then has
+already been applied to it incrementally. Unlike Connection.total_changes
+the version ignores the database's own bookkeeping writes (incremental
+sync, change tracking).
+"""
+
+import sqlite3
+
+from utils.debug_logger import get_debug_logger
+debug = get_debug_logger()
+
+CHANGES_TABLE = "_data_changes"
+
+# Table -> expression giving the affected task ID of a NEW/OLD row
+VERSIONED_TABLES = {
+    "tasks": "{}.id",
+    "links": "{}.task_id",
+    "files": "{}.task_id",
+    "categories": "NULL",
+}
+
+
+def install_data_version(conn):
+    """Create the changelog and its triggers (safe to call again)"""
+    was_in_transaction = conn.in_transaction
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        CREATE TEMP TABLE IF NOT EXISTS {CHANGES_TABLE} (
+            version INTEGER PRIMARY KEY AUTOINCREMENT,
+            task_id INTEGER
+        )
+    """)
+
+    cursor.execute("SELECT name FROM main.sqlite_master WHERE type = 'table'")
+    existing = {row[0] for row in cursor.fetchall()}
+    # Trigger bodies cannot qualify table names; the TEMP table is found first
+    record = f"INSERT INTO {CHANGES_TABLE} (task_id) VALUES (%s);"
+    for table, task_id in VERSIONED_TABLES.items():
+        if table not in existing:
+            continue
+        old_id, new_id = task_id.format("OLD"), task_id.format("NEW")
+        bodies = {
+            "insert": record % new_id,
+            # A row moved to another task changes both
+            "update": record % new_id + (f" INSERT INTO {CHANGES_TABLE} (task_id) "
+                                         f"SELECT {old_id} WHERE {old_id} IS NOT {new_id};"),
+            "delete": record % old_id,
+        }
+        for event, body in bodies.items():
+            cursor.execute(f"""
+                CREATE TEMP TRIGGER IF NOT EXISTS _version_{table}_{event}
+                AFTER {event.upper()} ON main.{table} BEGIN {body} END
+            """)
+    if not was_in_transaction:
+        conn.commit()
+    debug.debug("Data version tracking installed")
+
+
+def get_data_version(conn):
+    """Current data version, installing the changelog on first use"""
+    try:
+        row = conn.execute("SELECT seq FROM temp.sqlite_sequence WHERE name = ?", (CHANGES_TABLE,)).fetchone()
+        if row is None:
+            # Nothing logged yet, but make sure the triggers exist
+            conn.execute(f"SELECT 1 FROM temp.{CHANGES_TABLE} LIMIT 1")
+    except sqlite3.OperationalError:
+        install_data_version(conn)
+        row = None
+    return row[0] if row else 0
+
+
+def changed_task_ids(conn, since_version):
+    """IDs of the tasks changed after since_version.
+
+    Returns None if the changes cannot be pinned to tasks (a category
+    changed) or the log no longer reaches back that far.
+    """
+    if get_data_version(conn) == since_version:
+        return set()
+    oldest = conn.execute(f"SELECT MIN(version) FROM temp.{CHANGES_TABLE}").fetchone()[0]
+    if oldest is None or oldest > since_version + 1:
+        return None
+    task_ids = set()
+    for (task_id,) in conn.execute(f"SELECT task_id FROM temp.{CHANGES_TABLE} WHERE version > ?",
+                                   (since_version,)):
+        if task_id is None:
+            return None
+        task_ids.add(task_id)
+    return task_ids
+
+
+def prune_data_changes(conn, up_to_version):
+    """Forget changes at or before up_to_version (no tree needs them any more)"""
+    was_in_transaction = conn.in_transaction
+    conn.execute(f"DELETE FROM temp.{CHANGES_TABLE} WHERE version <= ?", (up_to_version,))
+    if not was_in_transaction:
+        conn.commit()
@@ -6,7 +6,8 @@ import sys
 import os
 
 # Import our centralized database configuration
-from database.db_config import db_config, get_db_path, get_db_connection
+from database.db_config import db_config, get_db_path, get_db_connection, ensure_db_exists
+from database.task_queries import get_task_attachments
 
 # Import debug logger
 from utils.debug_logger import get_debug_logger
@@ -50,6 +51,11 @@ class DatabaseManager:
             return [(row[0], row[1], row[2]) for row in results]
         finally:
             cursor.close()
+    
+    def get_task_attachments(self, task_ids=None):
+        """Get links and files for many tasks with one query per table"""
+        debug.debug(f"Bulk loading attachments for {len(task_ids) if task_ids is not None else 'all'} tasks")
+        return get_task_attachments(self.get_connection(), task_ids)
             
     @property
     def db_path(self):
@@ -74,10 +80,8 @@ class DatabaseManager:
         # Create a new connection if none exists
         if self._connection is None:
             debug.debug("No existing connection, creating new one")
-            # Ensure the database exists
-            if not db_config.database_exists():
-                debug.debug("Database doesn't exist, creating it")
-                db_config.create_database()
+            # Ensure the database exists and has the current indexes
+            ensure_db_exists()
                 
             # Get a connection from the central configuration
             debug.debug("Getting connection from central configuration")
@@ -147,6 +151,11 @@ class DatabaseManager:
         finally:
             cursor.close()
     
+    def transaction(self):
+        """Group several statements into one commit; rolls back if the block raises"""
+        from database.unit_of_work import transaction
+        return transaction(self)
+    
     def get_last_row_id(self):
         """Get the ID of the last inserted row"""
         debug.debug("Getting last row ID")
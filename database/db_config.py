@@ -44,8 +44,8 @@ class DatabaseConfig:
         try:
             debug.debug("Loading database path from settings")
             # Import the settings manager
-            from ui.app_settings import SettingsManager
-            settings = SettingsManager()
+            from ui.app_settings import get_settings_manager
+            settings = get_settings_manager()
             
             # Get path from settings
             self._db_path = Path(settings.get_setting("database_path"))
@@ -79,8 +79,8 @@ class DatabaseConfig:
         # Update settings if possible
         try:
             debug.debug("Updating database path in settings")
-            from ui.app_settings import SettingsManager
-            settings = SettingsManager()
+            from ui.app_settings import get_settings_manager
+            settings = get_settings_manager()
             settings.set_setting("database_path", str(new_path))
         except Exception as e:
             debug.error(f"Error updating path in settings: {e}")
@@ -281,7 +281,40 @@ class DatabaseConfig:
         cursor.execute("""
             CREATE INDEX IF NOT EXISTS idx_files_task_id ON files (task_id)
         """)
+        
+        self._create_indexes(cursor)
         debug.debug("All tables created successfully")
+
+    def _create_indexes(self, cursor):
+        """Create indexes added after the first schema; safe to run on any database"""
+        cursor.execute("PRAGMA table_info(tasks)")
+        columns = [info[1] for info in cursor.fetchall()]
+        
+        # Add index for the subtree queries, which walk tasks by parent_id
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_tasks_parent_id ON tasks (parent_id)
+        """)
+        
+        # Add index so imports can skip Bee items that already exist
+        if 'bee_item_id' in columns:
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_tasks_bee_item_id ON tasks (bee_item_id)
+            """)
+    
+    def upgrade_database(self):
+        """Add indexes missing from a database created by an older version"""
+        debug.debug(f"Upgrading database at {self.path}")
+        try:
+            conn = self.connection()
+            try:
+                self._create_indexes(conn.cursor())
+                conn.commit()
+            finally:
+                conn.close()
+            return True
+        except Exception as e:
+            debug.error(f"Error upgrading database: {e}")
+            return False
     
 # Create a global instance to be imported by other modules
 db_config = DatabaseConfig()
@@ -309,5 +342,5 @@ def ensure_db_exists():
     if not db_config.database_exists():
         debug.debug("Database does not exist, creating it")
         return db_config.create_database()
-    debug.debug("Database exists")
-    return True
\ No newline at end of file
+    debug.debug("Database exists, checking its indexes")
+    return db_config.upgrade_database()
\ No newline at end of file
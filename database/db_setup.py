@@ -14,7 +14,7 @@ debug = get_debug_logger()
 
 # Import settings manager
 sys.path.append(str(Path(__file__).parent.parent))
-from ui.app_settings import SettingsManager
+from ui.app_settings import get_settings_manager
 
 def init_database():
     """Initialize the database with the required schema"""
@@ -32,7 +32,7 @@ def setup_database(parent_widget=None):
     """Complete database setup process with user interaction"""
     debug.debug("Setting up database with user interaction")
     # Use settings manager
-    settings = SettingsManager()
+    settings = get_settings_manager()
     
     # Prompt for database location if needed
     debug.debug("Prompting for database location")
@@ -86,7 +86,7 @@ def setup_database(parent_widget=None):
 if __name__ == "__main__":
     # When run directly, use settings manager
     debug.debug("db_setup.py running as main script")
-    settings = SettingsManager()
+    settings = get_settings_manager()
     db_path = Path(settings.prompt_for_database_location())
     
     # Update the path in our central configuration
@@ -0,0 +1,297 @@
+# src/database/incremental_sync.py
+"""
+Incremental sync from the in-memory database to the database file.
+
+TEMP triggers on every tracked table record the primary keys of changed
+rows in a TEMP changelog (TEMP objects live only on the memory connection,
+so they are never saved into the file). A save is split in two:
+
+- prepare() runs on the thread that owns the memory connection. It reads
+  the changed rows out of memory and clears the changelog, so its cost
+  follows the number of edits rather than the size of the database.
+- The returned SyncJob's run() writes them to the file on its own
+  connection, in one transaction, and can run on a worker thread.
+
+Whenever rows alone cannot describe the change (first sync, schema changes,
+tables without an integer "id" key, a missing file) prepare() instead takes
+an in-memory snapshot and the job writes it with a page-stepped backup,
+starting a new checkpoint. A job that fails hands its rows back with
+job_failed(), and the next prepare() writes them again.
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from utils.debug_logger import get_debug_logger
+debug = get_debug_logger()
+
+CHANGELOG_TABLE = "_sync_changes"
+
+# Largest ID list bound into one "IN (...)" clause (older SQLite caps host parameters at 999)
+MAX_IN_CLAUSE_IDS = 900
+
+
+class SchemaMismatch(Exception):
+    """The file's tables no longer match the memory schema; a full sync is needed"""
+
+
+class SyncJob:
+    """Changes captured by IncrementalSync.prepare(), written to the file by run()"""
+
+    def __init__(self, target_path, mode, rows=None, snapshot=None, pages=256):
+        self.target_path = target_path
+        self.mode = mode
+        # table -> (columns, changed row ids, current rows of those ids)
+        self.rows = rows or {}
+        self.snapshot = snapshot
+        self.pages = pages
+
+    @property
+    def changed(self):
+        return sum(len(row_ids) for _, row_ids, _ in self.rows.values())
+
+    def run(self):
+        """Write the captured changes to the file; safe to call on any thread"""
+        start_time = time.time()
+        if self.mode == "full":
+            self._write_snapshot()
+        else:
+            self._write_rows()
+        debug.debug(f"{self.mode.title()} sync wrote {self.changed} rows in {time.time() - start_time:.3f} seconds")
+
+    def close(self):
+        if self.snapshot is not None:
+            self.snapshot.close()
+            self.snapshot = None
+
+    def _write_snapshot(self):
+        target = sqlite3.connect(self.target_path)
+        try:
+            self.snapshot.backup(target, pages=self.pages)
+        finally:
+            target.close()
+            self.close()
+
+    def _write_rows(self):
+        if not self.rows:
+            return
+        # A fresh connection has foreign keys off, so re-copying a row never
+        # cascades away children we are not re-copying
+        target = sqlite3.connect(self.target_path)
+        try:
+            cursor = target.cursor()
+            for table, (columns, _, _) in self.rows.items():
+                cursor.execute(f"PRAGMA main.table_info({table})")
+                if [row[1] for row in cursor.fetchall()] != columns:
+                    raise SchemaMismatch(f"Table {table} differs from the file schema")
+
+            cursor.execute("BEGIN")
+            try:
+                for table, (columns, row_ids, rows) in self.rows.items():
+                    cursor.executemany(f"DELETE FROM {table} WHERE id = ?", [(row_id,) for row_id in row_ids])
+                    cursor.executemany(f"INSERT INTO {table} ({', '.join(columns)}) "
+                                       f"VALUES ({', '.join('?' * len(columns))})", rows)
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+        finally:
+            target.close()
+
+
+class IncrementalSync:
+    """Persist rows changed since the last checkpoint into the database file"""
+
+    def __init__(self, connection_factory, target_path, pages=256):
+        self.connection_factory = connection_factory
+        self.target_path = str(target_path)
+        self.pages = pages
+        self.tables = []
+        self._untracked = []
+        self._schema_version = None
+        self.last_sync_mode = None
+
+        # Rows of failed jobs (table -> row ids), written again by the next
+        # prepare(); job_failed() may be called from a worker thread
+        self._lock = threading.Lock()
+        self._retry_ids = {}
+        self._force_full = False
+
+    # --- setup ---
+
+    def start(self, in_sync=True):
+        """Install change tracking.
+
+        Pass in_sync=True when the memory database was just loaded from the
+        target file, so the file already is the checkpoint; otherwise the
+        first sync() writes a full copy.
+        """
+        conn = self.connection_factory()
+        self._install(conn)
+        self._schema_version = self._get_schema_version(conn) if in_sync else None
+        debug.debug(f"Incremental sync tracking {len(self.tables)} tables (in_sync={in_sync})")
+
+    def _install(self, conn):
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            CREATE TEMP TABLE IF NOT EXISTS {CHANGELOG_TABLE} (
+                tbl TEXT NOT NULL,
+                row_id INTEGER NOT NULL,
+                PRIMARY KEY (tbl, row_id)
+            )
+        """)
+
+        self.tables = []
+        self._untracked = []
+        cursor.execute("""
+            SELECT name, sql FROM main.sqlite_master
+            WHERE type = 'table' AND name NOT LIKE 'sqlite_%'
+        """)
+        for name, sql in cursor.fetchall():
+            if (sql or "").upper().startswith("CREATE VIRTUAL"):
+                continue
+            if self._has_integer_id(cursor, name):
+                self.tables.append(name)
+            else:
+                self._untracked.append(name)
+
+        for table in self.tables:
+            record = f"INSERT OR IGNORE INTO {CHANGELOG_TABLE} VALUES ('{table}', %s.id);"
+            cursor.execute(f"""
+                CREATE TEMP TRIGGER IF NOT EXISTS _sync_{table}_insert
+                AFTER INSERT ON main.{table} BEGIN {record % 'NEW'} END
+            """)
+            cursor.execute(f"""
+                CREATE TEMP TRIGGER IF NOT EXISTS _sync_{table}_update
+                AFTER UPDATE ON main.{table} BEGIN {record % 'OLD'} {record % 'NEW'} END
+            """)
+            cursor.execute(f"""
+                CREATE TEMP TRIGGER IF NOT EXISTS _sync_{table}_delete
+                AFTER DELETE ON main.{table} BEGIN {record % 'OLD'} END
+            """)
+        conn.commit()
+
+    def _has_integer_id(self, cursor, table, schema="main"):
+        cursor.execute(f"PRAGMA {schema}.table_info({table})")
+        return any(name == "id" and pk and (col_type or "").upper() == "INTEGER"
+                   for _, name, col_type, _, _, pk in cursor.fetchall())
+
+    def _get_schema_version(self, conn):
+        return conn.execute("PRAGMA main.schema_version").fetchone()[0]
+
+    # --- state ---
+
+    def pending_changes(self):
+        """Number of changed rows waiting to be written"""
+        with self._lock:
+            retry = sum(len(row_ids) for row_ids in self._retry_ids.values())
+            if self._force_full:
+                retry += 1
+        conn = self.connection_factory()
+        try:
+            return retry + conn.execute(f"SELECT COUNT(*) FROM temp.{CHANGELOG_TABLE}").fetchone()[0]
+        except sqlite3.OperationalError:
+            return retry
+
+    def needs_full_sync(self):
+        """Whether the next sync has to copy the whole database"""
+        with self._lock:
+            if self._force_full:
+                return True
+        if self._schema_version is None or self._untracked:
+            return True
+        if not Path(self.target_path).exists():
+            return True
+        return self._get_schema_version(self.connection_factory()) != self._schema_version
+
+    # --- syncing ---
+
+    def prepare(self):
+        """Capture the changes since the last checkpoint as a SyncJob.
+
+        Must be called on the thread that owns the memory connection. Returns
+        None without doing anything if that connection has an open
+        transaction (its changes are not committed yet); try again later.
+        """
+        conn = self.connection_factory()
+        if conn.in_transaction:
+            debug.debug("Memory database has an open transaction, deferring sync")
+            return None
+
+        if self.needs_full_sync():
+            job = self._prepare_full(conn)
+        else:
+            job = self._prepare_rows(conn)
+        self.last_sync_mode = job.mode
+        return job
+
+    def job_failed(self, job, error=None):
+        """Hand a failed job's rows back so the next prepare() writes them again"""
+        with self._lock:
+            if job.mode == "full" or isinstance(error, SchemaMismatch):
+                self._force_full = True
+            for table, (_, row_ids, _) in job.rows.items():
+                self._retry_ids.setdefault(table, set()).update(row_ids)
+        job.close()
+
+    def sync(self):
+        """Write changes since the last checkpoint to the file, on this thread.
+
+        Returns False if the memory connection has an open transaction.
+        """
+        job = self.prepare()
+        if job is None:
+            return False
+        try:
+            job.run()
+        except Exception as e:
+            self.job_failed(job, e)
+            raise
+        return True
+
+    def _prepare_full(self, conn):
+        debug.debug(f"Preparing full sync of memory database to {self.target_path}")
+        snapshot = sqlite3.connect(":memory:", check_same_thread=False)
+        conn.backup(snapshot, pages=self.pages)
+
+        # Schema may have changed (e.g. new columns), so re-create the triggers;
+        # the snapshot holds every change up to here
+        self._install(conn)
+        conn.execute(f"DELETE FROM temp.{CHANGELOG_TABLE}")
+        conn.commit()
+        self._schema_version = self._get_schema_version(conn)
+        with self._lock:
+            self._retry_ids = {}
+            self._force_full = False
+        return SyncJob(self.target_path, "full", snapshot=snapshot, pages=self.pages)
+
+    def _prepare_rows(self, conn):
+        with self._lock:
+            changes = {table: set(row_ids) for table, row_ids in self._retry_ids.items()}
+            self._retry_ids = {}
+        cursor = conn.cursor()
+        for table, row_id in cursor.execute(f"SELECT tbl, row_id FROM temp.{CHANGELOG_TABLE}"):
+            changes.setdefault(table, set()).add(row_id)
+
+        rows = {}
+        for table, row_ids in changes.items():
+            columns = self._columns(cursor, "main", table)
+            row_ids = sorted(row_ids)
+            current = []
+            for start in range(0, len(row_ids), MAX_IN_CLAUSE_IDS):
+                chunk = row_ids[start:start + MAX_IN_CLAUSE_IDS]
+                cursor.execute(f"SELECT {', '.join(columns)} FROM main.{table} "
+                               f"WHERE id IN ({', '.join('?' * len(chunk))})", chunk)
+                current.extend(cursor.fetchall())
+            rows[table] = (columns, row_ids, current)
+
+        # The job now owns these changes; job_failed() puts them back
+        cursor.execute(f"DELETE FROM temp.{CHANGELOG_TABLE}")
+        conn.commit()
+        return SyncJob(self.target_path, "incremental", rows=rows, pages=self.pages)
+
+    def _columns(self, cursor, schema, table):
+        cursor.execute(f"PRAGMA {schema}.table_info({table})")
+        return [row[1] for row in cursor.fetchall()]
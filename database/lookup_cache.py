@@ -0,0 +1,107 @@
+# src/database/lookup_cache.py
+"""
+Process-wide cache of the small lookup tables (statuses, priorities and
+categories).
+
+The task delegate needs a colour for every pill it paints, so reading these
+tables from SQLite on each paint() made scrolling hit the database every
+frame. The tables only change through the settings screens, which call
+invalidate() after committing; everything else reads from memory. A failed
+load is cached as empty tables until the next invalidate().
+"""
+
+from utils.debug_logger import get_debug_logger
+debug = get_debug_logger()
+
+# Lookup kind -> (table name, has display_order column)
+LOOKUP_TABLES = {
+    "status": ("statuses", True),
+    "priority": ("priorities", True),
+    "category": ("categories", False),
+}
+
+
+class LookupCache:
+    """Name -> (color, display_order) maps for each lookup table, loaded lazily"""
+
+    def __init__(self, connection_factory=None):
+        # connection_factory returns a connection usable as a context manager;
+        # defaults to the in-memory database the app edits (the settings
+        # screens commit there, so the file would be stale until the next save)
+        self.connection_factory = connection_factory
+        self._tables = None
+        # Set when the last load failed. The empty result is cached like a
+        # successful one, so painting does not query the database again
+        # until invalidate() asks for a retry
+        self.load_failed = False
+        # Bumped on every invalidate() so callers holding derived data
+        # (e.g. QColor objects) know when to drop it
+        self.version = 0
+
+    def _get_connection(self):
+        if self.connection_factory is not None:
+            return self.connection_factory()
+        from database.memory_db_manager import get_memory_db_manager
+        return get_memory_db_manager().get_connection()
+
+    def _load(self):
+        tables = {}
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            for kind, (table_name, ordered) in LOOKUP_TABLES.items():
+                order_column = "display_order" if ordered else "NULL"
+                cursor.execute(f"SELECT name, color, {order_column} FROM {table_name}")
+                tables[kind] = {name: (color, order) for name, color, order in cursor.fetchall()}
+        debug.debug("Lookup cache loaded: " +
+                    ", ".join(f"{len(rows)} {kind} rows" for kind, rows in tables.items()))
+        return tables
+
+    def _table(self, kind):
+        if self._tables is None:
+            try:
+                self._tables = self._load()
+            except Exception as e:
+                debug.error(f"Error loading lookup cache: {e}")
+                self._tables = {}
+                self.load_failed = True
+        return self._tables.get(kind, {})
+
+    def get_color(self, kind, name, default=None):
+        """Get the stored color string for a status/priority/category name"""
+        entry = self._table(kind).get(name)
+        return entry[0] if entry else default
+
+    def get_display_order(self, kind, name, default=None):
+        """Get the display_order for a status or priority name"""
+        entry = self._table(kind).get(name)
+        if entry is None or entry[1] is None:
+            return default
+        return entry[1]
+
+    def get_names(self, kind):
+        """Get all names of a lookup kind, in display order where there is one"""
+        rows = self._table(kind)
+        return sorted(rows, key=lambda name: (rows[name][1] is None, rows[name][1] or 0, name))
+
+    def invalidate(self):
+        """Drop cached rows; call after committing changes to a lookup table"""
+        debug.debug("Invalidating lookup cache")
+        self._tables = None
+        self.load_failed = False
+        self.version += 1
+
+
+_lookup_cache = None
+
+
+def get_lookup_cache():
+    """Get the shared LookupCache instance"""
+    global _lookup_cache
+    if _lookup_cache is None:
+        _lookup_cache = LookupCache()
+    return _lookup_cache
+
+
+def invalidate_lookup_cache():
+    """Invalidate the shared cache after statuses/priorities/categories change"""
+    get_lookup_cache().invalidate()
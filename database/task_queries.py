@@ -0,0 +1,374 @@
+# src/database/task_queries.py
+"""
+Set-based task queries shared by the database managers.
+
+These helpers take an open sqlite3 connection instead of a manager so the
+same code runs against the file-backed DatabaseManager and the in-memory
+database manager used by the UI.
+"""
+
+from database.unit_of_work import transaction
+from utils.debug_logger import get_debug_logger
+debug = get_debug_logger()
+
+# Largest ID list we bind into a single "IN (...)" clause. Older SQLite
+# builds cap host parameters at 999, so above this we scan the table once
+# and filter in Python instead - still a single query per table.
+MAX_IN_CLAUSE_IDS = 900
+
+
+def _fetch_grouped_by_task(conn, table, columns, task_ids):
+    """Run one query against table and group (id, col1, col2) rows by task_id"""
+    column_list = ", ".join(columns)
+    wanted = None
+    params = ()
+
+    if task_ids is None:
+        where = ""
+    else:
+        wanted = set(task_ids)
+        if not wanted:
+            return {}
+        if len(wanted) <= MAX_IN_CLAUSE_IDS:
+            params = tuple(wanted)
+            where = f"WHERE task_id IN ({', '.join('?' * len(params))})"
+            wanted = None  # SQLite already filtered the rows
+        else:
+            where = ""
+
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"""
+            SELECT task_id, id, {column_list}
+            FROM {table}
+            {where}
+            ORDER BY task_id, display_order
+        """, params)
+
+        grouped = {}
+        for row in cursor:
+            task_id = row[0]
+            if wanted is not None and task_id not in wanted:
+                continue
+            grouped.setdefault(task_id, []).append(tuple(row[1:]))
+        return grouped
+    finally:
+        cursor.close()
+
+
+def get_links_for_tasks(conn, task_ids=None):
+    """Get links for many tasks in one query.
+
+    Returns a dict of task_id -> [(id, url, label), ...] ordered by
+    display_order. Tasks without links are absent from the dict. Passing
+    None loads links for every task.
+    """
+    links = _fetch_grouped_by_task(conn, "links", ("url", "label"), task_ids)
+    debug.debug(f"Bulk loaded links for {len(links)} tasks")
+    return links
+
+
+def get_files_for_tasks(conn, task_ids=None):
+    """Get file attachments for many tasks in one query.
+
+    Returns a dict of task_id -> [(id, file_path, file_name), ...] ordered
+    by display_order. Tasks without files are absent from the dict.
+    """
+    files = _fetch_grouped_by_task(conn, "files", ("file_path", "file_name"), task_ids)
+    debug.debug(f"Bulk loaded files for {len(files)} tasks")
+    return files
+
+
+def get_task_attachments(conn, task_ids=None):
+    """Load links and files for a set of tasks with one query per table.
+
+    Returns a (links_by_task, files_by_task) tuple of dicts.
+    """
+    return get_links_for_tasks(conn, task_ids), get_files_for_tasks(conn, task_ids)
+
+
+def get_task_subtrees(conn, task_ids):
+    """Load tasks and all of their descendants, parents before children.
+
+    Rows have the same layout as the tab loading queries:
+    (id, title, description, '', status, priority, due_date, category,
+    is_compact, parent_id). IDs that no longer exist are simply absent.
+    """
+    seeds = list(dict.fromkeys(task_ids))
+    rows_by_id = {}
+
+    cursor = conn.cursor()
+    try:
+        # One recursive query per chunk of seed IDs; UNION (not UNION ALL)
+        # keeps the walk finite even if bad data ever forms a cycle
+        for start in range(0, len(seeds), MAX_IN_CLAUSE_IDS):
+            chunk = seeds[start:start + MAX_IN_CLAUSE_IDS]
+            cursor.execute(f"""
+                WITH RECURSIVE subtree(id) AS (
+                    SELECT id FROM tasks WHERE id IN ({', '.join('?' * len(chunk))})
+                    UNION
+                    SELECT t.id FROM tasks t JOIN subtree s ON t.parent_id = s.id
+                )
+                SELECT t.id, t.title, t.description, '', t.status, t.priority,
+                    t.due_date, c.name, t.is_compact, t.parent_id
+                FROM tasks t
+                JOIN subtree s ON t.id = s.id
+                LEFT JOIN categories c ON t.category_id = c.id
+                ORDER BY t.display_order
+            """, chunk)
+            for row in cursor:
+                rows_by_id[row[0]] = tuple(row)
+    finally:
+        cursor.close()
+
+    # Order parents before their children so callers can attach items as
+    # they go; display_order is kept among siblings
+    ordered = []
+    placed = set()
+    for task_id in rows_by_id:
+        chain = []
+        current = task_id
+        while current in rows_by_id and current not in placed and current not in chain:
+            chain.append(current)
+            current = rows_by_id[current][9]
+        for chain_id in reversed(chain):
+            placed.add(chain_id)
+            ordered.append(rows_by_id[chain_id])
+
+    debug.debug(f"Loaded {len(ordered)} tasks in subtrees of {len(seeds)} tasks")
+    return ordered
+
+
+# Subquery listing a task and all of its descendants (one "?" for the root).
+# UNION (not UNION ALL) keeps it finite even if bad data ever forms a cycle.
+# It stays a subquery so statements still start with DELETE/UPDATE and
+# sqlite3 reports their rowcount.
+SUBTREE_IDS = """(
+    WITH RECURSIVE subtree(id) AS (
+        SELECT id FROM tasks WHERE id = ?
+        UNION
+        SELECT t.id FROM tasks t JOIN subtree s ON t.parent_id = s.id
+    )
+    SELECT id FROM subtree
+)"""
+
+
+def _in_transaction(conn, work):
+    """Run work(cursor) in one transaction (see unit_of_work.transaction).
+
+    Joins a transaction that is already open, so these helpers can also be
+    composed inside a caller's transaction.
+    """
+    with transaction(conn):
+        cursor = conn.cursor()
+        try:
+            return work(cursor)
+        finally:
+            cursor.close()
+
+
+def get_descendant_ids(conn, task_id):
+    """IDs of every task below task_id (not including task_id itself)"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"SELECT id FROM tasks WHERE id IN {SUBTREE_IDS} AND id != ?", (task_id, task_id))
+        return [row[0] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+def delete_subtree(conn, task_id):
+    """Delete a task, all of its descendants and their links and files.
+
+    Returns the number of tasks deleted.
+    """
+    def work(cursor):
+        # Attachments are removed explicitly since foreign keys may be off
+        for table in ("links", "files"):
+            cursor.execute(f"DELETE FROM {table} WHERE task_id IN {SUBTREE_IDS}", (task_id,))
+        cursor.execute(f"DELETE FROM tasks WHERE id IN {SUBTREE_IDS}", (task_id,))
+        return cursor.rowcount
+
+    deleted = _in_transaction(conn, work)
+    debug.debug(f"Deleted subtree of task {task_id}: {deleted} tasks")
+    return deleted
+
+
+def set_subtree_priority(conn, task_id, priority, include_root=True):
+    """Give a task (optionally) and all of its descendants the same priority.
+
+    Returns the number of tasks updated.
+    """
+    def work(cursor):
+        exclude_root = "" if include_root else "AND id != ?"
+        params = (priority, task_id) if include_root else (priority, task_id, task_id)
+        cursor.execute(f"""
+            UPDATE tasks SET priority = ?
+            WHERE id IN {SUBTREE_IDS} {exclude_root}
+        """, params)
+        return cursor.rowcount
+
+    updated = _in_transaction(conn, work)
+    debug.debug(f"Set priority '{priority}' on {updated} tasks in subtree of {task_id}")
+    return updated
+
+
+def reparent_task(conn, task_id, new_parent_id, priority=None):
+    """Move a task (with its subtree) under new_parent_id, or to the top level with None.
+
+    When priority is given the whole moved subtree takes that priority. Raises
+    ValueError if new_parent_id is the task itself or one of its descendants.
+    """
+    def work(cursor):
+        if new_parent_id is not None:
+            cursor.execute(f"SELECT 1 FROM tasks WHERE id IN {SUBTREE_IDS} AND id = ?", (task_id, new_parent_id))
+            if cursor.fetchone():
+                raise ValueError(f"Cannot move task {task_id} under its own subtree ({new_parent_id})")
+        cursor.execute("UPDATE tasks SET parent_id = ? WHERE id = ?", (new_parent_id, task_id))
+        if priority is not None:
+            cursor.execute(f"UPDATE tasks SET priority = ? WHERE id IN {SUBTREE_IDS}", (priority, task_id))
+
+    _in_transaction(conn, work)
+    debug.debug(f"Moved task {task_id} under {new_parent_id} (priority={priority})")
+
+
+# Spacing between sibling display_order values. Leaving room between
+# neighbours lets a drag-move write just the moved task (the midpoint of its
+# new neighbours); siblings are only renumbered once a gap is used up.
+ORDER_GAP = 1024
+
+
+def next_display_order(conn, parent_id):
+    """display_order that places a new task after its last sibling"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT MAX(display_order) FROM tasks WHERE parent_id IS ?", (parent_id,))
+        max_order = cursor.fetchone()[0]
+        return ORDER_GAP if max_order is None else max_order + ORDER_GAP
+    finally:
+        cursor.close()
+
+
+def set_display_orders(conn, ordered_ids, gap=ORDER_GAP):
+    """Renumber tasks to follow ordered_ids, gap apart, with one executemany.
+
+    Returns the number of tasks updated.
+    """
+    params = [((position + 1) * gap, task_id) for position, task_id in enumerate(ordered_ids)]
+
+    def work(cursor):
+        cursor.executemany("UPDATE tasks SET display_order = ? WHERE id = ?", params)
+        return cursor.rowcount
+
+    updated = _in_transaction(conn, work)
+    debug.debug(f"Renumbered display order of {updated} tasks")
+    return updated
+
+
+def apply_sibling_order(conn, ordered_ids, moved_id=None):
+    """Make the display_order of ordered_ids follow that sequence.
+
+    ordered_ids is the full visual order of one parent's children. Nothing
+    is written if the stored orders already agree. When only moved_id is out
+    of place and its new neighbours leave a gap, just that task is updated;
+    otherwise the siblings are renumbered. Returns the number of rows written.
+    """
+    ordered_ids = list(ordered_ids)
+    if not ordered_ids:
+        return 0
+
+    orders = {}
+    cursor = conn.cursor()
+    try:
+        for start in range(0, len(ordered_ids), MAX_IN_CLAUSE_IDS):
+            chunk = ordered_ids[start:start + MAX_IN_CLAUSE_IDS]
+            cursor.execute(f"SELECT id, display_order FROM tasks WHERE id IN ({', '.join('?' * len(chunk))})", chunk)
+            orders.update(cursor.fetchall())
+    finally:
+        cursor.close()
+
+    def increasing(ids):
+        values = [orders.get(task_id) for task_id in ids]
+        return None not in values and all(a < b for a, b in zip(values, values[1:]))
+
+    if increasing(ordered_ids):
+        return 0
+
+    if moved_id in ordered_ids and moved_id in orders:
+        position = ordered_ids.index(moved_id)
+        if increasing(ordered_ids[:position] + ordered_ids[position + 1:]):
+            before = orders[ordered_ids[position - 1]] if position > 0 else None
+            after = orders[ordered_ids[position + 1]] if position + 1 < len(ordered_ids) else None
+            if before is None:
+                new_order = after - ORDER_GAP
+            elif after is None:
+                new_order = before + ORDER_GAP
+            elif after - before > 1:
+                new_order = (before + after) // 2
+            else:
+                new_order = None  # Gap used up - fall through to a renumber
+
+            if new_order is not None:
+                _in_transaction(conn, lambda cursor: cursor.execute(
+                    "UPDATE tasks SET display_order = ? WHERE id = ?", (new_order, moved_id)))
+                debug.debug(f"Moved task {moved_id} to display order {new_order}")
+                return 1
+
+    return set_display_orders(conn, ordered_ids)
+
+
+def insert_tasks(conn, tasks):
+    """Insert many new tasks in one transaction.
+
+    Each task is a dict in the add_new_task format (title, description,
+    status, priority, due_date, category name, parent_id, optional
+    bee_item_id, stored as text). Tasks whose bee_item_id already exists, in the database
+    or earlier in the batch, are skipped. Returns (new_ids, skipped_count).
+    """
+    def work(cursor):
+        # bee_item_id is a TEXT column, so compare Bee IDs (ints from the API) as strings
+        bee_ids = list({str(task['bee_item_id']) for task in tasks if task.get('bee_item_id')})
+        seen_bee_ids = set()
+        for start in range(0, len(bee_ids), MAX_IN_CLAUSE_IDS):
+            chunk = bee_ids[start:start + MAX_IN_CLAUSE_IDS]
+            cursor.execute(f"SELECT bee_item_id FROM tasks WHERE bee_item_id IN ({', '.join('?' * len(chunk))})",
+                           chunk)
+            seen_bee_ids.update(row[0] for row in cursor.fetchall())
+
+        cursor.execute("SELECT name, id FROM categories")
+        category_ids = dict(cursor.fetchall())
+        cursor.execute("SELECT COALESCE(MAX(id), 0) FROM tasks")
+        next_id = cursor.fetchone()[0] + 1
+
+        next_orders = {}
+        rows = []
+        skipped = 0
+        for task in tasks:
+            bee_item_id = str(task['bee_item_id']) if task.get('bee_item_id') else None
+            if bee_item_id is not None:
+                if bee_item_id in seen_bee_ids:
+                    skipped += 1
+                    continue
+                seen_bee_ids.add(bee_item_id)
+
+            parent_id = task.get('parent_id')
+            if parent_id not in next_orders:
+                next_orders[parent_id] = next_display_order(conn, parent_id)
+            display_order = next_orders[parent_id]
+            next_orders[parent_id] += ORDER_GAP
+
+            rows.append((next_id + len(rows), task.get('title', ''), task.get('description', ''),
+                         task.get('status', 'Not Started'), task.get('priority', 'Medium'),
+                         task.get('due_date', ''), category_ids.get(task.get('category')),
+                         parent_id, display_order, bee_item_id))
+
+        cursor.executemany("""
+            INSERT INTO tasks (id, title, description, status, priority, due_date,
+                               category_id, parent_id, display_order, bee_item_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+        return [row[0] for row in rows], skipped
+
+    new_ids, skipped = _in_transaction(conn, work)
+    debug.debug(f"Inserted {len(new_ids)} tasks, skipped {skipped} already imported")
+    return new_ids, skipped
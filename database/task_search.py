@@ -0,0 +1,121 @@
+# src/database/task_search.py
+"""
+Full-text search over task titles, descriptions and links.
+
+An FTS5 table holds one row per task (rowid = task id) with the task's
+title, description and its link labels and URLs, so a search is an index
+lookup ranked by bm25 instead of a LIKE scan over every task.
+
+The index lives in the TEMP schema of the memory connection: it is built
+when the database is loaded (or on the first search, for other
+connections) and kept current by TEMP triggers on tasks and links.
+Nothing is written to the database file, so the FTS5 shadow tables never
+reach IncrementalSync (which only tracks tables with an integer id and
+would otherwise fall back to full syncs).
+"""
+
+import re
+import time
+
+from utils.debug_logger import get_debug_logger
+debug = get_debug_logger()
+
+SEARCH_TABLE = "task_search"
+
+# Hits returned by default
+DEFAULT_LIMIT = 50
+
+# bm25 weights for the title, description and links columns
+COLUMN_WEIGHTS = (10.0, 1.0, 2.0)
+
+# A task's link labels and URLs as one searchable string
+_LINKS_TEXT = "(SELECT group_concat(COALESCE(label, '') || ' ' || url, ' ') FROM links WHERE task_id = {})"
+
+
+def _is_installed(conn):
+    row = conn.execute("SELECT 1 FROM temp.sqlite_master WHERE type = 'table' AND name = ?",
+                       (SEARCH_TABLE,)).fetchone()
+    return row is not None
+
+
+def install_task_search(conn):
+    """Build the search index and the triggers that keep it current (no-op if present)"""
+    if _is_installed(conn):
+        return False
+
+    start_time = time.time()
+    was_in_transaction = conn.in_transaction
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        CREATE VIRTUAL TABLE temp.{SEARCH_TABLE} USING fts5(
+            title, description, links,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        )
+    """)
+    # Make the rank column bm25 with our column weights, so searches can use
+    # FTS5's ORDER BY rank LIMIT n
+    weights = ", ".join(str(weight) for weight in COLUMN_WEIGHTS)
+    cursor.execute(f"INSERT INTO temp.{SEARCH_TABLE} ({SEARCH_TABLE}, rank) VALUES ('rank', ?)",
+                   (f"bm25({weights})",))
+    cursor.execute(f"""
+        INSERT INTO temp.{SEARCH_TABLE} (rowid, title, description, links)
+        SELECT t.id, t.title, COALESCE(t.description, ''), COALESCE({_LINKS_TEXT.format('t.id')}, '')
+        FROM tasks t
+    """)
+
+    # Trigger bodies cannot qualify table names; the TEMP table is found first
+    index_task = (f"INSERT INTO {SEARCH_TABLE} (rowid, title, description, links) "
+                  f"VALUES (NEW.id, NEW.title, COALESCE(NEW.description, ''), "
+                  f"COALESCE({_LINKS_TEXT.format('NEW.id')}, ''));")
+    unindex_task = f"DELETE FROM {SEARCH_TABLE} WHERE rowid = OLD.id;"
+    reindex_links = (f"UPDATE {SEARCH_TABLE} SET links = COALESCE({_LINKS_TEXT.format('%s.task_id')}, '') "
+                     f"WHERE rowid = %s.task_id;")
+    triggers = {
+        "tasks_insert": ("AFTER INSERT ON main.tasks", index_task),
+        "tasks_update": ("AFTER UPDATE OF id, title, description ON main.tasks", unindex_task + index_task),
+        "tasks_delete": ("AFTER DELETE ON main.tasks", unindex_task),
+        "links_insert": ("AFTER INSERT ON main.links", reindex_links % ('NEW', 'NEW')),
+        "links_update": ("AFTER UPDATE ON main.links",
+                         reindex_links % ('OLD', 'OLD') + reindex_links % ('NEW', 'NEW')),
+        "links_delete": ("AFTER DELETE ON main.links", reindex_links % ('OLD', 'OLD')),
+    }
+    for name, (event, body) in triggers.items():
+        cursor.execute(f"CREATE TEMP TRIGGER IF NOT EXISTS _search_{name} {event} BEGIN {body} END")
+
+    if not was_in_transaction:
+        conn.commit()
+    debug.debug(f"Task search index built in {time.time() - start_time:.3f} seconds")
+    return True
+
+
+def build_match_query(text):
+    """FTS5 query matching every word of text as a prefix, or None if it has no words.
+
+    Words are quoted so user input can never be read as FTS5 syntax.
+    """
+    words = re.findall(r"\w+", text or "")
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def search_tasks(conn, text, limit=DEFAULT_LIMIT):
+    """Tasks matching text, best first, as (id, title, status, parent_id) rows"""
+    query = build_match_query(text)
+    if query is None:
+        return []
+    install_task_search(conn)
+
+    # Every match is ranked; FTS5 keeps only the best limit while it scores
+    cursor = conn.execute(f"""
+        SELECT t.id, t.title, t.status, t.parent_id
+        FROM (SELECT rowid, rank
+              FROM temp.{SEARCH_TABLE}
+              WHERE {SEARCH_TABLE} MATCH ?
+              ORDER BY rank
+              LIMIT ?) hits
+        JOIN tasks t ON t.id = hits.rowid
+        ORDER BY hits.rank
+    """, (query, limit))
+    return cursor.fetchall()
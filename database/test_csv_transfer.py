@@ -0,0 +1,105 @@
+# src/tests/test_csv_transfer.py
+
+import sys
+from pathlib import Path
+import unittest
+import tempfile
+import shutil
+import csv
+import sqlite3
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from database.db_config import db_config
+from database.csv_transfer import (CSV_COLUMNS, TransferCancelled, parse_task_csv, insert_import_plan,
+                                   export_tasks_csv)
+
+class TestCsvTransfer(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.conn = sqlite3.connect(":memory:")
+        db_config._create_tables(self.conn.cursor())
+        self.conn.execute("INSERT INTO categories (id, name, color) VALUES (7, 'Work', '#fff')")
+        self.conn.execute("INSERT INTO tasks (id, title, display_order) VALUES (1, 'Existing', 5)")
+        self.conn.commit()
+
+    def tearDown(self):
+        self.conn.close()
+        shutil.rmtree(self.test_dir)
+
+    def _write_csv(self, rows):
+        path = Path(self.test_dir) / "tasks.csv"
+        with open(path, 'w', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=CSV_COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+        return path
+
+    def test_import_resolves_parents_and_categories(self):
+        """Parents may come later in the file or already exist"""
+        path = self._write_csv([
+            {'Title': 'Child', 'Parent': 'Later parent', 'Link': 'https://example.com'},
+            {'Title': 'Later parent', 'Category': 'Work', 'Priority': 'High'},
+            {'Title': 'Under existing', 'Parent': 'Existing', 'Category': 'Missing'},
+            {'Title': ''},
+        ])
+        plan = parse_task_csv(path)
+        new_ids = insert_import_plan(self.conn, plan)
+
+        self.assertEqual(len(new_ids), 3)
+        rows = self.conn.execute("""
+            SELECT t.title, p.title, t.category_id, t.priority, t.status
+            FROM tasks t LEFT JOIN tasks p ON t.parent_id = p.id
+            WHERE t.id IN (?, ?, ?) ORDER BY t.id
+        """, new_ids).fetchall()
+        self.assertEqual(rows, [
+            ('Child', 'Later parent', None, 'Medium', 'Not Started'),
+            ('Later parent', None, 7, 'High', 'Not Started'),
+            ('Under existing', 'Existing', None, 'Medium', 'Not Started'),
+        ])
+        self.assertEqual(self.conn.execute("SELECT task_id, url FROM links").fetchall(),
+                         [(new_ids[0], 'https://example.com')])
+
+    def test_circular_parents_are_broken(self):
+        """Tasks naming each other as parent still end up reachable"""
+        path = self._write_csv([{'Title': 'A', 'Parent': 'B'}, {'Title': 'B', 'Parent': 'A'}])
+        insert_import_plan(self.conn, parse_task_csv(path))
+        roots = self.conn.execute("SELECT COUNT(*) FROM tasks WHERE title IN ('A', 'B') AND parent_id IS NULL")
+        self.assertEqual(roots.fetchone()[0], 1)
+
+    def test_cancel_stops_parsing(self):
+        path = self._write_csv([{'Title': f'Task {i}'} for i in range(1200)])
+        seen = []
+        with self.assertRaises(TransferCancelled):
+            parse_task_csv(path, progress=seen.append, is_cancelled=lambda: len(seen) > 0)
+        self.assertEqual(seen, [500])
+
+    def test_export_round_trip_with_links_and_files(self):
+        """Exported links, files and parents import back the same way"""
+        self.conn.execute("INSERT INTO tasks (id, title, parent_id, category_id) VALUES (2, 'Child', 1, 7)")
+        self.conn.executemany("INSERT INTO links (task_id, url, display_order) VALUES (?, ?, ?)",
+                              [(2, 'https://b.example', 1), (2, 'https://a.example', 0)])
+        self.conn.execute("INSERT INTO files (task_id, file_path, file_name) VALUES (2, '/tmp/a.txt', 'a.txt')")
+        self.conn.commit()
+
+        path = Path(self.test_dir) / "export.csv"
+        progress = []
+        self.assertEqual(export_tasks_csv(self.conn, path, progress=lambda *p: progress.append(p), chunk_size=1), 2)
+        self.assertEqual(progress, [(1, 2), (2, 2)])
+
+        plan = parse_task_csv(path)
+        child = plan.tasks[1]
+        self.assertEqual((child.title, child.parent_title, child.category), ('Child', 'Existing', 'Work'))
+        self.assertEqual(child.links, ['https://a.example', 'https://b.example'])
+        self.assertEqual(child.files, ['/tmp/a.txt'])
+
+    def test_cancelled_export_leaves_no_file(self):
+        path = Path(self.test_dir) / "export.csv"
+        with self.assertRaises(TransferCancelled):
+            export_tasks_csv(self.conn, path, is_cancelled=lambda: True)
+        self.assertEqual(list(Path(self.test_dir).iterdir()), [])
+
+if __name__ == '__main__':
+    unittest.main()
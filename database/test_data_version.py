@@ -0,0 +1,73 @@
+# src/tests/test_data_version.py
+
+import sys
+from pathlib import Path
+import unittest
+import tempfile
+import shutil
+import sqlite3
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from database.db_config import db_config
+from database.data_version import get_data_version, changed_task_ids, prune_data_changes
+from database.incremental_sync import IncrementalSync
+
+class TestDataVersion(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.conn = sqlite3.connect(":memory:")
+        db_config._create_tables(self.conn.cursor())
+        self.conn.execute("INSERT INTO tasks (id, title) VALUES (1, 'Task')")
+        self.conn.commit()
+
+    def tearDown(self):
+        self.conn.close()
+        shutil.rmtree(self.test_dir)
+
+    def test_task_changes_bump_version(self):
+        version = get_data_version(self.conn)
+        self.assertEqual(get_data_version(self.conn), version)
+
+        self.conn.execute("UPDATE tasks SET title = 'Renamed' WHERE id = 1")
+        self.conn.execute("INSERT INTO links (task_id, url) VALUES (1, 'https://example.com')")
+        self.assertGreater(get_data_version(self.conn), version)
+
+    def test_changed_task_ids(self):
+        """Changes are pinned to tasks unless a category changed or the log was pruned"""
+        self.conn.execute("INSERT INTO tasks (id, title) VALUES (2, 'Other')")
+        version = get_data_version(self.conn)
+        self.assertEqual(changed_task_ids(self.conn, version), set())
+
+        self.conn.execute("INSERT INTO links (task_id, url) VALUES (1, 'https://example.com')")
+        self.conn.execute("UPDATE tasks SET parent_id = 1 WHERE id = 2")
+        self.assertEqual(changed_task_ids(self.conn, version), {1, 2})
+
+        prune_data_changes(self.conn, get_data_version(self.conn))
+        self.assertIsNone(changed_task_ids(self.conn, version))
+
+        latest = get_data_version(self.conn)
+        self.conn.execute("UPDATE categories SET color = '#000'")
+        self.assertIsNone(changed_task_ids(self.conn, latest))
+
+    def test_sync_does_not_bump_version(self):
+        """Saving the database is not a data change"""
+        sync = IncrementalSync(lambda: self.conn, Path(self.test_dir) / "tasks.sqlite")
+        sync.start(in_sync=False)
+        version = get_data_version(self.conn)
+        self.conn.execute("UPDATE tasks SET title = 'Renamed' WHERE id = 1")
+        self.conn.commit()
+        changed = get_data_version(self.conn)
+
+        self.assertNotEqual(changed, version)
+        sync.sync()
+        self.conn.execute("UPDATE tasks SET priority = 'High' WHERE id = 1")
+        self.conn.commit()
+        sync.sync()
+        self.assertEqual(sync.last_sync_mode, "incremental")
+        self.assertEqual(get_data_version(self.conn), changed + 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -11,7 +11,7 @@ import shutil
 sys.path.append(str(Path(__file__).parent.parent))
 
 # Import the database configuration
-from database.db_config import db_config
+from database.db_config import db_config, ensure_db_exists
 
 class TestDatabaseConfig(unittest.TestCase):
     
@@ -120,5 +120,26 @@ class TestDatabaseConfig(unittest.TestCase):
         # Now it should exist
         self.assertTrue(db_config.database_exists())
 
+    def test_existing_database_gets_indexes(self):
+        """Opening a database created without the newer indexes adds them"""
+        conn = sqlite3.connect(self.test_db_path)
+        conn.execute("CREATE TABLE tasks (id INTEGER PRIMARY KEY, title TEXT NOT NULL, "
+                     "parent_id INTEGER, bee_item_id TEXT)")
+        conn.commit()
+        conn.close()
+        
+        self.assertTrue(ensure_db_exists())
+        
+        conn = sqlite3.connect(self.test_db_path)
+        indexes = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")]
+        plan = conn.execute("EXPLAIN QUERY PLAN SELECT bee_item_id FROM tasks WHERE bee_item_id IN ('1', '2')").fetchall()
+        conn.close()
+        self.assertIn('idx_tasks_bee_item_id', indexes)
+        self.assertIn('idx_tasks_parent_id', indexes)
+        self.assertIn('idx_tasks_bee_item_id', str(plan))
+        
+        # Running it again is harmless
+        self.assertTrue(ensure_db_exists())
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,177 @@
+# src/tests/test_incremental_sync.py
+
+import sys
+from pathlib import Path
+import unittest
+from unittest import mock
+import tempfile
+import shutil
+import sqlite3
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from database.db_config import db_config
+from database.incremental_sync import IncrementalSync
+from database.write_behind import WriteBehindSaver
+
+class TestIncrementalSync(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.target_path = Path(self.test_dir) / "tasks.sqlite"
+
+        # Create the file, then load it into memory the way the app does
+        disk = sqlite3.connect(self.target_path)
+        db_config._create_tables(disk.cursor())
+        disk.execute("INSERT INTO tasks (id, title) VALUES (1, 'Keep'), (2, 'Edit'), (3, 'Remove')")
+        disk.execute("INSERT INTO links (task_id, url) VALUES (2, 'https://example.com')")
+        disk.commit()
+        self.memory = sqlite3.connect(":memory:")
+        disk.backup(self.memory)
+        disk.close()
+
+        self.sync = IncrementalSync(lambda: self.memory, self.target_path)
+        self.sync.start(in_sync=True)
+
+    def tearDown(self):
+        self.memory.close()
+        shutil.rmtree(self.test_dir)
+
+    def _disk_rows(self, query):
+        disk = sqlite3.connect(self.target_path)
+        try:
+            return disk.execute(query).fetchall()
+        finally:
+            disk.close()
+
+    def test_only_changed_rows_are_written(self):
+        """Inserts, updates and deletes reach the file incrementally"""
+        self.memory.execute("UPDATE tasks SET title = 'Edited' WHERE id = 2")
+        self.memory.execute("DELETE FROM tasks WHERE id = 3")
+        self.memory.execute("INSERT INTO tasks (id, title) VALUES (4, 'New')")
+        self.memory.commit()
+        self.assertEqual(self.sync.pending_changes(), 3)
+
+        self.assertTrue(self.sync.sync())
+        self.assertEqual(self.sync.last_sync_mode, "incremental")
+        self.assertEqual(self.sync.pending_changes(), 0)
+        self.assertEqual(self._disk_rows("SELECT id, title FROM tasks ORDER BY id"),
+                         [(1, "Keep"), (2, "Edited"), (4, "New")])
+
+    def test_updating_parent_keeps_unchanged_children(self):
+        """Re-copying a task does not cascade away its untouched links"""
+        self.memory.execute("PRAGMA foreign_keys = ON")
+        self.memory.execute("UPDATE tasks SET title = 'Edited' WHERE id = 2")
+        self.memory.commit()
+
+        self.sync.sync()
+        self.assertEqual(self._disk_rows("SELECT task_id, url FROM links"), [(2, "https://example.com")])
+        self.assertEqual(self.memory.execute("PRAGMA foreign_keys").fetchone()[0], 1)
+
+    def test_schema_change_falls_back_to_full_sync(self):
+        """Adding a column makes the next save a full copy"""
+        self.memory.execute("ALTER TABLE tasks ADD COLUMN notes TEXT")
+        self.memory.execute("UPDATE tasks SET notes = 'n' WHERE id = 1")
+        self.memory.commit()
+
+        self.sync.sync()
+        self.assertEqual(self.sync.last_sync_mode, "full")
+        self.assertEqual(self._disk_rows("SELECT notes FROM tasks WHERE id = 1"), [("n",)])
+
+        # Tracking continues incrementally against the new checkpoint
+        self.memory.execute("UPDATE tasks SET notes = 'm' WHERE id = 1")
+        self.memory.commit()
+        self.sync.sync()
+        self.assertEqual(self.sync.last_sync_mode, "incremental")
+        self.assertEqual(self._disk_rows("SELECT notes FROM tasks WHERE id = 1"), [("m",)])
+
+    def test_open_transaction_defers_sync(self):
+        """Uncommitted changes are not written or dropped from the changelog"""
+        self.memory.execute("UPDATE tasks SET title = 'Pending' WHERE id = 1")
+        self.assertFalse(self.sync.sync())
+        self.memory.commit()
+        self.assertTrue(self.sync.sync())
+        self.assertEqual(self._disk_rows("SELECT title FROM tasks WHERE id = 1"), [("Pending",)])
+
+    def test_saver_writes_rows_on_worker(self):
+        """save_async captures the rows here and writes them on the worker thread"""
+        saver = WriteBehindSaver(lambda: self.memory, self.target_path, schedule=lambda: None, sync=self.sync)
+        self.memory.execute("UPDATE tasks SET title = 'Edited' WHERE id = 2")
+        self.memory.commit()
+        saver.mark_dirty()
+
+        # The memory connection refuses other threads, so the worker only touches the file
+        worker = saver.save_async()
+        self.assertEqual(worker.name, "db-write-behind")
+        saver.wait()
+        self.assertIsNone(saver.last_error)
+        self.assertEqual(self.sync.last_sync_mode, "incremental")
+        self.assertFalse(saver.dirty)
+        self.assertEqual(self._disk_rows("SELECT title FROM tasks WHERE id = 2"), [("Edited",)])
+
+    def test_saver_writes_full_sync_on_worker(self):
+        """The full-copy fallback is written by the worker from a snapshot"""
+        saver = WriteBehindSaver(lambda: self.memory, self.target_path, schedule=lambda: None, sync=self.sync)
+        self.memory.execute("ALTER TABLE tasks ADD COLUMN notes TEXT")
+        self.memory.execute("UPDATE tasks SET notes = 'n' WHERE id = 1")
+        self.memory.commit()
+        saver.mark_dirty()
+
+        self.assertIsNotNone(saver.save_async())
+        saver.wait()
+        self.assertIsNone(saver.last_error)
+        self.assertEqual(self.sync.last_sync_mode, "full")
+        self.assertEqual(self._disk_rows("SELECT notes FROM tasks WHERE id = 1"), [("n",)])
+
+    def test_failed_write_is_retried(self):
+        """Rows from a failed background write go out with the next save"""
+        saver = WriteBehindSaver(lambda: self.memory, self.target_path, schedule=lambda: None, sync=self.sync)
+        self.memory.execute("UPDATE tasks SET title = 'Edited' WHERE id = 2")
+        self.memory.commit()
+        saver.mark_dirty()
+
+        disk = sqlite3.connect(self.target_path)
+        disk.execute("BEGIN EXCLUSIVE")
+        try:
+            # Give up on the lock at once instead of after the default timeout
+            connect = sqlite3.connect
+            with mock.patch("sqlite3.connect", lambda path: connect(path, timeout=0)):
+                saver.save_async()
+                saver.wait()
+        finally:
+            disk.rollback()
+            disk.close()
+        self.assertIsInstance(saver.last_error, sqlite3.OperationalError)
+        self.assertTrue(saver.dirty)
+        self.assertEqual(self.sync.pending_changes(), 1)
+
+        saver.save_async()
+        saver.wait()
+        self.assertIsNone(saver.last_error)
+        self.assertFalse(saver.dirty)
+        self.assertEqual(self._disk_rows("SELECT title FROM tasks WHERE id = 2"), [("Edited",)])
+
+    def test_reader_gets_snapshot_without_syncing(self):
+        """Readers see unsaved edits from a snapshot; nothing is written and the file stays unlocked"""
+        saver = WriteBehindSaver(lambda: self.memory, self.target_path, schedule=lambda: None, sync=self.sync)
+        self.memory.execute("UPDATE tasks SET title = 'Edited' WHERE id = 2")
+        self.memory.commit()
+        saver.mark_dirty()
+
+        conn = saver.reader_connection_factory()()
+        try:
+            self.assertEqual(conn.execute("PRAGMA database_list").fetchone()[2], "")
+            self.assertEqual(conn.execute("SELECT title FROM tasks WHERE id = 2").fetchone(), ('Edited',))
+            self.assertEqual(self._disk_rows("SELECT title FROM tasks WHERE id = 2"), [("Edit",)])
+
+            # An open reader does not get in the way of the next save
+            saver.save_async()
+            saver.wait()
+            self.assertIsNone(saver.last_error)
+            self.assertEqual(self._disk_rows("SELECT title FROM tasks WHERE id = 2"), [("Edited",)])
+        finally:
+            conn.close()
+
+if __name__ == '__main__':
+    unittest.main()
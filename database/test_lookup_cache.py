@@ -0,0 +1,79 @@
+# src/tests/test_lookup_cache.py
+
+import sys
+from pathlib import Path
+import unittest
+import sqlite3
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from database.db_config import db_config
+from database.lookup_cache import LookupCache
+
+class TestLookupCache(unittest.TestCase):
+
+    def setUp(self):
+        # Build the application schema (with default lookup rows) in memory
+        self.conn = sqlite3.connect(":memory:")
+        db_config._create_tables(self.conn.cursor())
+        self.conn.commit()
+        self.loads = 0
+        self.cache = LookupCache(connection_factory=self._connect)
+
+    def tearDown(self):
+        self.conn.close()
+
+    def _connect(self):
+        self.loads += 1
+        return self.conn
+
+    def test_lookups_hit_database_once(self):
+        """Repeated lookups are served from memory after the first load"""
+        color = self.cache.get_color("priority", "High")
+        for _ in range(10):
+            self.assertEqual(self.cache.get_color("priority", "High"), color)
+            self.cache.get_color("status", "Completed")
+            self.cache.get_display_order("status", "Completed")
+        self.assertEqual(self.loads, 1)
+
+    def test_missing_names_use_default(self):
+        """Unknown names fall back to the caller's default"""
+        self.assertEqual(self.cache.get_color("category", "Nope", "#E0E0E0"), "#E0E0E0")
+        self.assertIsNone(self.cache.get_display_order("priority", "Nope"))
+
+    def test_invalidate_reloads_changes(self):
+        """Changes are picked up only after invalidate()"""
+        self.conn.execute("UPDATE priorities SET color = '#123456' WHERE name = 'High'")
+        self.cache.get_color("priority", "High")
+        self.conn.execute("UPDATE priorities SET color = '#654321' WHERE name = 'High'")
+        self.assertEqual(self.cache.get_color("priority", "High"), "#123456")
+
+        version = self.cache.version
+        self.cache.invalidate()
+        self.assertEqual(self.cache.get_color("priority", "High"), "#654321")
+        self.assertEqual(self.cache.version, version + 1)
+        self.assertEqual(self.loads, 2)
+
+    def test_failed_load_retried_after_invalidate(self):
+        """A failed load is not retried on every lookup, only after invalidate()"""
+        self.conn.execute("ALTER TABLE priorities RENAME TO old_priorities")
+        for _ in range(5):
+            self.assertEqual(self.cache.get_color("priority", "High", "#E0E0E0"), "#E0E0E0")
+        self.assertTrue(self.cache.load_failed)
+        self.assertEqual(self.loads, 1)
+
+        self.conn.execute("ALTER TABLE old_priorities RENAME TO priorities")
+        version = self.cache.version
+        self.cache.invalidate()
+        self.assertEqual(self.cache.get_color("priority", "High"), "#E74C3C")
+        self.assertFalse(self.cache.load_failed)
+        self.assertEqual((self.loads, self.cache.version), (2, version + 1))
+
+    def test_names_in_display_order(self):
+        """Ordered lookups are returned by display_order"""
+        rows = self.conn.execute("SELECT name FROM statuses ORDER BY display_order").fetchall()
+        self.assertEqual(self.cache.get_names("status"), [row[0] for row in rows])
+
+if __name__ == '__main__':
+    unittest.main()
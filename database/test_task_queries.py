@@ -0,0 +1,181 @@
+# src/tests/test_task_queries.py
+
+import sys
+from pathlib import Path
+import unittest
+import sqlite3
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from database.db_config import db_config
+from database import task_queries
+from database.task_queries import (get_links_for_tasks, get_files_for_tasks, get_task_attachments, get_task_subtrees,
+                                   get_descendant_ids, delete_subtree, set_subtree_priority, reparent_task,
+                                   next_display_order, apply_sibling_order, ORDER_GAP, insert_tasks)
+
+
+class TestTaskQueries(unittest.TestCase):
+
+    def setUp(self):
+        # Build the application schema in a throwaway in-memory database
+        self.conn = sqlite3.connect(":memory:")
+        db_config._create_tables(self.conn.cursor())
+
+        cursor = self.conn.cursor()
+        for task_id in range(1, 6):
+            cursor.execute("INSERT INTO tasks (id, title) VALUES (?, ?)", (task_id, f"Task {task_id}"))
+
+        cursor.executemany(
+            "INSERT INTO links (task_id, url, label, display_order) VALUES (?, ?, ?, ?)",
+            [(1, "https://b.example", "B", 2), (1, "https://a.example", "A", 1), (3, "https://c.example", None, 0)]
+        )
+        cursor.executemany(
+            "INSERT INTO files (task_id, file_path, file_name, display_order) VALUES (?, ?, ?, ?)",
+            [(2, "/tmp/report.pdf", "report.pdf", 0), (3, "/tmp/notes.txt", None, 0)]
+        )
+        self.conn.commit()
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_links_grouped_and_ordered(self):
+        """Links come back grouped by task in display order"""
+        links = get_links_for_tasks(self.conn, [1, 2, 3])
+        self.assertEqual([url for _, url, _ in links[1]], ["https://a.example", "https://b.example"])
+        self.assertEqual(links[3][0][1:], ("https://c.example", None))
+        self.assertNotIn(2, links)
+
+    def test_files_only_for_requested_tasks(self):
+        """Files for tasks outside the requested set are not returned"""
+        files = get_files_for_tasks(self.conn, [2])
+        self.assertEqual(list(files.keys()), [2])
+        self.assertEqual(files[2][0][1:], ("/tmp/report.pdf", "report.pdf"))
+
+    def test_empty_and_all_task_ids(self):
+        """An empty ID set loads nothing and None loads everything"""
+        self.assertEqual(get_task_attachments(self.conn, []), ({}, {}))
+        links, files = get_task_attachments(self.conn, None)
+        self.assertEqual(set(links), {1, 3})
+        self.assertEqual(set(files), {2, 3})
+
+    def test_large_id_sets_use_table_scan(self):
+        """ID sets above the IN clause limit still filter correctly"""
+        original_limit = task_queries.MAX_IN_CLAUSE_IDS
+        task_queries.MAX_IN_CLAUSE_IDS = 1
+        try:
+            links, files = get_task_attachments(self.conn, [1, 2])
+        finally:
+            task_queries.MAX_IN_CLAUSE_IDS = original_limit
+        self.assertEqual(set(links), {1})
+        self.assertEqual(set(files), {2})
+
+    def test_subtrees_parents_before_children(self):
+        """Subtree rows include all descendants with parents first"""
+        cursor = self.conn.cursor()
+        # 4 -> 2 -> 1 -> 3, with 5 left outside the subtree
+        cursor.execute("UPDATE tasks SET parent_id = 4 WHERE id = 2")
+        cursor.execute("UPDATE tasks SET parent_id = 2 WHERE id = 1")
+        cursor.execute("UPDATE tasks SET parent_id = 1 WHERE id = 3")
+        self.conn.commit()
+
+        rows = get_task_subtrees(self.conn, [2, 1, 99])
+        self.assertEqual([row[0] for row in rows], [2, 1, 3])
+        self.assertEqual(rows[0][9], 4)
+        self.assertEqual(len(rows[0]), 10)
+
+    def test_subtrees_survive_cycles(self):
+        """A parent cycle in bad data does not hang the recursive query"""
+        cursor = self.conn.cursor()
+        cursor.execute("UPDATE tasks SET parent_id = 2 WHERE id = 1")
+        cursor.execute("UPDATE tasks SET parent_id = 1 WHERE id = 2")
+        self.conn.commit()
+
+        rows = get_task_subtrees(self.conn, [1])
+        self.assertEqual(sorted(row[0] for row in rows), [1, 2])
+
+    def test_subtree_walk_uses_parent_index(self):
+        """The recursive subtree step looks children up by index, not by scanning tasks"""
+        plan = self.conn.execute(f"EXPLAIN QUERY PLAN SELECT id FROM tasks WHERE id IN {task_queries.SUBTREE_IDS}", (1,))
+        self.assertIn('idx_tasks_parent_id', str(plan.fetchall()))
+
+    def _make_chain(self):
+        # 1 -> 2 -> 3, with 4 and 5 left outside the subtree
+        cursor = self.conn.cursor()
+        cursor.execute("UPDATE tasks SET parent_id = 1 WHERE id = 2")
+        cursor.execute("UPDATE tasks SET parent_id = 2 WHERE id = 3")
+        self.conn.commit()
+
+    def test_delete_subtree_removes_descendants_and_attachments(self):
+        """Deleting a task takes its whole subtree and their links and files with it"""
+        self._make_chain()
+        self.assertEqual(sorted(get_descendant_ids(self.conn, 1)), [2, 3])
+
+        self.assertEqual(delete_subtree(self.conn, 1), 3)
+        self.assertFalse(self.conn.in_transaction)
+        remaining = [row[0] for row in self.conn.execute("SELECT id FROM tasks ORDER BY id")]
+        self.assertEqual(remaining, [4, 5])
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM links").fetchone()[0], 0)
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM files").fetchone()[0], 0)
+
+    def test_subtree_priority_and_reparent(self):
+        """Priority changes cover descendants and moves cannot create cycles"""
+        self._make_chain()
+        self.assertEqual(set_subtree_priority(self.conn, 1, "High", include_root=False), 2)
+        priorities = dict(self.conn.execute("SELECT id, priority FROM tasks"))
+        self.assertEqual((priorities[2], priorities[3]), ("High", "High"))
+        self.assertNotEqual(priorities[1], "High")
+
+        reparent_task(self.conn, 2, 4, priority="Low")
+        rows = dict(self.conn.execute("SELECT id, parent_id FROM tasks"))
+        self.assertEqual(rows[2], 4)
+        self.assertEqual(self.conn.execute("SELECT priority FROM tasks WHERE id = 3").fetchone()[0], "Low")
+
+        with self.assertRaises(ValueError):
+            reparent_task(self.conn, 4, 3)
+        self.assertIsNone(self.conn.execute("SELECT parent_id FROM tasks WHERE id = 4").fetchone()[0])
+
+    def _orders(self):
+        rows = self.conn.execute("SELECT id FROM tasks ORDER BY display_order, id").fetchall()
+        return [row[0] for row in rows]
+
+    def test_sparse_sibling_order(self):
+        """A move into a gap writes one row; a crowded move renumbers"""
+        self.assertEqual(next_display_order(self.conn, None), ORDER_GAP)
+
+        # Dense legacy orders get renumbered on the first move
+        self.conn.executemany("UPDATE tasks SET display_order = ? WHERE id = ?", [(i, i) for i in range(1, 6)])
+        self.assertEqual(apply_sibling_order(self.conn, [1, 2, 3, 4, 5]), 0)
+        self.assertEqual(apply_sibling_order(self.conn, [1, 5, 2, 3, 4], moved_id=5), 5)
+        self.assertEqual(self._orders(), [1, 5, 2, 3, 4])
+
+        # Afterwards moves only touch the moved task
+        self.assertEqual(apply_sibling_order(self.conn, [3, 1, 5, 2, 4], moved_id=3), 1)
+        self.assertEqual(apply_sibling_order(self.conn, [3, 1, 5, 2, 4], moved_id=3), 0)
+        self.assertEqual(apply_sibling_order(self.conn, [3, 1, 2, 4, 5], moved_id=5), 1)
+        self.assertEqual(self._orders(), [3, 1, 2, 4, 5])
+        self.assertEqual(next_display_order(self.conn, None), 7 * ORDER_GAP)
+
+    def test_insert_tasks_skips_known_bee_items(self):
+        """Bee items already imported, or repeated in the batch, are skipped"""
+        self.conn.execute("UPDATE tasks SET bee_item_id = 'bee-1' WHERE id = 1")
+        new_ids, skipped = insert_tasks(self.conn, [
+            {'title': 'Old', 'bee_item_id': 'bee-1'},
+            {'title': 'New', 'bee_item_id': 'bee-2', 'priority': 'High'},
+            {'title': 'Again', 'bee_item_id': 'bee-2'},
+            {'title': 'Local'},
+        ])
+        self.assertEqual((new_ids, skipped), ([6, 7], 2))
+        rows = self.conn.execute("SELECT title, priority, bee_item_id FROM tasks WHERE id >= 6 ORDER BY display_order")
+        self.assertEqual(rows.fetchall(), [('New', 'High', 'bee-2'), ('Local', 'Medium', None)])
+
+    def test_insert_tasks_skips_integer_bee_ids(self):
+        """Bee's integer IDs match the text stored by an earlier import"""
+        self.assertEqual(insert_tasks(self.conn, [{'title': 'a', 'bee_item_id': 123}]), ([6], 0))
+        self.assertEqual(insert_tasks(self.conn, [{'title': 'a', 'bee_item_id': 123}]), ([], 1))
+        rows = self.conn.execute("SELECT bee_item_id FROM tasks WHERE bee_item_id IS NOT NULL")
+        self.assertEqual(rows.fetchall(), [('123',)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+# src/tests/test_task_search.py
+
+import sys
+from pathlib import Path
+import unittest
+import sqlite3
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from database.db_config import db_config
+from database.task_search import build_match_query, search_tasks
+
+class TestTaskSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        db_config._create_tables(self.conn.cursor())
+        self.conn.executemany("INSERT INTO tasks (id, title, description, status) VALUES (?, ?, ?, ?)", [
+            (1, 'Write report', 'Quarterly numbers', 'Not Started'),
+            (2, 'Call plumber', 'About the report on the boiler', 'Backlog'),
+            (3, 'Old invoice', '', 'Completed'),
+        ])
+        self.conn.execute("INSERT INTO links (task_id, url, label) VALUES (3, 'https://billing.example.com', 'Portal')")
+        self.conn.commit()
+
+    def tearDown(self):
+        self.conn.close()
+
+    def _ids(self, text):
+        return [row[0] for row in search_tasks(self.conn, text)]
+
+    def test_title_hits_rank_first_across_statuses(self):
+        self.assertEqual(self._ids("report"), [1, 2])
+        self.assertEqual(self._ids("billing"), [3])
+        self.assertEqual(self._ids("quart num"), [1])
+
+    def test_index_follows_edits(self):
+        self._ids("report")
+        self.conn.execute("UPDATE tasks SET title = 'Send summary' WHERE id = 1")
+        self.conn.execute("INSERT INTO tasks (id, title) VALUES (4, 'Report template')")
+        self.conn.execute("INSERT INTO links (task_id, url) VALUES (2, 'https://plumbing.example.com')")
+        self.conn.execute("DELETE FROM links WHERE task_id = 3")
+        self.conn.commit()
+
+        self.assertEqual(self._ids("report"), [4, 2])
+        self.assertEqual(self._ids("summary"), [1])
+        self.assertEqual(self._ids("plumbing"), [2])
+        self.assertEqual(self._ids("billing"), [])
+
+    def test_best_match_found_among_many(self):
+        """The best match is returned even when it is the oldest of many matches"""
+        self.conn.executemany("INSERT INTO tasks (id, title, description) VALUES (?, ?, ?)",
+                              [(task_id, f"Task {task_id}", "mentions the report") for task_id in range(10, 1010)])
+        self.conn.commit()
+        ids = [row[0] for row in search_tasks(self.conn, "report", limit=3)]
+        self.assertEqual(ids[0], 1)
+        self.assertEqual(len(ids), 3)
+
+    def test_user_input_is_not_query_syntax(self):
+        self.assertEqual(build_match_query('"report" AND (x'), '"report"* "AND"* "x"*')
+        self.assertIsNone(build_match_query("  -- "))
+        self.assertEqual(self._ids("report) OR ("), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+# src/tests/test_unit_of_work.py
+
+import sys
+from pathlib import Path
+import unittest
+import sqlite3
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from database.unit_of_work import transaction
+
+class TestUnitOfWork(unittest.TestCase):
+
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        self.conn.execute("CREATE TABLE tasks (id INTEGER PRIMARY KEY, title TEXT)")
+        self.conn.commit()
+
+    def tearDown(self):
+        self.conn.close()
+
+    def _titles(self):
+        return [row[0] for row in self.conn.execute("SELECT title FROM tasks ORDER BY id")]
+
+    def test_commits_once_at_end(self):
+        """Statements are uncommitted until the block finishes"""
+        with transaction(self.conn) as uow:
+            uow.execute_update("INSERT INTO tasks (title) VALUES (?)", ("A",))
+            uow.execute_many("INSERT INTO tasks (title) VALUES (?)", [("B",), ("C",)])
+            self.assertTrue(self.conn.in_transaction)
+        self.assertFalse(self.conn.in_transaction)
+        self.assertEqual(self._titles(), ["A", "B", "C"])
+
+    def test_error_rolls_back_everything(self):
+        """A failure part way through leaves no partial changes"""
+        with self.assertRaises(sqlite3.OperationalError):
+            with transaction(self.conn) as uow:
+                uow.execute_update("INSERT INTO tasks (title) VALUES ('A')")
+                uow.execute_update("UPDATE missing SET title = 'x'")
+        self.assertEqual(self._titles(), [])
+
+    def test_nested_blocks_join_outer_transaction(self):
+        """An inner block does not commit; the outer rollback undoes it"""
+        with self.assertRaises(RuntimeError):
+            with transaction(self.conn) as outer:
+                outer.execute_update("INSERT INTO tasks (title) VALUES ('A')")
+                with transaction(self.conn) as inner:
+                    inner.execute_update("INSERT INTO tasks (title) VALUES ('B')")
+                self.assertTrue(self.conn.in_transaction)
+                raise RuntimeError("abort")
+        self.assertEqual(self._titles(), [])
+
+    def test_joins_transaction_opened_by_caller(self):
+        """A block inside a caller's BEGIN neither commits nor rolls back its work"""
+        self.conn.execute("BEGIN")
+        self.conn.execute("INSERT INTO tasks (title) VALUES ('A')")
+        with transaction(self.conn) as uow:
+            uow.execute_update("INSERT INTO tasks (title) VALUES ('B')")
+        self.assertTrue(self.conn.in_transaction)
+        self.conn.rollback()
+        self.assertEqual(self._titles(), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+# src/tests/test_write_behind.py
+
+import sys
+from pathlib import Path
+import unittest
+import tempfile
+import shutil
+import sqlite3
+import threading
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from database.db_config import db_config
+from database.write_behind import WriteBehindSaver
+
+class TestWriteBehindSaver(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.target_path = Path(self.test_dir) / "tasks.sqlite"
+
+        # The live in-memory database the app edits
+        self.memory = sqlite3.connect(":memory:")
+        db_config._create_tables(self.memory.cursor())
+        self.memory.commit()
+
+        self.scheduled = 0
+        self.saver = WriteBehindSaver(lambda: self.memory, self.target_path,
+                                      schedule=self._schedule, pages=1)
+
+    def tearDown(self):
+        self.saver.wait()
+        self.memory.close()
+        shutil.rmtree(self.test_dir)
+
+    def _schedule(self):
+        self.scheduled += 1
+
+    def _task_titles_on_disk(self):
+        conn = sqlite3.connect(self.target_path)
+        try:
+            return [row[0] for row in conn.execute("SELECT title FROM tasks ORDER BY id")]
+        finally:
+            conn.close()
+
+    def test_changes_coalesce_until_save(self):
+        """Marking dirty only schedules; one background save writes everything"""
+        for title in ("One", "Two", "Three"):
+            self.memory.execute("INSERT INTO tasks (title) VALUES (?)", (title,))
+            self.saver.mark_dirty()
+        self.memory.commit()
+
+        self.assertEqual(self.scheduled, 3)
+        self.assertTrue(self.saver.dirty)
+        self.assertFalse(self.target_path.exists())
+
+        worker = self.saver.save_async()
+        self.assertIsNotNone(worker)
+        self.saver.wait()
+        self.assertFalse(self.saver.dirty)
+        self.assertEqual(self._task_titles_on_disk(), ["One", "Two", "Three"])
+
+    def test_edits_after_snapshot_stay_dirty(self):
+        """Changes made while a save runs are not lost or marked saved"""
+        self.memory.execute("INSERT INTO tasks (title) VALUES ('First')")
+        self.memory.commit()
+        self.saver.mark_dirty()
+        self.saver.save_async()
+
+        self.memory.execute("INSERT INTO tasks (title) VALUES ('Second')")
+        self.memory.commit()
+        self.saver.mark_dirty()
+        self.saver.wait()
+        self.assertTrue(self.saver.dirty)
+
+        self.saver.flush()
+        self.assertFalse(self.saver.dirty)
+        self.assertEqual(self._task_titles_on_disk(), ["First", "Second"])
+
+    def test_clean_save_does_nothing(self):
+        """Saving with no pending changes does not start a worker"""
+        self.assertIsNone(self.saver.save_async())
+        self.assertFalse(self.target_path.exists())
+
+    def test_flush_without_tracking_writes_unmarked_edits(self):
+        """Edits nobody called mark_dirty() for still reach the file on exit"""
+        self.memory.execute("INSERT INTO tasks (title) VALUES ('Unmarked')")
+        self.memory.commit()
+        self.saver.flush()
+        self.assertEqual(self._task_titles_on_disk(), ["Unmarked"])
+
+    def test_reader_sees_unsaved_edits_without_writing_file(self):
+        """Readers on another thread get the current data while the file is left alone"""
+        self.memory.execute("INSERT INTO tasks (title) VALUES ('Pending')")
+        self.memory.commit()
+        self.saver.mark_dirty()
+
+        connect = self.saver.reader_connection_factory()
+        titles = []
+        reader = threading.Thread(target=lambda: titles.extend(
+            row[0] for row in connect().execute("SELECT title FROM tasks")))
+        reader.start()
+        reader.join()
+        self.assertEqual(titles, ["Pending"])
+        self.assertFalse(self.target_path.exists())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+# src/database/unit_of_work.py
+"""
+Transactions spanning several statements.
+
+The database managers commit after every execute_update/execute_many, so a
+multi-step change (moving a task, saving an edit with its links and files)
+pays for a commit per statement and can be left half applied if a later
+step fails. transaction() groups the steps instead:
+
+    with transaction(get_memory_db_manager()) as uow:
+        uow.execute_update("UPDATE tasks SET parent_id = ? WHERE id = ?", (parent_id, task_id))
+        uow.execute_update("UPDATE tasks SET priority = ? WHERE id = ?", (priority, task_id))
+
+Everything inside the block commits once at the end, or rolls back if the
+block raises. A block entered while the connection already has a
+transaction open (a nested transaction() block, or one the caller began)
+joins it instead: whoever opened it commits or rolls back.
+"""
+
+from contextlib import contextmanager
+
+from utils.debug_logger import get_debug_logger
+debug = get_debug_logger()
+
+
+class UnitOfWork:
+    """The database manager query API on one connection, without commits"""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def cursor(self):
+        return self.connection.cursor()
+
+    def execute_query(self, query, params=None):
+        """Execute a query and return the results"""
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(query, params or ())
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def execute_update(self, query, params=None):
+        """Execute an update and return the number of rows affected"""
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(query, params or ())
+            return cursor.rowcount
+        finally:
+            cursor.close()
+
+    def execute_many(self, query, params):
+        """Execute a query with many parameter sets"""
+        cursor = self.connection.cursor()
+        try:
+            cursor.executemany(query, params)
+            return cursor.rowcount
+        finally:
+            cursor.close()
+
+    def get_last_row_id(self):
+        """Get the ID of the last inserted row"""
+        return self.execute_query("SELECT last_insert_rowid()")[0][0]
+
+
+def _get_connection(source):
+    # Accept a database manager or a raw sqlite3 connection
+    return source.get_connection() if hasattr(source, 'get_connection') else source
+
+
+@contextmanager
+def transaction(source):
+    """Run the block in one transaction on source (a database manager or connection)"""
+    conn = _get_connection(source)
+    if conn.in_transaction:
+        # Join the open transaction; it commits or rolls back for us
+        yield UnitOfWork(conn)
+        return
+
+    conn.execute("BEGIN")
+    try:
+        yield UnitOfWork(conn)
+        conn.commit()
+    except BaseException:
+        debug.debug("Rolling back transaction")
+        conn.rollback()
+        raise
@@ -21,8 +21,8 @@ print()
 
 # First, check settings
 try:
-    from ui.app_settings import SettingsManager
-    settings = SettingsManager()
+    from ui.app_settings import get_settings_manager
+    settings = get_settings_manager()
     db_path_from_settings = Path(settings.get_setting("database_path"))
     print(f"Database path from settings: {db_path_from_settings}")
     print(f"Path exists: {db_path_from_settings.exists()}")
@@ -0,0 +1,224 @@
+# src/database/write_behind.py
+"""
+Write-behind persistence for the in-memory task database.
+
+Edits only mark the database dirty. Saves are coalesced by a debounce
+scheduler (a single-shot QTimer in the app). Each save captures the changes
+on the calling thread, which owns the memory connection, and writes them to
+disk on a background thread:
+
+- Without change tracking the capture is a private in-memory snapshot of
+  the whole database, written with a page-stepped sqlite3 backup.
+- With an IncrementalSync the capture is the rows changed since the last
+  checkpoint, written in one transaction. When rows are not enough (first
+  save, schema changes) IncrementalSync captures a snapshot instead.
+
+The capture is the part the GUI thread still pays for. A snapshot is a
+memory-to-memory copy whose cost grows with the size of the database; a
+row capture grows with the size of the edit. flush() does a whole save
+synchronously and is meant for exit.
+"""
+
+import sqlite3
+import threading
+import time
+
+from utils.debug_logger import get_debug_logger
+debug = get_debug_logger()
+
+# Pages copied per backup step; between steps other connections may use the file
+DEFAULT_BACKUP_PAGES = 256
+
+
+class WriteBehindSaver:
+    """Track dirty state and persist the memory database in the background"""
+
+    def __init__(self, source_connection_factory, target_path, schedule=None,
+                 pages=DEFAULT_BACKUP_PAGES, step_sleep=0.0, sync=None):
+        # source_connection_factory returns the live in-memory connection;
+        # schedule (e.g. QTimer.start) is called on every change and must
+        # eventually call save_async() on the thread that owns that connection
+        self.source_connection_factory = source_connection_factory
+        self.target_path = str(target_path)
+        self.schedule = schedule
+        self.pages = pages
+        self.step_sleep = step_sleep
+        self.sync = sync
+
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._saved_generation = 0
+        self._worker = None
+        self.last_error = None
+
+    @property
+    def dirty(self):
+        with self._lock:
+            if self._generation != self._saved_generation:
+                return True
+        # Change tracking also sees edits nobody called mark_dirty() for
+        return self.sync is not None and self.sync.pending_changes() > 0
+
+    def mark_dirty(self):
+        """Record that the memory database changed and schedule a save"""
+        with self._lock:
+            self._generation += 1
+        if self.schedule is not None:
+            self.schedule()
+        else:
+            self.save_async()
+
+    def is_saving(self):
+        return self._worker is not None and self._worker.is_alive()
+
+    def save_async(self):
+        """Capture the pending changes now and write them to disk in the background.
+
+        Must be called on the thread that owns the memory connection.
+        Returns the worker thread, or None if there was nothing to do.
+        """
+        if not self.dirty:
+            return None
+        if self.is_saving():
+            # One writer at a time - try again after the next debounce
+            debug.debug("Save already in progress, rescheduling")
+            if self.schedule is not None:
+                self.schedule()
+            return None
+
+        with self._lock:
+            generation = self._generation
+
+        if self.sync is not None:
+            job = self.sync.prepare()
+            if job is None:
+                # An open transaction holds uncommitted edits; retry later
+                if self.schedule is not None:
+                    self.schedule()
+                return None
+            target, args = self._write_job, (job, generation)
+        else:
+            target, args = self._write_snapshot, (self._snapshot(), generation)
+
+        self._worker = threading.Thread(
+            target=target, args=args, name="db-write-behind", daemon=True
+        )
+        self._worker.start()
+        return self._worker
+
+    def wait(self, timeout=None):
+        """Wait for a background save to finish"""
+        worker = self._worker
+        if worker is not None:
+            worker.join(timeout)
+
+    def flush(self):
+        """Synchronously persist any pending changes; raises if the save fails.
+
+        Without change tracking the dirty flag only knows about edits that
+        called mark_dirty(), so the whole database is always written.
+        """
+        self.wait()
+        if self.sync is not None and not self.dirty:
+            debug.debug("No pending database changes to flush")
+            return
+
+        with self._lock:
+            generation = self._generation
+        start_time = time.time()
+        if self.sync is None or not self.sync.sync():
+            # No change tracking, or an open transaction blocks it: copy everything
+            self._backup_to_file(self.source_connection_factory())
+        self._mark_saved(generation)
+        debug.debug(f"Flushed database to {self.target_path} in {time.time() - start_time:.3f} seconds")
+
+    def reader_connection_factory(self):
+        """A connection factory for reading the current data on another thread.
+
+        Must be called on the thread that owns the memory connection. Readers
+        get a private in-memory snapshot: it includes edits not saved yet,
+        costs no disk I/O here, and holds no lock on the file that could
+        block a later save.
+        """
+        snapshot = self._snapshot()
+        return lambda: snapshot
+
+    def _snapshot(self):
+        """Copy the live memory database into a private connection for the worker"""
+        start_time = time.time()
+        snapshot = sqlite3.connect(":memory:", check_same_thread=False)
+        self.source_connection_factory().backup(snapshot, pages=self.pages)
+        debug.debug(f"Database snapshot taken in {time.time() - start_time:.3f} seconds")
+        return snapshot
+
+    def _write_job(self, job, generation):
+        try:
+            job.run()
+            self._mark_saved(generation)
+            self.last_error = None
+        except Exception as e:
+            # The sync takes the rows back, so the next save or flush retries
+            self.sync.job_failed(job, e)
+            self.last_error = e
+            debug.error(f"Background {job.mode} sync failed: {e}")
+
+    def _write_snapshot(self, snapshot, generation):
+        start_time = time.time()
+        try:
+            self._backup_to_file(snapshot)
+            self._mark_saved(generation)
+            self.last_error = None
+            debug.debug(f"Background save to {self.target_path} finished in {time.time() - start_time:.3f} seconds")
+        except Exception as e:
+            # Stay dirty so the next save or flush retries
+            self.last_error = e
+            debug.error(f"Background database save failed: {e}")
+        finally:
+            snapshot.close()
+
+    def _backup_to_file(self, source):
+        target = sqlite3.connect(self.target_path)
+        try:
+            source.backup(target, pages=self.pages, sleep=self.step_sleep)
+        finally:
+            target.close()
+
+    def _mark_saved(self, generation):
+        with self._lock:
+            self._saved_generation = max(self._saved_generation, generation)
+
+
+_saver = None
+
+
+def install_write_behind_saver(saver):
+    """Make saver the shared write-behind engine used by mark_database_dirty()"""
+    global _saver
+    _saver = saver
+    return saver
+
+
+def get_write_behind_saver():
+    return _saver
+
+
+def mark_database_dirty():
+    """Schedule the memory database to be saved.
+
+    Falls back to an immediate save_to_file() when no write-behind engine has
+    been installed (e.g. when the UI is used outside MainWindow).
+    """
+    if _saver is not None:
+        _saver.mark_dirty()
+    else:
+        from database.memory_db_manager import get_memory_db_manager
+        get_memory_db_manager().save_to_file()
+
+
+def flush_database():
+    """Write any pending changes to disk before exit"""
+    if _saver is not None:
+        _saver.flush()
+    else:
+        from database.memory_db_manager import get_memory_db_manager
+        get_memory_db_manager().save_to_file()
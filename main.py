@@ -2,7 +2,7 @@
 from utils.debug_logger import get_debug_logger
 from utils.debug_init import init_debugger
 from utils.debug_decorator import debug_method
-from ui.app_settings import SettingsManager
+from ui.app_settings import get_settings_manager
 from ui.os_style_manager import OSStyleManager
 import argparse
 
@@ -15,7 +15,7 @@ parser.add_argument('--debug-file-path', type=str, help='Path to log file')
 args = parser.parse_args()
 
 # Initialize settings manager first
-settings = SettingsManager()
+settings = get_settings_manager()
 
 # Set arguments based on saved settings
 debug_enabled = settings.get_setting("debug_enabled", False)
@@ -34,14 +34,15 @@ debug.debug("Starting Task Organizer application")
 # Existing imports
 from PyQt6.QtWidgets import (QMainWindow, QApplication, QWidget, QVBoxLayout, 
                            QHBoxLayout, QPushButton, QStackedWidget, QFileDialog, 
-                           QMessageBox, QLabel, QTabWidget)
+                           QMessageBox, QLabel, QTabWidget, QProgressDialog)
 from ui.task_tree import TaskTreeWidget
+from ui.expanded_state import get_expanded_state_store
 from ui.task_tabs import TaskTabWidget
 from ui.task_pill_delegate import TaskPillDelegate
 from ui.combined_settings import CombinedSettingsManager
-from ui.app_settings import AppSettingsWidget, SettingsManager
+from ui.app_settings import AppSettingsWidget, get_settings_manager, flush_pending_settings
 from PyQt6.QtGui import QKeySequence, QShortcut, QIcon, QFont
-from PyQt6.QtCore import Qt, QSize, QTimer
+from PyQt6.QtCore import Qt, QSize, QTimer, QThreadPool
 from pathlib import Path
 from ui.task_dialogs import AddTaskDialog
 import csv
@@ -57,6 +58,10 @@ import traceback
 # Import database modules
 from database.memory_db_manager import get_memory_db_manager
 from database.db_config import db_config, ensure_db_exists
+from database.write_behind import (WriteBehindSaver, install_write_behind_saver, get_write_behind_saver,
+                                   flush_database, mark_database_dirty)
+from database.incremental_sync import IncrementalSync
+from database.task_search import install_task_search
 
 # Global function for database connection used by all classes
 def get_global_connection():
@@ -72,7 +77,7 @@ class MainWindow(QMainWindow):
         
         # Initialize settings manager
         debug.debug("Creating SettingsManager")
-        self.settings = SettingsManager()
+        self.settings = get_settings_manager()
         
         # Get OS style information
         app = QApplication.instance()
@@ -97,6 +102,10 @@ class MainWindow(QMainWindow):
         self.db_path = self.settings.prompt_for_database_location(self)
         debug.debug(f"Database path: {self.db_path}")
         
+        # Save edits to disk in the background instead of on every change
+        debug.debug("Initializing write-behind database saving")
+        self.init_write_behind()
+        
         # Create stacked widget to hold both views
         debug.debug("Creating stacked widget")
         self.stacked_widget = QStackedWidget()
@@ -131,9 +140,8 @@ class MainWindow(QMainWindow):
         for i in range(self.tabs.count()):
             tab = self.tabs.widget(i)
             if hasattr(tab, 'task_tree'):
-                # Get tab-specific expanded states from settings
-                tab_key = f"expanded_states_tab_{i}"
-                expanded_items = self.settings.get_setting(tab_key, [])
+                # Get this tab's expanded task IDs from the expanded-state store
+                expanded_items = tab.task_tree.expanded_task_ids()
                 
                 if expanded_items:
                     debug.debug(f"Scheduling restoration of {len(expanded_items)} expanded states for tab {i}")
@@ -442,13 +450,7 @@ class MainWindow(QMainWindow):
     @debug_method
     def show_settings(self, checked=False):
         debug.debug("Showing settings view")
-        # Save expanded states before switching to settings
-        current_tab = self.tabs.currentWidget()
-        if hasattr(current_tab, 'task_tree'):
-            debug.debug("Saving expanded states before switching to settings")
-            print('show_settings save_expanded_states called')
-            current_tab.task_tree._save_expanded_states()
-            
+        # Expanded states are already in the store; nothing to save here
         self.stacked_widget.setCurrentIndex(1)
         self.apply_debug_styling()
          
@@ -562,42 +564,59 @@ class MainWindow(QMainWindow):
         file_path, _ = QFileDialog.getSaveFileName(
             self, "Save CSV", "", "CSV Files (*.csv)")
         
-        if file_path:
-            debug.debug(f"Exporting to CSV file: {file_path}")
-            try:
-                with open(file_path, 'w', newline='') as file:
-                    writer = csv.writer(file)
-                    writer.writerow([
-                        'Title', 'Description', 'Link', 'Status', 'Priority', 
-                        'Due Date', 'Category', 'Parent', 'Completed At'
-                    ])
-                    
-                    # Use the memory database manager
-                    memory_db = get_memory_db_manager()
-                    
-                    # Query all tasks with their parent titles
-                    debug.debug("Querying tasks for export")
-                    tasks = memory_db.execute_query("""
-                        SELECT t.title, t.description, t.link, t.status, t.priority, 
-                               t.due_date, c.name, p.title as parent_title, t.completed_at
-                        FROM tasks t
-                        LEFT JOIN categories c ON t.category_id = c.id
-                        LEFT JOIN tasks p ON t.parent_id = p.id
-                        ORDER BY t.id
-                    """)
-                    
-                    # Write all tasks to CSV
-                    debug.debug(f"Writing {len(tasks)} tasks to CSV")
-                    for task in tasks:
-                        writer.writerow(task)
-                
-                debug.debug("Export completed successfully")
-                QMessageBox.information(self, "Success", "Export completed successfully!")
-            except Exception as e:
-                debug.error(f"Error exporting data: {e}")
-                QMessageBox.critical(self, "Error", f"Error exporting data: {str(e)}")
-        else:
+        if not file_path:
             debug.debug("Export canceled by user")
+            return
+        
+        debug.debug(f"Exporting to CSV file: {file_path}")
+        try:
+            # The worker needs a connection of its own: a private snapshot of
+            # the memory database, so nothing is written to disk here
+            saver = get_write_behind_saver()
+            if saver is not None:
+                connection_factory = saver.reader_connection_factory()
+            else:
+                # Without write-behind every edit is already saved to the file
+                db_path = str(db_config.path)
+                connection_factory = lambda: sqlite3.connect(db_path)
+        except Exception as e:
+            debug.error(f"Error preparing database for export: {e}")
+            QMessageBox.critical(self, "Error", f"Error exporting data: {str(e)}")
+            return
+        
+        from ui.csv_workers import CsvExportWorker
+        worker = CsvExportWorker(connection_factory, file_path)
+        
+        progress = QProgressDialog("Exporting tasks...", "Cancel", 0, 0, self)
+        progress.setWindowTitle("Export to CSV")
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(300)
+        progress.canceled.connect(worker.cancel)
+        
+        def show_progress(rows, total):
+            progress.setMaximum(total)
+            progress.setValue(rows)
+        
+        def finished(rows):
+            self.csv_export_worker = None
+            progress.close()
+            debug.debug(f"Export of {rows} tasks completed successfully")
+            QMessageBox.information(self, "Success", "Export completed successfully!")
+        
+        def failed(message):
+            self.csv_export_worker = None
+            progress.close()
+            debug.error(f"Error exporting data: {message}")
+            QMessageBox.critical(self, "Error", f"Error exporting data: {message}")
+        
+        worker.signals.progress.connect(show_progress)
+        worker.signals.finished.connect(finished)
+        worker.signals.cancelled.connect(progress.close)
+        worker.signals.error.connect(failed)
+        
+        # Keep a reference until the worker reports back
+        self.csv_export_worker = worker
+        QThreadPool.globalInstance().start(worker)
 
     @debug_method
     def import_from_csv(self, checked=False):
@@ -605,74 +624,57 @@ class MainWindow(QMainWindow):
         file_path, _ = QFileDialog.getOpenFileName(
             self, "Open CSV", "", "CSV Files (*.csv)")
         
-        if file_path:
-            debug.debug(f"Importing from CSV file: {file_path}")
-            try:
-                # First pass: create all items
-                items_by_title = {}
-                
-                with open(file_path, 'r', newline='') as file:
-                    reader = csv.DictReader(file)
-                    row_count = 0
-                    for row in reader:
-                        row_count += 1
-                        data = {
-                            'title': row['Title'],
-                            'description': row.get('Description', ''),
-                            'link': row.get('Link', ''),
-                            'status': row.get('Status', 'Not Started'),
-                            'priority': row.get('Priority', 'Medium'),
-                            'due_date': row.get('Due Date', ''),
-                            'category': row.get('Category', ''),
-                            'parent_id': None,  # Will be set in second pass
-                            'completed_at': row.get('Completed At', '')
-                        }
-                        # Store the parent title for second pass
-                        items_by_title[row['Title']] = {
-                            'data': data,
-                            'parent_title': row.get('Parent', '')
-                        }
-                    debug.debug(f"Read {row_count} rows from CSV")
-                
-                # Second pass: set parent relationships
-                debug.debug("Processing parent relationships")
-                memory_db = get_memory_db_manager()
-                conn = memory_db.get_connection()
-                cursor = conn.cursor()
-                
-                for title, item_info in items_by_title.items():
-                    parent_title = item_info['parent_title']
-                    if parent_title and parent_title in items_by_title:
-                        # Find parent's ID in database
-                        cursor.execute("SELECT id FROM tasks WHERE title = ?", 
-                                     (parent_title,))
-                        result = cursor.fetchone()
-                        if result:
-                            item_info['data']['parent_id'] = result[0]
-                            debug.debug(f"Set parent ID {result[0]} for task '{title}'")
-                
-                # Add all items to database
-                current_tree = self.tabs.get_current_tree()
-                if current_tree:
-                    debug.debug("Adding tasks to database")
-                    added_count = 0
-                    for title, item_info in items_by_title.items():
-                        task_id = current_tree.add_new_task(item_info['data'])
-                        if task_id:
-                            added_count += 1
-                    
-                    debug.debug(f"Added {added_count} tasks from CSV")
-                    
-                    # Refresh all tabs
-                    self.tabs.reload_all()
-                
-                debug.debug("Import completed successfully")
-                QMessageBox.information(self, "Success", "Import completed successfully!")
-            except Exception as e:
-                debug.error(f"Error importing data: {e}")
-                QMessageBox.critical(self, "Error", f"Error importing data: {str(e)}")
-        else:
+        if not file_path:
             debug.debug("Import canceled by user")
+            return
+        
+        # Read the file on a worker thread; the insert happens in finish_csv_import
+        debug.debug(f"Importing from CSV file: {file_path}")
+        from ui.csv_workers import CsvImportWorker
+        worker = CsvImportWorker(file_path)
+        
+        progress = QProgressDialog("Reading CSV...", "Cancel", 0, 0, self)
+        progress.setWindowTitle("Import from CSV")
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(300)
+        progress.canceled.connect(worker.cancel)
+        
+        worker.signals.progress.connect(lambda rows, total: progress.setLabelText(f"Read {rows} rows..."))
+        worker.signals.finished.connect(lambda plan: self.finish_csv_import(plan, progress))
+        worker.signals.cancelled.connect(progress.close)
+        worker.signals.error.connect(lambda message: self._csv_import_failed(message, progress))
+        
+        # Keep a reference until the worker reports back
+        self.csv_import_worker = worker
+        QThreadPool.globalInstance().start(worker)
+    
+    def finish_csv_import(self, plan, progress):
+        """Insert a parsed CSV in one transaction and reload the tabs once"""
+        self.csv_import_worker = None
+        if progress.wasCanceled():
+            debug.debug("CSV import cancelled before insert")
+            return
+        progress.setLabelText(f"Importing {len(plan)} tasks...")
+        try:
+            from database.csv_transfer import insert_import_plan
+            new_ids = insert_import_plan(get_memory_db_manager().get_connection(), plan)
+            mark_database_dirty()
+            debug.debug(f"Added {len(new_ids)} tasks from CSV")
+            
+            # Refresh all tabs
+            self.tabs.reload_all()
+            progress.close()
+            
+            debug.debug("Import completed successfully")
+            QMessageBox.information(self, "Success", f"Imported {len(new_ids)} tasks successfully!")
+        except Exception as e:
+            self._csv_import_failed(str(e), progress)
+    
+    def _csv_import_failed(self, message, progress):
+        self.csv_import_worker = None
+        progress.close()
+        debug.error(f"Error importing data: {message}")
+        QMessageBox.critical(self, "Error", f"Error importing data: {message}")
 
     @debug_method
     def save_template(self, checked=False):
@@ -723,68 +725,51 @@ class MainWindow(QMainWindow):
         else:
             debug.debug("Template creation canceled by user")
 
+    @debug_method
+    def init_write_behind(self):
+        """Coalesce database saves on a debounce timer and write them off the GUI thread"""
+        self.save_timer = QTimer(self)
+        self.save_timer.setSingleShot(True)
+        self.save_timer.setInterval(self.settings.get_setting("autosave_delay_ms", 1500))
+        
+        # The memory database was just loaded from the file, so that is the
+        # first checkpoint; saves then only write the rows changed since
+        sync = None
+        if self.settings.get_setting("incremental_sync", True):
+            try:
+                sync = IncrementalSync(lambda: get_memory_db_manager().get_connection(), db_config.path)
+                sync.start(in_sync=True)
+            except Exception as e:
+                debug.error(f"Could not enable incremental sync, using full saves: {e}")
+                sync = None
+        
+        self.write_behind = install_write_behind_saver(WriteBehindSaver(
+            lambda: get_memory_db_manager().get_connection(),
+            db_config.path,
+            schedule=self.save_timer.start,
+            sync=sync
+        ))
+        self.save_timer.timeout.connect(self.write_behind.save_async)
+        debug.debug(f"Write-behind saving to {db_config.path} every {self.save_timer.interval()} ms")
+    
     @debug_method
     def closeEvent(self, event):
         """Handle application shutdown"""
         debug.debug("Application closing - handling closeEvent")
         try:
-            # Save expanded states for tabs with either expanded priority headers or tasks
-            debug.debug("Saving expanded states for all relevant tabs")
-            
-            # Loop through tabs and check for any expanded items
-            for i in range(self.tabs.count()):
-                tab = self.tabs.widget(i)
-                if hasattr(tab, 'task_tree'):
-                    debug.debug(f"Checking tab {i} for expanded items")
-                    
-                    # Count expanded items (both priority headers and tasks)
-                    tree = tab.task_tree
-                    all_items = []
-                    for j in range(tree.topLevelItemCount()):
-                        top_item = tree.topLevelItem(j)
-                        all_items.append(top_item)
-                        if hasattr(tree, '_collect_child_items'):
-                            tree._collect_child_items(top_item, all_items)
-                    
-                    # Check for any expanded items (priority headers or tasks)
-                    expanded_items = []
-                    for item in all_items:
-                        index = tree.indexFromItem(item)
-                        if index.isValid() and tree.isExpanded(index):
-                            # Check if it's a priority header
-                            data = item.data(0, Qt.ItemDataRole.UserRole)
-                            if isinstance(data, dict) and data.get('is_priority_header', False):
-                                priority = data.get('priority', 'Unknown')
-                                expanded_items.append(f"priority:{priority}")
-                                debug.debug(f"Found expanded priority header: {priority}")
-                            # Check if it's a task with children
-                            elif hasattr(item, 'task_id') and item.childCount() > 0:
-                                expanded_items.append(f"task:{item.task_id}")
-                                debug.debug(f"Found expanded task: {item.task_id}")
-                    
-                    # Save if we have any expanded items (priority headers or tasks)
-                    if expanded_items:
-                        tab_key = f"expanded_states_tab_{i}"
-                        self.settings.set_setting(tab_key, expanded_items)
-                        debug.debug(f"Saved {len(expanded_items)} expanded states for tab {i}")
-                        
-                        # Also save to the common key if it's the current tab
-                        if i == self.tabs.currentIndex():
-                            self.settings.set_setting("expanded_task_states", expanded_items)
-                            debug.debug("Saved to common expanded_task_states key (current tab)")
-                    else:
-                        debug.debug(f"No expanded items in tab {i}, not saving")
-            
-            # Save the in-memory database back to file
-            debug.debug("Saving in-memory database to file")
-            from database.memory_db_manager import get_memory_db_manager
-            db_manager = get_memory_db_manager()
-            db_manager.save_to_file()
+            # Flush pending write-behind saves and write the in-memory database to file
+            debug.debug("Flushing in-memory database to file")
+            if hasattr(self, 'save_timer'):
+                self.save_timer.stop()
+            flush_database()
             debug.debug("Database saved successfully before exit")
             
-            # Explicitly save settings before exit
-            debug.debug("Saving application settings")
-            self.settings.save_settings(self.settings.settings)
+            # The expanded states and any debounced changes go out in one
+            # settings write when the batch ends
+            debug.debug("Saving expanded states and application settings")
+            with self.settings.batch():
+                get_expanded_state_store().save()
+            flush_pending_settings()
             debug.debug(f"Settings saved successfully.")
 
         except Exception as e:
@@ -935,7 +920,7 @@ def main():
     
     # Initialize settings manager first
     debug.debug("Initializing SettingsManager")
-    settings = SettingsManager()
+    settings = get_settings_manager()
     
     # Create OS Style Manager
     debug.debug("Creating OS Style Manager")
@@ -967,10 +952,9 @@ def main():
     debug.debug("Ensuring database directory exists")
     db_config.ensure_directory_exists()
     
-    # Create database if it doesn't exist
-    if not db_config.database_exists():
-        debug.debug("Database doesn't exist. Creating a new one...")
-        db_config.create_database()
+    # Create the database if it doesn't exist, or add indexes an older version lacks
+    debug.debug("Ensuring database exists with current indexes")
+    ensure_db_exists()
     
     # Load the database into memory
     debug.debug(f"Loading database into memory from {db_path}")
@@ -987,6 +971,13 @@ def main():
                            f"Failed to initialize database: {str(e)}\n\nThe application will now exit.")
         sys.exit(1)
     
+    # Build the search index now instead of during the first search
+    try:
+        debug.debug("Building task search index")
+        install_task_search(memory_db_manager.get_connection())
+    except Exception as e:
+        debug.error(f"Could not build task search index: {e}")
+    
     # Apply the global connection method to all classes
     debug.debug("Applying global connection method")
     apply_connection_method()
@@ -3,8 +3,13 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
                            QFileDialog, QMessageBox, QLabel, QCheckBox, 
                            QGroupBox, QFormLayout, QLineEdit, QSpinBox, QApplication)
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
 from pathlib import Path
+from contextlib import contextmanager
 import json
+import copy
+import os
+import tempfile
 import shutil
 import sqlite3
 import sys
@@ -20,8 +25,24 @@ from utils.debug_logger import get_debug_logger
 from utils.debug_decorator import debug_method
 debug = get_debug_logger()
 
-class SettingsManager:
+# Delay before deferred settings changes are written to disk
+SETTINGS_FLUSH_DELAY_MS = 1000
+
+# Managers with a deferred write outstanding; holding them here keeps short-lived
+# instances alive until their timer fires and lets closeEvent flush them all
+_pending_managers = set()
+
+def flush_pending_settings():
+    """Write every deferred settings change now (call before exit)"""
+    for manager in list(_pending_managers):
+        manager.flush()
+
+class SettingsManager(QObject):
+    # Emitted with the key whenever set_setting() changes a value
+    setting_changed = pyqtSignal(str)
+
     def __init__(self):
+        super().__init__()
         debug.debug("Initializing SettingsManager")
         # Define the settings file location in the user's home directory
         self.settings_dir = Path.home() / ".task_organizer"
@@ -44,13 +65,24 @@ class SettingsManager:
         }
         debug.debug(f"Default settings: {self.default_settings}")
         
+        # Write coalescing state: nested batch() depth, unsaved changes and
+        # the debounce timer (created on first use, once a QApplication exists)
+        self._batch_depth = 0
+        self._dirty = False
+        self._flush_timer = None
+        
         # Ensure settings directory exists
         debug.debug(f"Ensuring settings directory exists: {self.settings_dir}")
         self.settings_dir.mkdir(parents=True, exist_ok=True)
         
-        # Load or create settings
+        # Load or create settings (save_settings may run before they are loaded)
         debug.debug("Loading settings")
+        self.settings = None
         self.settings = self.load_settings()
+        
+        # Copies of the values as last set, so a list or dict edited in place
+        # and set back still counts as a change
+        self._last_values = copy.deepcopy(self.settings)
     
     def load_settings(self):
         """Load settings from the JSON file or create default settings if the file doesn't exist."""
@@ -84,17 +116,34 @@ class SettingsManager:
             return self.default_settings
     
     def save_settings(self, settings):
-        """Save settings to the JSON file."""
+        """Save settings to the JSON file.
+
+        Writes to a temporary file in the settings directory and renames it over
+        settings.json, so a crash mid-write never leaves a truncated file.
+        """
         debug.debug(f"Saving settings to {self.settings_file}")
+        temp_path = None
         try:
-            with open(self.settings_file, 'w') as f:
+            with tempfile.NamedTemporaryFile('w', dir=self.settings_dir, prefix=".settings-",
+                                             suffix=".tmp", delete=False) as f:
+                temp_path = f.name
                 json.dump(settings, f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.settings_file)
             
+            if settings is self.settings:
+                self._dirty = False
             debug.debug(f"Settings values: left_panel_contents={settings.get('left_panel_contents', [])}, right_panel_contents={settings.get('right_panel_contents', [])}")
             debug.debug(f"Settings saved to {self.settings_file}")
             return True
-        except IOError as e:
+        except (IOError, OSError) as e:
             debug.error(f"Error saving settings: {e}")
+            if temp_path and os.path.exists(temp_path):
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
             return False
     
     def get_setting(self, key, default=None):
@@ -103,13 +152,83 @@ class SettingsManager:
         debug.debug(f"Getting setting: {key} = {value}")
         return value
     
-    def set_setting(self, key, value):
-        """Set a setting value and save to file."""
+    def set_setting(self, key, value, deferred=False):
+        """Set a setting value and save to file.
+
+        Inside a batch() block the write happens once when the block ends.
+        With deferred=True the write is debounced, so a burst of calls (e.g.
+        expanding several items) produces a single write.
+        """
         debug.debug(f"Setting setting: {key} = {value}")
+        changed = key not in self._last_values or self._last_values[key] != value
         self.settings[key] = value
-        debug.debug(f"Settings after update: {self.settings}")
+        if changed:
+            self._last_values[key] = copy.deepcopy(value)
+            self.setting_changed.emit(key)
+        if self._batch_depth > 0:
+            self._dirty = True
+            return True
+        if deferred:
+            self._dirty = True
+            return self._schedule_flush()
+        return self.save_settings(self.settings)
+    
+    def remove_settings(self, keys):
+        """Remove settings by key and save to file once (missing keys are ignored)."""
+        removed = [key for key in keys if key in self.settings]
+        if not removed:
+            return True
+        debug.debug(f"Removing settings: {removed}")
+        for key in removed:
+            del self.settings[key]
+            self._last_values.pop(key, None)
+            self.setting_changed.emit(key)
+        if self._batch_depth > 0:
+            self._dirty = True
+            return True
         return self.save_settings(self.settings)
     
+    @contextmanager
+    def batch(self, deferred=False):
+        """Group set_setting() calls into a single write at the end of the block.
+
+        With deferred=True the write at the end is debounced like set_setting(deferred=True).
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._dirty:
+                if deferred:
+                    self._schedule_flush()
+                else:
+                    self.flush()
+    
+    def flush(self):
+        """Write pending settings changes to disk now"""
+        if self._flush_timer is not None:
+            self._flush_timer.stop()
+        _pending_managers.discard(self)
+        if not self._dirty:
+            return True
+        debug.debug("Flushing pending settings changes")
+        return self.save_settings(self.settings)
+    
+    def _schedule_flush(self):
+        """Start (or restart) the debounce timer for a deferred write"""
+        if self._flush_timer is None:
+            if QApplication.instance() is None:
+                # No event loop to run the timer, so write straight away
+                return self.flush()
+            self._flush_timer = QTimer()
+            self._flush_timer.setSingleShot(True)
+            self._flush_timer.setInterval(SETTINGS_FLUSH_DELAY_MS)
+            self._flush_timer.timeout.connect(self.flush)
+        _pending_managers.add(self)
+        self._flush_timer.start()
+        return True
+    
     def prompt_for_database_location(self, parent_widget=None):
         """
         Prompt the user to choose a database location if not already set.
@@ -160,6 +279,15 @@ class SettingsManager:
         return str(db_path)
 
 
+_shared_settings = None
+
+def get_settings_manager():
+    """Return the process-wide SettingsManager, loading settings.json on first use"""
+    global _shared_settings
+    if _shared_settings is None:
+        _shared_settings = SettingsManager()
+    return _shared_settings
+
 class AppSettingsWidget(QWidget):
     def __init__(self, main_window):
         debug.debug("Initializing AppSettingsWidget")
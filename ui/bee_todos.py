@@ -19,23 +19,29 @@ from utils.debug_decorator import debug_method
 # Get the debug logger
 debug = get_debug_logger()
 
-# Import the Bee To-Do Manager
-from beeai import Bee
+from utils.bee_requests import fetch_all_pages, run_bounded, DEFAULT_CONCURRENCY
 
 # Signal manager for async operations
 class WorkerSignals(QObject):
     finished = pyqtSignal(list)
     error = pyqtSignal(str)
     progress = pyqtSignal(int)
+    result = pyqtSignal(object, bool)
 
 # Worker class for async operations
 class Worker(QRunnable):
-    def __init__(self, fn, *args, **kwargs):
+    def __init__(self, fn, *args, report_progress=False, report_results=False, **kwargs):
         super().__init__()
         self.fn = fn
         self.args = args
         self.kwargs = kwargs
         self.signals = WorkerSignals()
+        if report_progress:
+            # fn reports progress through a progress= callback
+            self.kwargs['progress'] = self.signals.progress.emit
+        if report_results:
+            # fn streams per-item (item, success) results through on_result=
+            self.kwargs['on_result'] = self.signals.result.emit
         
     def run(self):
         try:
@@ -238,14 +244,14 @@ class BeeToDoWidget(QWidget):
             self.todos_group.setVisible(False)
             self.actions_group.setVisible(False)
         
-        # Show progress bar
+        # Show progress bar (busy - the total is not known until the last page)
         if hasattr(self, 'progress_bar'):
+            self.progress_bar.setRange(0, 0)
             self.progress_bar.setVisible(True)
-            self.progress_bar.setValue(0)
         
         # Create worker to fetch todos in background
         debug.debug("Creating worker to fetch todos in background")
-        worker = Worker(self.bee_manager.get_all_todos)
+        worker = Worker(self.bee_manager.get_all_todos, report_progress=True)
         worker.signals.finished.connect(self.on_todos_loaded)
         worker.signals.error.connect(self.on_load_error)
         worker.signals.progress.connect(self.update_progress)
@@ -297,10 +303,9 @@ class BeeToDoWidget(QWidget):
     
     @debug_method
     def update_progress(self, value):
-        """Update progress bar"""
-        debug.debug(f"Updating progress bar: {value}")
-        if hasattr(self, 'progress_bar'):
-            self.progress_bar.setValue(value)
+        """Show how many to-dos have been loaded so far"""
+        debug.debug("Loaded %d to-dos so far", value)
+        self.empty_label.setText(f"Loading To-Dos from Bee... ({value} loaded)")
     
     @debug_method
     def populate_todos_list(self):
@@ -512,7 +517,11 @@ class BeeToDoWidget(QWidget):
             
             # Create worker to delete todos in background
             debug.debug("Creating worker to delete to-dos in background")
-            worker = Worker(self.bee_manager.delete_multiple_todos, todo_ids)
+            self.delete_cancelled = False
+            self.deleted_count = 0
+            worker = Worker(self.bee_manager.delete_multiple_todos, todo_ids,
+                            report_results=True, is_cancelled=lambda: self.delete_cancelled)
+            worker.signals.result.connect(self.on_todo_deleted)
             worker.signals.finished.connect(lambda results: self.on_delete_completed(results))
             worker.signals.error.connect(lambda error: self.on_delete_error(error))
             
@@ -522,6 +531,16 @@ class BeeToDoWidget(QWidget):
         else:
             debug.debug("User canceled deletion")
 
+    def on_todo_deleted(self, todo_id, success):
+        """Advance the progress dialog as each deletion finishes"""
+        debug.debug("To-do %s deleted: %s", todo_id, success)
+        self.deleted_count += 1
+        if hasattr(self, 'progress_dialog') and self.progress_dialog:
+            self.progress_dialog.setValue(self.deleted_count)
+        # Still making progress, so push the safety timeout back
+        if hasattr(self, 'timeout_timer') and self.timeout_timer.isActive():
+            self.timeout_timer.start()
+
     @debug_method
     def on_delete_completed(self, results):
         """Handle completion of to-do deletion"""
@@ -538,6 +557,12 @@ class BeeToDoWidget(QWidget):
             self.progress_dialog.close()
             self.progress_dialog = None
         
+        # The user already saw the cancellation message; just show what is left
+        if getattr(self, 'delete_cancelled', False):
+            debug.debug(f"Canceled deletion finished after {len(results)} items")
+            self.load_todos()
+            return
+        
         # Count successes and failures
         successes = sum(1 for _, success in results if success)
         failures = len(results) - successes
@@ -591,6 +616,8 @@ class BeeToDoWidget(QWidget):
     def on_delete_canceled(self):
         """Handle user canceling the deletion"""
         debug.debug("User canceled deletion operation")
+        # Deletions already in flight finish; the rest are skipped
+        self.delete_cancelled = True
         
         # Stop timeout timer
         if hasattr(self, 'timeout_timer'):
@@ -715,46 +742,24 @@ class BeeToDoWidget(QWidget):
                 }
                 formatted_todos.append(task_data)
             
-            # Use the app's main window to add tasks
-            tasks_added = 0
-            
-            # Get the appropriate task tree
-            if destination == "Backlog":
-                debug.debug("Using backlog task tree")
-                current_tree = self.main_window.tabs.backlog_tab.task_tree
-            else:
-                debug.debug("Using current tasks tree")
-                current_tree = self.main_window.tabs.current_tasks_tab.task_tree
+            # The new items reach every loaded tab through the tab widget, so
+            # any tree will do; the Current tab's is always built (the Backlog
+            # tree may not be yet)
+            current_tree = self.main_window.tabs.current_tasks_tab.task_tree
             
-            # Add all tasks to the tree
-            for task_data in formatted_todos:
-                try:
-                    debug.debug(f"Adding task: {task_data['title']}")
-                    # Add the task
-                    task_id = current_tree.add_new_task(task_data)
-                    if task_id:
-                        tasks_added += 1
-                        debug.debug(f"Task added with ID: {task_id}")
-                except Exception as e:
-                    debug.error(f"Error adding task: {e}")
-                    import traceback
-                    error_tb = traceback.format_exc()
-                    debug.error(f"Traceback: {error_tb}")
+            # Insert everything in one transaction; the tabs refresh once
+            new_ids, skipped = current_tree.add_new_tasks(formatted_todos)
+            tasks_added = len(new_ids)
             
             # Close progress dialog
             progress_dialog.close()
             
-            # Reload all tabs to reflect changes
-            debug.debug("Reloading all tabs to reflect changes")
-            self.main_window.tabs.reload_all()
-            
             # Show success message
             debug.debug(f"Import completed, {tasks_added} tasks added")
-            QMessageBox.information(
-                self, 
-                "Import Complete", 
-                f"Successfully imported {tasks_added} To-Do items from Bee"
-            )
+            message = f"Successfully imported {tasks_added} To-Do items from Bee"
+            if skipped:
+                message += f"\n{skipped} already imported items were skipped"
+            QMessageBox.information(self, "Import Complete", message)
             
         except Exception as e:
             debug.error(f"Error during import: {e}")
@@ -776,6 +781,8 @@ class BeeToDoManager:
     def __init__(self, api_key):
         debug.debug("Initializing BeeToDoManager")
         self.api_key = api_key
+        # Imported here so the optional Bee SDK only loads once it is used
+        from beeai import Bee
         self.bee = Bee(api_key)
         debug.debug("Bee SDK instance created")
 
@@ -795,67 +802,60 @@ class BeeToDoManager:
             return False
 
     @debug_method
-    async def delete_multiple_todos(self, todo_ids):
-        """Delete multiple to-do items"""
+    async def delete_multiple_todos(self, todo_ids, on_result=None, is_cancelled=None,
+                                    concurrency=DEFAULT_CONCURRENCY):
+        """Delete multiple to-do items, `concurrency` at a time.
+
+        Failed deletes are retried with backoff; on_result(todo_id, success)
+        is called as each one finishes.
+        """
         debug.debug(f"Deleting multiple to-dos: {todo_ids}")
-        results = []
-        for todo_id in todo_ids:
-            try:
-                # Delete the todo
-                debug.debug(f"Deleting to-do {todo_id}")
-                await self.bee.delete_todo("me", todo_id)
-                results.append((todo_id, True))
-                debug.debug(f"Successfully deleted to-do {todo_id}")
-            except Exception as e:
-                debug.error(f"Error deleting to-do {todo_id}: {e}")
-                import traceback
-                error_tb = traceback.format_exc()
-                debug.error(f"Traceback: {error_tb}")
-                results.append((todo_id, False))
+        
+        async def delete(todo_id):
+            await self.bee.delete_todo("me", todo_id)
+        
+        results = await run_bounded(todo_ids, delete, concurrency=concurrency,
+                                    on_result=on_result, is_cancelled=is_cancelled)
         
         debug.debug(f"Deletion complete, results: {results}")
         return results
 
+    async def get_todos_page(self, page):
+        """Fetch one page of to-do items"""
+        todos_response = await self.bee.get_todos("me", page=page)
+        return todos_response.get("todos", [])
+
     @debug_method
-    async def get_all_todos(self):
-        """Fetch all to-do items from the Bee API using SDK with pagination"""
+    async def get_all_todos(self, progress=None, concurrency=DEFAULT_CONCURRENCY):
+        """Fetch all to-do items from the Bee API using SDK with pagination.
+
+        Up to `concurrency` pages are requested at once; progress is called
+        with the number of to-dos loaded so far.
+        """
         debug.debug("Fetching to-dos using SDK with pagination")
         try:
-            all_todos = []
-            page = 1
-            has_more = True
+            # The first page also tells us whether the SDK supports paging
+            try:
+                first_page = await self.get_todos_page(1)
+            except TypeError:
+                debug.debug("Page parameter not supported, using default call")
+                todos_response = await self.bee.get_todos("me")
+                return todos_response.get("todos", [])
             
-            debug.debug("Starting pagination process")
+            if not first_page:
+                debug.debug("No to-dos on page 1")
+                return []
+            if progress:
+                progress(len(first_page))
             
-            while has_more:
-                debug.debug(f"Fetching page {page}...")
-                
-                # Try to use SDK with page parameter
-                try:
-                    # The SDK might support the page parameter
-                    debug.debug("Attempting to use SDK with page parameter")
-                    todos_response = await self.bee.get_todos("me", page=page)
-                except TypeError:
-                    # If page parameter doesn't work, we'll need to use the default call
-                    debug.debug("Page parameter not supported, using default call")
-                    todos_response = await self.bee.get_todos("me")
-                
-                # Get the current page of todos
-                current_todos = todos_response.get("todos", [])
-                
-                if not current_todos:
-                    debug.debug(f"No to-dos on page {page}")
-                    break
-                
-                debug.debug(f"Fetched {len(current_todos)} to-dos on page {page}")
-                all_todos.extend(current_todos)
-                
-                # If we got exactly 10 items, there might be more pages
-                has_more = len(current_todos) == 10
-                debug.debug(f"Has more pages: {has_more}")
-                
-                # Move to next page
-                page += 1
+            async def fetch_page(page):
+                return await self.get_todos_page(page + 1)
+            
+            rest = await fetch_all_pages(
+                fetch_page, concurrency=concurrency,
+                progress=(lambda count: progress(len(first_page) + count)) if progress else None
+            )
+            all_todos = first_page + rest
             
             debug.debug(f"Total to-dos fetched: {len(all_todos)}")
             return all_todos
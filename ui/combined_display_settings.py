@@ -568,15 +568,13 @@ class CombinedDisplaySettingsWidget(QWidget):
         debug.debug(f"Left panel contents: {left_final}")
         debug.debug(f"Right panel contents: {right_final}")
         
-        # Save settings directly
-        self.settings.set_setting("left_panel_contents", left_final)
-        self.settings.set_setting("right_panel_contents", right_final)
-        
-        # Set auto text color to always be enabled
-        self.settings.set_setting("auto_panel_text_color", True)
-        
-        # Force settings to save to disk
-        self.settings.save_settings(self.settings.settings)
+        # Save settings to disk in one write
+        with self.settings.batch():
+            self.settings.set_setting("left_panel_contents", left_final)
+            self.settings.set_setting("right_panel_contents", right_final)
+            
+            # Set auto text color to always be enabled
+            self.settings.set_setting("auto_panel_text_color", True)
         
         # Directly modify the delegate if it exists
         if hasattr(self.task_preview, 'sample_tree') and self.task_preview.sample_tree:
@@ -14,6 +14,9 @@ import json
 # Import debug utilities
 from utils.debug_logger import get_debug_logger
 from utils.debug_decorator import debug_method
+from database.lookup_cache import invalidate_lookup_cache
+from database.unit_of_work import transaction
+from database.write_behind import mark_database_dirty
 
 # Get debug logger instance
 debug = get_debug_logger()
@@ -251,6 +254,8 @@ class SettingPillItem(QWidget):
                          (color, self.item_id))
             conn.commit()
             debug.debug(f"Color updated in database for {self.item_type} ID {self.item_id}")
+        invalidate_lookup_cache()
+        mark_database_dirty()
     
     @debug_method
     def edit_item(self, check = False):
@@ -683,8 +688,9 @@ class CombinedSettingsManager(QWidget):
             return  # Should never happen
         
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
+            # Shift and move in one transaction so a failure cannot leave duplicate orders
+            with transaction(self.get_connection()) as uow:
+                cursor = uow.cursor()
                 
                 # Get current display orders
                 cursor.execute(f"SELECT id, display_order FROM {table_name} ORDER BY display_order")
@@ -726,8 +732,9 @@ class CombinedSettingsManager(QWidget):
                     WHERE id = ?
                 """, (target_order, source_id))
                 
-                conn.commit()
                 debug.debug(f"Database updated successfully for {item_type} reordering")
+            invalidate_lookup_cache()
+            mark_database_dirty()
             
             # Reload the appropriate list
             if item_type == "priority":
@@ -828,6 +835,8 @@ class CombinedSettingsManager(QWidget):
                 
                 conn.commit()
                 debug.debug(f"Successfully deleted {item_type} ID {item_id}")
+            invalidate_lookup_cache()
+            mark_database_dirty()
         except Exception as e:
             debug.error(f"Error deleting {item_type}: {e}")
             QMessageBox.warning(self, "Error", f"Failed to delete {item_type}: {str(e)}")
@@ -922,6 +931,8 @@ class CombinedSettingsManager(QWidget):
                 
                 conn.commit()
                 debug.debug(f"Successfully added {item_type}: {name}")
+            invalidate_lookup_cache()
+            mark_database_dirty()
                 
         except Exception as e:
             debug.error(f"Error adding {item_type}: {e}")
@@ -1092,6 +1103,8 @@ class EditItemDialog(QDialog):
                     
                 conn.commit()
                 debug.debug(f"Changes saved successfully for {self.item_type} ID {self.item_id}")
+            invalidate_lookup_cache()
+            mark_database_dirty()
         except Exception as e:
             debug.error(f"Error saving changes: {e}")
             QMessageBox.critical(self, "Error", f"Failed to update {self.item_type}: {str(e)}")
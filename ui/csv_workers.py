@@ -0,0 +1,79 @@
+# src/ui/csv_workers.py
+
+from PyQt6.QtCore import QRunnable, QObject, pyqtSignal
+
+from database.csv_transfer import TransferCancelled, parse_task_csv, export_tasks_csv
+from utils.debug_logger import get_debug_logger
+
+debug = get_debug_logger()
+
+# Signals for CSV workers; they are delivered on the GUI thread
+class CsvWorkerSignals(QObject):
+    progress = pyqtSignal(int, int)  # rows done, total (0 if unknown)
+    finished = pyqtSignal(object)
+    cancelled = pyqtSignal()
+    error = pyqtSignal(str)
+
+class CsvImportWorker(QRunnable):
+    """Parse a task CSV on a thread pool thread.
+
+    Emits finished(TaskImportPlan); the plan is inserted on the GUI thread,
+    which owns the database connection.
+    """
+
+    def __init__(self, file_path):
+        super().__init__()
+        self.file_path = file_path
+        self.signals = CsvWorkerSignals()
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        try:
+            plan = parse_task_csv(self.file_path,
+                                  progress=lambda rows: self.signals.progress.emit(rows, 0),
+                                  is_cancelled=lambda: self._cancelled)
+            self.signals.finished.emit(plan)
+        except TransferCancelled:
+            debug.debug("CSV import cancelled")
+            self.signals.cancelled.emit()
+        except Exception as e:
+            debug.error(f"Error reading CSV: {e}")
+            self.signals.error.emit(str(e))
+
+class CsvExportWorker(QRunnable):
+    """Stream all tasks to a CSV file on a thread pool thread.
+
+    connection_factory is called on the worker thread and must return a
+    connection of its own (the GUI thread's connection cannot be shared).
+    Emits finished(rows_written).
+    """
+
+    def __init__(self, connection_factory, file_path):
+        super().__init__()
+        self.connection_factory = connection_factory
+        self.file_path = file_path
+        self.signals = CsvWorkerSignals()
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        try:
+            conn = self.connection_factory()
+            try:
+                written = export_tasks_csv(conn, self.file_path,
+                                           progress=self.signals.progress.emit,
+                                           is_cancelled=lambda: self._cancelled)
+            finally:
+                conn.close()
+            self.signals.finished.emit(written)
+        except TransferCancelled:
+            debug.debug("CSV export cancelled")
+            self.signals.cancelled.emit()
+        except Exception as e:
+            debug.error(f"Error exporting CSV: {e}")
+            self.signals.error.emit(str(e))
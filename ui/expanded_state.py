@@ -0,0 +1,106 @@
+# src/ui/expanded_state.py
+"""
+Which task items are expanded, per tab.
+
+The trees update the store as items are expanded or collapsed, so saving
+their state is a set operation rather than a walk over every item. The
+whole store is written to settings once (on exit) as
+{"current": [task ids], "backlog": [...], ...}.
+
+Priority headers are not tracked here; they keep using the
+"expanded_priorities" setting that the loaders apply when building them.
+"""
+
+from utils.debug_logger import get_debug_logger
+debug = get_debug_logger()
+
+SETTINGS_KEY = "expanded_task_ids"
+
+# Written by older versions as a list of "task:<id>" / "priority:<name>" strings
+LEGACY_SETTINGS_KEY = "expanded_task_states"
+
+# Per-tab copies of the legacy list ("expanded_states_tab_0", ...), no longer read
+LEGACY_TAB_KEY_PREFIX = "expanded_states_tab_"
+
+
+def task_ids_from_keys(expanded_items):
+    """Task IDs from a list of IDs or legacy "task:<id>" strings"""
+    task_ids = set()
+    for key in expanded_items or ():
+        if isinstance(key, str):
+            if not key.startswith("task:"):
+                continue
+            key = key[len("task:"):]
+        try:
+            task_ids.add(int(key))
+        except (TypeError, ValueError):
+            continue
+    return task_ids
+
+
+class ExpandedStateStore:
+    """Sets of expanded task IDs keyed by tab name"""
+
+    def __init__(self, settings):
+        self.settings = settings
+        self._tabs = None
+        self._legacy = set()
+        self._dirty = False
+
+    def _load(self):
+        stored = self.settings.get_setting(SETTINGS_KEY, None)
+        if isinstance(stored, dict):
+            self._tabs = {tab: task_ids_from_keys(ids) for tab, ids in stored.items()}
+            self._legacy = set()
+        else:
+            # First run with the store: every tab starts from the old shared list
+            self._tabs = {}
+            self._legacy = task_ids_from_keys(self.settings.get_setting(LEGACY_SETTINGS_KEY, []))
+            orphaned = [key for key in self.settings.settings if key.startswith(LEGACY_TAB_KEY_PREFIX)]
+            if orphaned:
+                self.settings.remove_settings(orphaned)
+        debug.debug(f"Loaded expanded states for {len(self._tabs)} tabs")
+
+    def expanded_ids(self, tab):
+        """The live set of expanded task IDs for tab"""
+        if self._tabs is None:
+            self._load()
+        if tab not in self._tabs:
+            self._tabs[tab] = set(self._legacy)
+        return self._tabs[tab]
+
+    def set_expanded(self, tab, task_id, expanded):
+        ids = self.expanded_ids(tab)
+        if expanded and task_id not in ids:
+            ids.add(task_id)
+            self._dirty = True
+        elif not expanded and task_id in ids:
+            ids.discard(task_id)
+            self._dirty = True
+
+    def replace(self, tab, task_ids):
+        task_ids = set(task_ids)
+        if self.expanded_ids(tab) != task_ids:
+            self._tabs[tab] = task_ids
+            self._dirty = True
+
+    def save(self):
+        """Write every tab's state to settings in one setting"""
+        if self._tabs is None or not self._dirty:
+            return False
+        self.settings.set_setting(SETTINGS_KEY, {tab: sorted(ids) for tab, ids in self._tabs.items()})
+        self._dirty = False
+        debug.debug(f"Saved expanded states for {len(self._tabs)} tabs")
+        return True
+
+
+_store = None
+
+
+def get_expanded_state_store():
+    """Return the store shared by all task trees"""
+    global _store
+    if _store is None:
+        from ui.app_settings import get_settings_manager
+        _store = ExpandedStateStore(get_settings_manager())
+    return _store
@@ -1142,6 +1142,10 @@ class EditStatusDialog(QDialog):
             conn.commit()
             debug.debug("Status changes saved successfully")
         
+        from database.lookup_cache import invalidate_lookup_cache
+        from database.write_behind import mark_database_dirty
+        invalidate_lookup_cache()
+        mark_database_dirty()
         self.accept()
 
     def apply_os_style(self):
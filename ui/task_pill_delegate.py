@@ -4,15 +4,25 @@ from PyQt6.QtWidgets import QStyledItemDelegate, QStyleOptionViewItem, QApplicat
 from PyQt6.QtGui import QPainter, QPainterPath, QColor, QBrush, QPen, QFont, QFontMetrics
 from PyQt6.QtCore import QRectF, Qt, QSize, QPoint, QPointF
 from datetime import datetime, date
+from collections import namedtuple
+from types import MappingProxyType
 import sqlite3
 from pathlib import Path
 from ui.os_style_manager import OSStyleManager
+from database.lookup_cache import get_lookup_cache
+from database.write_behind import mark_database_dirty
 
 # Import the debug logger
 from utils.debug_logger import get_debug_logger
 from utils.debug_decorator import debug_method
 debug = get_debug_logger()
 
+# A font and its metrics, built once per settings change and only read while painting
+FontEntry = namedtuple("FontEntry", ["font", "metrics"])
+
+# Elements that get an entry in the delegate's font table
+FONT_ELEMENTS = ("title", "description", "due_date", "panel", "header", "toggle")
+
 class TaskPillDelegate(QStyledItemDelegate):
     @staticmethod
     def get_connection():
@@ -48,36 +58,31 @@ class TaskPillDelegate(QStyledItemDelegate):
             self.pill_height = 80
             self.pill_radius = 10
         
+        # Read-only element -> FontEntry table, rebuilt when a font setting changes
+        self._font_table = self._build_font_table()
+        
+        # Description layout per task: task_id -> ((description hash, font version, width), height)
+        self._layout_cache = {}
+        self._font_version = 0
+        self._viewport_width = None
+        
         # Calculate compact height dynamically based on title font size
         self.compact_height = self._calculate_compact_height()
         debug.debug(f"Calculated compact height: {self.compact_height}")
         
         self.item_margin = 5
         
-        settings = self.get_settings_manager()
-        # Load panel settings from SettingsManager
-        settings = self.get_settings_manager()
-        self.left_section_width = settings.get_setting("left_panel_width", 100)
-        self.right_section_width = settings.get_setting("right_panel_width", 100)
-
         # Fixed section count for both panels (2)
         self.left_panel_count = 2
         self.right_panel_count = 2
 
-        # Check for special "__NONE__" placeholder in panel contents
-        left_contents = settings.get_setting("left_panel_contents", ["Category", "Status"])
-        if left_contents == ["__NONE__"]:
-            self.left_panel_contents = []  # Use empty list for display
-        else:
-            self.left_panel_contents = left_contents
-
-        right_contents = settings.get_setting("right_panel_contents", ["Link", "Due Date"])
-        if right_contents == ["__NONE__"]:
-            self.right_panel_contents = []  # Use empty list for display
-        else:
-            self.right_panel_contents = right_contents
-
-        debug.debug(f"Panel contents initialized: left={self.left_panel_contents}, right={self.right_panel_contents}")
+        # Load panel settings from SettingsManager
+        self._load_panel_settings()
+        
+        # Refresh cached values only when a relevant setting changes
+        settings = self.get_settings_manager()
+        if hasattr(settings, 'setting_changed'):
+            settings.setting_changed.connect(self._on_setting_changed)
         
         # Hover tracking
         self.hover_item = None
@@ -106,9 +111,50 @@ class TaskPillDelegate(QStyledItemDelegate):
             except Exception as e:
                 debug.error(f"Error setting up event filters: {e}")
              
+    def _load_panel_settings(self):
+        """Read panel widths and contents from settings"""
+        settings = self.get_settings_manager()
+        self.left_section_width = settings.get_setting("left_panel_width", 100)
+        self.right_section_width = settings.get_setting("right_panel_width", 100)
+
+        # Check for special "__NONE__" placeholder in panel contents
+        left_contents = settings.get_setting("left_panel_contents", ["Category", "Status"])
+        if left_contents == ["__NONE__"]:
+            self.left_panel_contents = []  # Use empty list for display
+        else:
+            self.left_panel_contents = left_contents
+
+        right_contents = settings.get_setting("right_panel_contents", ["Link", "Due Date"])
+        if right_contents == ["__NONE__"]:
+            self.right_panel_contents = []  # Use empty list for display
+        else:
+            self.right_panel_contents = right_contents
+
+        debug.debug(f"Panel contents initialized: left={self.left_panel_contents}, right={self.right_panel_contents}")
+
+    def _on_setting_changed(self, key):
+        """Drop cached values that depend on the changed setting"""
+        if "font" in key:
+            debug.debug(f"Font setting {key} changed, rebuilding font table")
+            self._font_table = self._build_font_table()
+            self._font_version += 1
+            self.compact_height = self._calculate_compact_height()
+            self.invalidate_layout_cache()
+        elif key.startswith(("left_panel_", "right_panel_")):
+            debug.debug(f"Panel setting {key} changed, reloading panel settings")
+            self._load_panel_settings()
+            self.invalidate_layout_cache()
+
+    def invalidate_layout_cache(self, task_id=None):
+        """Forget cached description layouts for one task, or for all tasks"""
+        if task_id is None:
+            self._layout_cache.clear()
+        else:
+            self._layout_cache.pop(task_id, None)
+
     def _get_section_data(self, user_data, section_type):
         """Get data for a specific section type"""
-        debug.debug(f"Getting section data for type: {section_type}")
+        debug.debug("Getting section data for type: %s", section_type)
         
         if section_type == "Category":
             return user_data.get('category', '')
@@ -169,6 +215,7 @@ class TaskPillDelegate(QStyledItemDelegate):
                     debug.debug("is_compact column doesn't exist, adding it")
                     cursor.execute("ALTER TABLE tasks ADD COLUMN is_compact INTEGER NOT NULL DEFAULT 0")
                     conn.commit()
+                    mark_database_dirty()
                 
                 # Now load all task IDs that are marked as compact
                 debug.debug("Loading compact task IDs")
@@ -181,7 +228,7 @@ class TaskPillDelegate(QStyledItemDelegate):
             debug.error(f"Error loading compact states: {e}")
     
     def paint(self, painter, option, index):
-        debug.debug(f"Painting item at index {index.row()}")
+        debug.debug("Painting item at index %s", index.row())
         # Get data from the index
         user_data = index.data(Qt.ItemDataRole.UserRole)
         
@@ -196,14 +243,14 @@ class TaskPillDelegate(QStyledItemDelegate):
 
     def _draw_task_item(self, painter, option, index):
         """Draw a regular task item - modified to support customizable panels"""
-        debug.debug(f"Drawing task item at index {index.row()}")
+        debug.debug("Drawing task item at index %s", index.row())
         
         # Extract data using our existing method
         user_data, item_id, title, description, link, status, priority, due_date_str, category = self._extract_item_data(index)
         
         # Check if compact
         is_compact = item_id in self.compact_items
-        debug.debug(f"Task {item_id} compact state: {is_compact}")
+        debug.debug("Task %s compact state: %s", item_id, is_compact)
         
         # Save painter state and prepare to draw
         painter.save()
@@ -226,14 +273,14 @@ class TaskPillDelegate(QStyledItemDelegate):
         
         # Draw left panel if content is configured
         if left_width > 0 and self.left_panel_contents:
-            debug.debug(f"Drawing left panel with content: {self.left_panel_contents}")
+            debug.debug("Drawing left panel with content: %s", self.left_panel_contents)
             self._draw_custom_panel(painter, path, rect, is_compact, 
                                    self.left_panel_contents, 
                                    user_data, left_width, "left")
         
         # Draw right panel if content is configured
         if right_width > 0 and self.right_panel_contents:
-            debug.debug(f"Drawing right panel with content: {self.right_panel_contents}")
+            debug.debug("Drawing right panel with content: %s", self.right_panel_contents)
             self._draw_custom_panel(painter, path, rect, is_compact, 
                                    self.right_panel_contents, 
                                    user_data, right_width, "right")
@@ -258,6 +305,7 @@ class TaskPillDelegate(QStyledItemDelegate):
                     (1 if is_compact else 0, task_id)
                 )
                 conn.commit()
+                mark_database_dirty()
                 debug.debug("Compact state saved successfully")
         except Exception as e:
             debug.error(f"Error saving compact state: {e}")
@@ -268,6 +316,15 @@ class TaskPillDelegate(QStyledItemDelegate):
         is_tree_widget = hasattr(source, 'indexAt')
         is_viewport = hasattr(source, 'parent') and hasattr(source.parent(), 'indexAt')
         
+        # Description wrapping depends on the width, so re-measure when it changes
+        if event.type() == event.Type.Resize and is_viewport:
+            width = event.size().width()
+            if width != self._viewport_width:
+                self._viewport_width = width
+                self.invalidate_layout_cache()
+                source.parent().scheduleDelayedItemsLayout()
+            return super().eventFilter(source, event)
+        
         # Handle mouse movement for hover effects AND tooltips
         if event.type() == event.Type.MouseMove:
             # Get position and find item under cursor
@@ -313,7 +370,7 @@ class TaskPillDelegate(QStyledItemDelegate):
                         # Show tooltip for the hovered section
                         tooltip_text = self._get_section_tooltip_text(user_data, hovered_section)
                         tree_widget.setToolTip(tooltip_text)
-                        debug.debug(f"Showing tooltip for {hovered_section}: {tooltip_text}")
+                        debug.debug("Showing tooltip for %s: %s", hovered_section, tooltip_text)
                     else:
                         # Clear tooltip if hovering over title or outside sections
                         tree_widget.setToolTip("")
@@ -330,7 +387,7 @@ class TaskPillDelegate(QStyledItemDelegate):
                     24, 24
                 )
                 tree_widget.viewport().update()
-                debug.debug(f"Hover detected at row {index.row()}")
+                debug.debug("Hover detected at row %s", index.row())
             else:
                 # Clear hover state and tooltip if not over an item
                 if self.hover_item:
@@ -353,9 +410,9 @@ class TaskPillDelegate(QStyledItemDelegate):
                 
                 # Create a QPointF from the QPoint coordinates
                 pos_f = QPointF(pos.x(), pos.y())
-                debug.debug(f"Mouse position: QPoint({pos.x()}, {pos.y()}) converted to QPointF({pos_f.x()}, {pos_f.y()})")
+                debug.debug("Mouse position: QPoint(%s, %s) converted to QPointF(%s, %s)", pos.x(), pos.y(), pos_f.x(), pos_f.y())
             except Exception as e:
-                debug.error(f"Error getting mouse position: {e}")
+                debug.error("Error getting mouse position: %s", e)
                 return super().eventFilter(source, event)
             
             # Get the tree widget and adjust position if needed
@@ -378,15 +435,15 @@ class TaskPillDelegate(QStyledItemDelegate):
                     item_data = self.hover_item.data(Qt.ItemDataRole.UserRole)
                     if isinstance(item_data, dict) and 'id' in item_data:
                         item_id = item_data['id']
-                        debug.debug(f"Item ID: {item_id}")
+                        debug.debug("Item ID: %s", item_id)
                         
                         # Toggle compact state
                         is_compact = item_id in self.compact_items
                         if is_compact:
-                            debug.debug(f"Removing task {item_id} from compact items")
+                            debug.debug("Removing task %s from compact items", item_id)
                             self.compact_items.remove(item_id)
                         else:
-                            debug.debug(f"Adding task {item_id} to compact items")
+                            debug.debug("Adding task %s to compact items", item_id)
                             self.compact_items.add(item_id)
                         
                         # Save state to database
@@ -399,12 +456,12 @@ class TaskPillDelegate(QStyledItemDelegate):
                         
                         # Update item size if found
                         if item:
-                            current_compact_height = self._calculate_compact_height()
+                            current_compact_height = self.compact_height
                             height = current_compact_height if not is_compact else self.pill_height
-                            debug.debug(f"Toggle: item {item_id}, new compact state: {not is_compact}, height: {height}")
+                            debug.debug("Toggle: item %s, new compact state: %s, height: %s", item_id, not is_compact, height)
 
                             item.setSizeHint(0, QSize(tree_widget.viewport().width(), height + self.item_margin * 2))
-                            debug.debug(f"Updated item {item_id} size hint to height: {height + self.item_margin * 2}")
+                            debug.debug("Updated item %s size hint to height: %s", item_id, height + self.item_margin * 2)
 
                             tree_widget.scheduleDelayedItemsLayout()  # Force layout update
                         
@@ -416,16 +473,16 @@ class TaskPillDelegate(QStyledItemDelegate):
             if hasattr(self, 'all_button_rects'):
                 for item_id, (button_rect, item_index) in self.all_button_rects.items():
                     if button_rect.contains(pos_f):
-                        debug.debug(f"Toggle button clicked for item ID: {item_id}")
+                        debug.debug("Toggle button clicked for item ID: %s", item_id)
                         
                         # Toggle compact state for this item
                         is_compact = item_id in self.compact_items
                         
                         if is_compact:
-                            debug.debug(f"Removing task {item_id} from compact items")
+                            debug.debug("Removing task %s from compact items", item_id)
                             self.compact_items.remove(item_id)
                         else:
-                            debug.debug(f"Adding task {item_id} to compact items")
+                            debug.debug("Adding task %s to compact items", item_id)
                             self.compact_items.add(item_id)
                         
                         # Save state to database
@@ -438,14 +495,14 @@ class TaskPillDelegate(QStyledItemDelegate):
                         
                         # Update item size if found
                         if item:
-                            current_compact_height = self._calculate_compact_height()  
+                            current_compact_height = self.compact_height
                             height = current_compact_height if not is_compact else self.pill_height
-                            debug.debug(f"Toggle: item {item_id}, new compact state: {not is_compact}, height: {height}")
+                            debug.debug("Toggle: item %s, new compact state: %s, height: %s", item_id, not is_compact, height)
 
                             # And update the item size setting:
                             item.setSizeHint(0, QSize(tree_widget.viewport().width(), 
                                             height + self.item_margin * 2))
-                            debug.debug(f"Updated item {item_id} size hint to height: {height + self.item_margin * 2}")
+                            debug.debug("Updated item %s size hint to height: %s", item_id, height + self.item_margin * 2)
                             tree_widget.scheduleDelayedItemsLayout()  # Force layout update
                         
                         # Force repaint
@@ -467,9 +524,9 @@ class TaskPillDelegate(QStyledItemDelegate):
             debug.error(f"Error getting settings manager from parent: {e}")
         
         # Fallback to creating a new instance
-        debug.debug("Creating new SettingsManager instance")
-        from ui.app_settings import SettingsManager
-        return SettingsManager()
+        debug.debug("Using shared SettingsManager instance")
+        from ui.app_settings import get_settings_manager
+        return get_settings_manager()
     
     def _get_section_color(self, section_type, section_data):
         """Get color for a specific section type"""
@@ -618,7 +675,7 @@ class TaskPillDelegate(QStyledItemDelegate):
 
     def _get_section_tooltip_text(self, user_data, section_type):
         """Get detailed tooltip text for a specific section type"""
-        debug.debug(f"Getting tooltip text for section: {section_type}")
+        debug.debug("Getting tooltip text for section: %s", section_type)
         
         if section_type == "Category":
             category = user_data.get('category', '')
@@ -764,8 +821,8 @@ class TaskPillDelegate(QStyledItemDelegate):
 
     def _draw_title(self, painter, rect, is_compact, title, font_family, font_size, settings, left_width, right_width):
         """Draw the task title with improved text fitting and proper descender space"""
-        # Get title font from new font settings
-        title_font = self._get_font_for_element("title")
+        # Get title font from the font table
+        title_font, font_metrics = self._font_table["title"]
         
         # Get title color from settings
         title_color = settings.get_setting("title_color", "#000000")
@@ -773,9 +830,6 @@ class TaskPillDelegate(QStyledItemDelegate):
         painter.setFont(title_font)
         painter.setPen(QColor(title_color))
         
-        # Get font metrics for proper text positioning
-        font_metrics = painter.fontMetrics()
-        
         # Calculate available width for title text
         available_width = rect.width() - left_width - right_width - (self.text_padding * 2)
         
@@ -814,8 +868,8 @@ class TaskPillDelegate(QStyledItemDelegate):
 
     def _draw_description(self, painter, rect, description, font_family, font_size, settings, left_width, right_width):
         """Draw the task description with dynamic height and proper word wrapping"""
-        # Get description font from new font settings
-        desc_font = self._get_font_for_element("description")
+        # Get description font from the font table
+        desc_font, font_metrics = self._font_table["description"]
         
         # Get description color from settings
         desc_color = settings.get_setting("description_color", "#666666")
@@ -826,8 +880,7 @@ class TaskPillDelegate(QStyledItemDelegate):
         # Calculate available space
         available_width = rect.width() - left_width - right_width - (self.text_padding * 2)
         
-        # Get font metrics for proper line calculations
-        font_metrics = painter.fontMetrics()
+        # Font metrics for proper line calculations
         line_height = font_metrics.height()
         
         # Define description rect - use available space more efficiently
@@ -919,7 +972,7 @@ class TaskPillDelegate(QStyledItemDelegate):
         if isinstance(user_data, dict) and user_data.get('is_priority_header', False):
             # Use a fixed smaller height for priority headers
             header_height = 35  # Consistent header height
-            debug.debug(f"Priority header size hint: width={consistent_width}, height={header_height}")
+            debug.debug("Priority header size hint: width=%s, height=%s", consistent_width, header_height)
             return QSize(consistent_width, header_height)
         
         # Check if this is a task item
@@ -930,58 +983,25 @@ class TaskPillDelegate(QStyledItemDelegate):
             if is_compact:
                 # Use calculated compact height
                 height = self.compact_height
-                debug.debug(f"Task {task_id} compact size hint: width={consistent_width}, height={height + self.item_margin * 2}")
+                debug.debug("Task %s compact size hint: width=%s, height=%s", task_id, consistent_width, height + self.item_margin * 2)
                 return QSize(consistent_width, height + self.item_margin * 2)
             else:
                 # Calculate dynamic height based on description content
                 description = user_data.get('description', '')
                 
                 if description and description.strip():
-                    # Get font settings for calculation
-                    settings = self.get_settings_manager()
-                    font_family = settings.get_setting("font_family", "Arial")
+                    available_width = self._description_width(option, index)
+                    layout_key = (hash(description), self._font_version, available_width)
+                    cached = self._layout_cache.get(task_id)
+                    if cached is not None and cached[0] == layout_key:
+                        return QSize(consistent_width, cached[1])
                     
-                    # Create description font for measurement
-                    desc_font = self._get_font_for_element("description")
-                    font_metrics = QFontMetrics(desc_font)
+                    # Measure with the description font from the font table
+                    font_metrics = self._font_table["description"].metrics
                     line_height = font_metrics.height()
                     
-                    # Use a fixed estimated width for consistency
-                    estimated_width = 400  # Fixed estimate instead of dynamic calculation
-                    left_width = sum(self.left_panel_widths) if hasattr(self, 'left_panel_widths') else 0
-                    right_width = sum(self.right_panel_widths) if hasattr(self, 'right_panel_widths') else 0
-                    available_width = estimated_width - left_width - right_width - (self.text_padding * 2)
-                    
                     # Calculate lines needed for description (accounting for line breaks)
-                    paragraphs = description.split('\n')
-                    lines_needed = 0
-                    
-                    for paragraph in paragraphs:
-                        if not paragraph.strip():
-                            # Empty line
-                            lines_needed += 1
-                            continue
-                            
-                        # Calculate word wrapping for this paragraph
-                        words = paragraph.split()
-                        current_line = ""
-                        
-                        for word in words:
-                            test_line = current_line + (" " if current_line else "") + word
-                            test_width = font_metrics.horizontalAdvance(test_line)
-                            
-                            if test_width <= available_width:
-                                current_line = test_line
-                            else:
-                                if current_line:
-                                    lines_needed += 1
-                                    current_line = word
-                                else:
-                                    lines_needed += 1
-                                    current_line = ""
-                        
-                        if current_line:
-                            lines_needed += 1
+                    lines_needed = self._count_description_lines(description, font_metrics, available_width)
                     
                     # Calculate total height needed
                     # Title space (30px) + description lines + minimal bottom padding
@@ -991,21 +1011,69 @@ class TaskPillDelegate(QStyledItemDelegate):
                     # Ensure minimum height
                     total_height = max(total_height, self.pill_height)
                     
-                    debug.debug(f"Task {task_id} expanded size hint: width={consistent_width}, description lines={lines_needed}, height={total_height + self.item_margin * 2}")
+                    debug.debug("Task %s expanded size hint: width=%s, description lines=%s, height=%s", task_id, available_width, lines_needed, total_height + self.item_margin * 2)
+                    self._layout_cache[task_id] = (layout_key, total_height + self.item_margin * 2)
                     return QSize(consistent_width, total_height + self.item_margin * 2)
                 else:
                     # No description, use standard height
-                    debug.debug(f"Task {task_id} expanded (no description) size hint: width={consistent_width}, height={self.pill_height + self.item_margin * 2}")
+                    debug.debug("Task %s expanded (no description) size hint: width=%s, height=%s", task_id, consistent_width, self.pill_height + self.item_margin * 2)
                     return QSize(consistent_width, self.pill_height + self.item_margin * 2)
         
         # Default size for other items
-        debug.debug(f"Default size hint: width={consistent_width}, height=50")
+        debug.debug("Default size hint: width=%s, height=50", consistent_width)
         return QSize(consistent_width, 50)
     
+    def _description_width(self, option, index):
+        """Width available to description text, matching what paint() will get"""
+        row_width = option.rect.width()
+        tree_widget = self.parent()
+        if tree_widget is not None and hasattr(tree_widget, 'columnWidth'):
+            # The rect passed when measuring is not reliable; paint() gets the
+            # column width minus the indentation for the item's depth
+            depth = 0
+            parent_index = index.parent()
+            while parent_index.isValid():
+                depth += 1
+                parent_index = parent_index.parent()
+            if tree_widget.rootIsDecorated():
+                depth += 1
+            row_width = tree_widget.columnWidth(0) - tree_widget.indentation() * depth
+        
+        left_width = self.left_section_width if self.left_panel_contents else 0
+        right_width = self.right_section_width if self.right_panel_contents else 0
+        pill_width = row_width - self.item_margin * 2
+        return max(1, pill_width - left_width - right_width - (self.text_padding * 2))
+
+    def _count_description_lines(self, description, font_metrics, available_width):
+        """Number of lines the description wraps to at the given width"""
+        lines_needed = 0
+        for paragraph in description.split('\n'):
+            if not paragraph.strip():
+                # Empty line
+                lines_needed += 1
+                continue
+                
+            # Calculate word wrapping for this paragraph
+            current_line = ""
+            for word in paragraph.split():
+                test_line = current_line + (" " if current_line else "") + word
+                if font_metrics.horizontalAdvance(test_line) <= available_width:
+                    current_line = test_line
+                elif current_line:
+                    lines_needed += 1
+                    current_line = word
+                else:
+                    lines_needed += 1
+                    current_line = ""
+            
+            if current_line:
+                lines_needed += 1
+        return lines_needed
+
     def _draw_due_date(self, painter, rect, is_compact, due_date_str, font_family, font_size, settings, left_width, right_width):
         """Draw the due date with custom font settings"""
-        # Get due date font from new font settings
-        date_font = self._get_font_for_element("due_date")
+        # Get due date font from the font table
+        date_font = self._font_table["due_date"].font
         
         # Get due date color from settings
         due_color = settings.get_setting("due_date_color", "#888888")
@@ -1099,10 +1167,7 @@ class TaskPillDelegate(QStyledItemDelegate):
             painter.drawEllipse(toggle_button_rect)
 
             # Draw arrow icon with larger font and darker color
-            toggle_font = QFont(painter.font())
-            toggle_font.setPointSize(16)  # Larger size
-            toggle_font.setBold(True)
-            painter.setFont(toggle_font)
+            painter.setFont(self._font_table["toggle"].font)
             painter.setPen(QColor("#000000"))  # Black text for better visibility
 
             # For headers, show right/down arrow based on expanded state
@@ -1124,6 +1189,34 @@ class TaskPillDelegate(QStyledItemDelegate):
             
     def _get_font_for_element(self, element_type):
         """Get font settings for a specific element type from settings"""
+        entry = self._font_table.get(element_type)
+        if entry is None:
+            return self._build_font_for_element(element_type)
+        # Hand out a copy so callers can adjust it without touching the table
+        return QFont(entry.font)
+
+    def _build_font_table(self):
+        """Build the element -> FontEntry table painting reads from"""
+        table = {}
+        for element_type in FONT_ELEMENTS:
+            if element_type == "header":
+                # Priority headers use the global font, bold
+                settings = self.get_settings_manager()
+                font = QFont(settings.get_setting("font_family", "Segoe UI"))
+                font.setPointSize(int(settings.get_setting("font_size", 12)))
+                font.setBold(True)
+            elif element_type == "toggle":
+                # Expand/collapse arrows use the global font, large and bold
+                font = QFont(self.get_settings_manager().get_setting("font_family", "Segoe UI"))
+                font.setPointSize(16)
+                font.setBold(True)
+            else:
+                font = self._build_font_for_element(element_type)
+            table[element_type] = FontEntry(font, QFontMetrics(font))
+        return MappingProxyType(table)
+
+    def _build_font_for_element(self, element_type):
+        """Build the QFont for an element type from settings"""
         settings = self.get_settings_manager()
         
         # Get element-specific font family, fallback to global font_family, then Arial
@@ -1206,8 +1299,8 @@ class TaskPillDelegate(QStyledItemDelegate):
     def _draw_custom_panel(self, painter, path, rect, is_compact, content_types, 
                         user_data, panel_width, panel_side="left"):
         """Draw custom panel with multiple sections based on settings"""
-        # Get panel font from new font settings
-        panel_font = self._get_font_for_element("panel")
+        # Get panel font from the font table
+        panel_font = self._font_table["panel"].font
         
         # Get settings
         settings = self.get_settings_manager()
@@ -1347,16 +1440,8 @@ class TaskPillDelegate(QStyledItemDelegate):
         brightness = (bg_color.red() * 299 + bg_color.green() * 587 + bg_color.blue() * 114) / 1000
         text_color = "#000000" if brightness > 128 else "#FFFFFF"
         
-        # Get font from settings
-        settings = self.get_settings_manager()
-        font_family = settings.get_setting("font_family", "Segoe UI")
-        font_size = int(settings.get_setting("font_size", 12))
-        
-        header_font = QFont(font_family)
-        header_font.setPointSize(font_size)
-        header_font.setBold(True)
-        
-        painter.setFont(header_font)
+        # Get header font from the font table
+        painter.setFont(self._font_table["header"].font)
         painter.setPen(QColor(text_color))
         
         header_text_rect = QRectF(
@@ -1371,10 +1456,11 @@ class TaskPillDelegate(QStyledItemDelegate):
         
         painter.restore()
 
-    def _draw_panel_text_with_fitting(self, painter, text_rect, text, font, max_lines=2):
+    def _draw_panel_text_with_fitting(self, painter, text_rect, text, font_entry=None, max_lines=2):
         """Draw panel text with improved fitting and multi-line support"""
+        # Measure with the cached metrics of a font table entry (panel font by default)
+        font, font_metrics = font_entry or self._font_table["panel"]
         painter.setFont(font)
-        font_metrics = painter.fontMetrics()
         line_height = font_metrics.height()
         available_width = text_rect.width() - 4  # Small padding
         
@@ -1465,20 +1551,25 @@ class TaskPillDelegate(QStyledItemDelegate):
                 
         return None
 
+    def _get_lookup_color(self, kind, name, fallback):
+        """Get a QColor for a lookup name from the shared lookup cache"""
+        cache = get_lookup_cache()
+        # Drop our QColor objects whenever the settings screens invalidate the cache
+        if getattr(self, '_lookup_colors_version', None) != cache.version:
+            self._lookup_colors = {}
+            self._lookup_colors_version = cache.version
+        
+        key = (kind, name)
+        color = self._lookup_colors.get(key)
+        if color is None:
+            color = QColor(cache.get_color(kind, name, fallback))
+            self._lookup_colors[key] = color
+        return color
+
     def get_status_color(self, status):
-        """Get color for a status from the database"""
+        """Get color for a status from the lookup cache"""
         if not status:
             return QColor("#E0E0E0")  # Default light gray
-            
-        try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT color FROM statuses WHERE name = ?", (status,))
-                result = cursor.fetchone()
-                if result:
-                    return QColor(result[0])
-        except Exception as e:
-            print(f"Error getting status color: {e}")
         
         # Fallback to default statuses if not found
         status_colors = {
@@ -1487,22 +1578,12 @@ class TaskPillDelegate(QStyledItemDelegate):
             'On Hold': '#9E9E9E',      # Gray
             'Completed': '#4CAF50'     # Green
         }
-        return QColor(status_colors.get(status, "#E0E0E0"))
+        return self._get_lookup_color("status", status, status_colors.get(status, "#E0E0E0"))
 
     def get_priority_color(self, priority):
-        """Get color for a priority from the database"""
+        """Get color for a priority from the lookup cache"""
         if not priority:
             return QColor("#E0E0E0")  # Default light gray
-            
-        try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT color FROM priorities WHERE name = ?", (priority,))
-                result = cursor.fetchone()
-                if result:
-                    return QColor(result[0])
-        except Exception as e:
-            print(f"Error getting priority color: {e}")
         
         # Fallback to default priorities if not found
         default_priority_colors = {
@@ -1510,25 +1591,15 @@ class TaskPillDelegate(QStyledItemDelegate):
             'Medium': '#FFC107',   # Amber
             'Low': '#4CAF50'       # Green
         }
-        return QColor(default_priority_colors.get(priority, "#E0E0E0"))
+        return self._get_lookup_color("priority", priority, default_priority_colors.get(priority, "#E0E0E0"))
 
     def get_category_color(self, category):
-        """Get color for a category from the database"""
+        """Get color for a category from the lookup cache"""
         if not category:
             return QColor("#E0E0E0")  # Default light gray
-            
-        try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT color FROM categories WHERE name = ?", (category,))
-                result = cursor.fetchone()
-                if result:
-                    return QColor(result[0])
-        except Exception as e:
-            print(f"Error getting category color: {e}")
         
         # Fallback to a default color if not found
-        return QColor("#E0E0E0")  # Light gray
+        return self._get_lookup_color("category", category, "#E0E0E0")
 
     def debug_header_items(self, tree_widget):
         """Debug the header items in the tree widget"""
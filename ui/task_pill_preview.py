@@ -19,7 +19,6 @@ import time
 import traceback
 
 from .task_pill_delegate import TaskPillDelegate
-from .task_tree import PriorityHeaderItem
 
 
 class TaskPillPreviewWidget(QWidget):
@@ -149,8 +148,8 @@ class TaskPillPreviewWidget(QWidget):
         debug.debug("Applying current settings to delegate")
         start_time = time.time()
         
-        from ui.app_settings import SettingsManager
-        settings = SettingsManager()
+        from ui.app_settings import get_settings_manager
+        settings = get_settings_manager()
         
         debug.debug("Reading values from settings widgets")
         
@@ -326,7 +325,17 @@ class TaskPillPreviewWidget(QWidget):
         
         # Add a sample priority header
         debug.debug("Adding sample priority header")
-        header_item = PriorityHeaderItem("SAMPLE PRIORITY LEVEL", "#F44336")
+        # The task tree's PriorityHeaderItem belongs to its model, so build
+        # the same header as a plain item for this QTreeWidget
+        header_item = QTreeWidgetItem(["SAMPLE PRIORITY LEVEL"])
+        header_item.setData(0, Qt.ItemDataRole.UserRole, {
+            'is_priority_header': True,
+            'priority': "SAMPLE PRIORITY LEVEL",
+            'color': "#F44336",
+            'expanded': True,
+        })
+        header_item.setBackground(0, QBrush(QColor("#F44336")))
+        header_item.setSizeHint(0, QSize(0, 25))
         self.sample_tree.addTopLevelItem(header_item)
         
         # Add a sample task
@@ -398,8 +407,8 @@ class TaskPillPreviewWidget(QWidget):
         
         # Apply current settings directly to settings manager
         debug.debug("Applying settings directly to settings manager")
-        from ui.app_settings import SettingsManager
-        settings = SettingsManager()
+        from ui.app_settings import get_settings_manager
+        settings = get_settings_manager()
         
         # Store combo box values
         debug.debug("Getting panel contents from combo boxes")
@@ -446,8 +455,8 @@ class TaskPillPreviewWidget(QWidget):
         debug.debug("Applying current settings to delegate")
         start_time = time.time()
         
-        from ui.app_settings import SettingsManager
-        settings = SettingsManager()
+        from ui.app_settings import get_settings_manager
+        settings = get_settings_manager()
         
         debug.debug("Reading values from settings widgets")
         
@@ -617,8 +626,8 @@ class SampleTaskTreeWidget(QTreeWidget):
     def get_settings_manager(self):
         """Get the settings manager - needed by the TaskPillDelegate"""
         debug.debug("Getting settings manager")
-        from ui.app_settings import SettingsManager
-        return SettingsManager()
+        from ui.app_settings import get_settings_manager
+        return get_settings_manager()
     
     @staticmethod
     def get_connection():
@@ -9,9 +9,11 @@ debug = get_debug_logger()
 debug.debug("Loading task_tabs.py module")
 
 from PyQt6.QtWidgets import (QTabWidget, QWidget, QVBoxLayout, QHBoxLayout, 
-                             QPushButton, QLabel, QMessageBox, QMenu)
+                             QPushButton, QLabel, QMessageBox, QMenu, QLineEdit)
 from PyQt6.QtCore import Qt, QSize, QTimer
+from PyQt6.QtGui import QBrush, QColor, QKeySequence, QShortcut
 from .task_tree import TaskTreeWidget, PriorityHeaderItem
+from .task_tree_model import TaskItem
 from datetime import datetime
 import sys
 from pathlib import Path
@@ -23,7 +25,10 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 # Now import directly from the database package
 from database.memory_db_manager import get_memory_db_manager
-from ui.bee_todos import BeeToDoWidget
+from database.task_queries import get_task_attachments, get_task_subtrees
+from database.lookup_cache import get_lookup_cache
+from database.data_version import get_data_version, changed_task_ids, prune_data_changes
+from database.task_search import search_tasks
 
 class TabTaskTreeWidget(TaskTreeWidget):
     """Specialized TaskTreeWidget that can be configured for specific views"""
@@ -41,11 +46,10 @@ class TabTaskTreeWidget(TaskTreeWidget):
         self.setIndentation(40)  # Ensure consistent indentation
         debug.debug(f"Set root decoration: True, indentation: 40")
         
-        # Defer loading tasks to avoid initialization order issues
-        # This allows subclasses to fully initialize before loading tasks
-        from PyQt6.QtCore import QTimer
-        debug.debug(f"Scheduling deferred load for {filter_type} tab")
-        QTimer.singleShot(0, self._init_load_tasks_tab)
+        # Data version the tree was last loaded at (None = never loaded).
+        # TaskTabWidget loads the tree when its tab is first activated and
+        # only reloads it when this no longer matches the database.
+        self.data_version = None
         
         # Debug delegate setup
         debug.debug("Calling debug_delegate_setup")
@@ -54,18 +58,28 @@ class TabTaskTreeWidget(TaskTreeWidget):
         
     @debug_method
     def _init_load_tasks_tab(self):
-        """Deferred task loading to handle initialization order"""
+        """Load tasks and restore expanded states (on activation or when stale)"""
         try:
-            debug.debug("Executing deferred load_tasks_tab")
+            debug.debug("Executing load_tasks_tab")
             self.load_tasks_tab()
             
             # After loading, restore expanded states
-            debug.debug("Restoring expanded states after initial load")
+            debug.debug("Restoring expanded states after load")
             self._restore_expanded_states()
         except Exception as e:
             debug.error(f"Error during deferred task loading: {e}")
             debug.error(traceback.format_exc())
     
+    def is_stale(self):
+        """Whether the tree was never loaded or the data changed since"""
+        if self.data_version is None:
+            return True
+        try:
+            return get_data_version(get_memory_db_manager().get_connection()) != self.data_version
+        except Exception as e:
+            debug.error(f"Error reading data version: {e}")
+            return True
+
     @debug_method
     def load_tasks_tab(self):
         """Load tasks with tab-specific filtering and fetch links from database"""
@@ -86,6 +100,7 @@ class TabTaskTreeWidget(TaskTreeWidget):
                 columns = [info[1] for info in cursor.fetchall()]
                 has_completed_at = 'completed_at' in columns
                 debug.debug(f"Has completed_at column: {has_completed_at}")
+                data_version = get_data_version(conn)
             
             # Create query based on whether completed_at exists
             completed_at_field = ", t.completed_at" if has_completed_at else ""
@@ -139,10 +154,12 @@ class TabTaskTreeWidget(TaskTreeWidget):
                 debug.debug(f"Processing {self.filter_type} tasks without priority headers")
                 self._process_tasks_with_links(tasks, use_priority_headers=False)
             
+            self.data_version = data_version
             end_time = time.time()
             debug.debug(f"Load tasks tab completed in {end_time - start_time:.3f} seconds")
         
         except Exception as e:
+            self.data_version = None
             debug.error(f"Error loading tasks for {self.filter_type} tab: {e}")
             debug.error(traceback.format_exc())
             from PyQt6.QtWidgets import QMessageBox
@@ -150,7 +167,7 @@ class TabTaskTreeWidget(TaskTreeWidget):
 
     @debug_method
     def _process_tasks_with_links(self, tasks, use_priority_headers=True):
-        """Process tasks and load links and files for each task"""
+        """Index tasks for the view to fetch; links and files load with each fetched batch"""
         start_time = time.time()
         try:
             debug.debug(f"Processing {len(tasks)} tasks with links, use_priority_headers={use_priority_headers}")
@@ -177,9 +194,16 @@ class TabTaskTreeWidget(TaskTreeWidget):
                 priority_headers = {}
                 for priority, color in priority_colors.items():
                     debug.debug(f"Creating header for priority: {priority}, color: {color}")
-                    header_item = PriorityHeaderItem(priority, color)
+                    priority_headers[priority] = PriorityHeaderItem(priority, color)
+                
+                # Index the top-level tasks under their priority header (Medium
+                # if theirs has none); items are built as the headers are
+                # expanded and scrolled through
+                debug.debug("Indexing tasks under priority headers")
+                self._index_tasks(tasks, lambda row: priority_headers.get(row[5] or "Medium",
+                                                                          priority_headers.get("Medium")))
+                for header_item in priority_headers.values():
                     self.addTopLevelItem(header_item)
-                    priority_headers[priority] = header_item
                 
                 # Restore expanded state from settings
                 debug.debug("Restoring expanded states from settings")
@@ -207,109 +231,17 @@ class TabTaskTreeWidget(TaskTreeWidget):
                             'color': priority_colors[priority],
                             'expanded': False
                         })
+            else:
+                # Simple flat list: top-level tasks are fetched under the root
+                debug.debug("Indexing tasks as a flat list")
+                root = self.invisibleRootItem()
+                self._index_tasks(tasks, lambda row: root)
             
-            items = {}
-            
-            # First pass: create all items with proper links and files
-            debug.debug("First pass: creating all items with links and files")
-            for i, row in enumerate(tasks):
-                if i % 20 == 0:  # Log progress every 20 items
-                    debug.debug(f"Processing task {i+1}/{len(tasks)}")
-                
-                task_id = row[0]
-                
-                # Load links for this task
-                load_links_start = time.time()
-                debug.debug(f"Loading links for task {task_id}")
-                task_links = []
-                try:
-                    task_links = db_manager.get_task_links(task_id)
-                    debug.debug(f"Found {len(task_links)} links for task {task_id}")
-                except Exception as e:
-                    debug.error(f"Error loading links for task {task_id}: {e}")
-                load_links_end = time.time()
-                if load_links_end - load_links_start > 0.05:  # Log slow operations
-                    debug.debug(f"Link loading took {load_links_end - load_links_start:.3f} seconds for task {task_id}")
-                
-                # Load files for this task
-                load_files_start = time.time()
-                debug.debug(f"Loading files for task {task_id}")
-                task_files = []
-                try:
-                    task_files = db_manager.get_task_files(task_id)
-                    debug.debug(f"Found {len(task_files)} files for task {task_id}")
-                except Exception as e:
-                    debug.error(f"Error loading files for task {task_id}: {e}")
-                load_files_end = time.time()
-                if load_files_end - load_files_start > 0.05:  # Log slow operations
-                    debug.debug(f"File loading took {load_files_end - load_files_start:.3f} seconds for task {task_id}")
-                
-                # Create the task item WITH links and files
-                item_create_start = time.time()
-                debug.debug(f"Creating task item for ID: {task_id}")
-                item = self.add_task_item(
-                    row[0],      # task_id
-                    row[1],      # title
-                    row[2],      # description
-                    '',          # link (empty legacy field)
-                    row[4],      # status
-                    row[5],      # priority
-                    row[6],      # due_date
-                    row[7],      # category
-                    row[8],      # is_compact
-                    links=task_links,  # Pass links as named parameter
-                    files=task_files   # Pass files as named parameter
-                )
-                items[task_id] = item
-                item_create_end = time.time()
-                if item_create_end - item_create_start > 0.05:  # Log slow operations
-                    debug.debug(f"Item creation took {item_create_end - item_create_start:.3f} seconds for task {task_id}")
-                
-                # Store parent info for second pass
-                parent_id = row[9]  # parent_id
-                debug.debug(f"Task {task_id} has parent_id: {parent_id}")
-                
-                if use_priority_headers:
-                    # Process using priority headers logic
-                    priority = row[5] or "Medium"  # Default to Medium if None
-                    debug.debug(f"Task {task_id} has priority: {priority}")
-                    
-                    if parent_id is None:
-                        # This is a top-level task, add it to the priority header
-                        if priority in priority_headers:
-                            debug.debug(f"Adding task {task_id} to priority header: {priority}")
-                            priority_headers[priority].addChild(item)
-                        else:
-                            # If no matching header (should not happen), use Medium
-                            debug.debug(f"No header found for priority '{priority}', using Medium for task {task_id}")
-                            priority_headers["Medium"].addChild(item)
-                    else:
-                        # This is a child task, will be handled in second pass
-                        debug.debug(f"Task {task_id} is a child task, will be handled in second pass")
-                        item.setData(0, Qt.ItemDataRole.UserRole + 1, parent_id)
-                else:
-                    # Simple flat list processing
-                    if parent_id is None:
-                        # This is a top-level task, add directly to the tree
-                        debug.debug(f"Adding task {task_id} as top-level item")
-                        self.addTopLevelItem(item)
-                    else:
-                        # This is a child task, will be handled in second pass
-                        debug.debug(f"Task {task_id} is a child task, will be handled in second pass")
-                        item.setData(0, Qt.ItemDataRole.UserRole + 1, parent_id)
-                        
-            # Second pass: handle parent-child relationships for non-top-level tasks
-            debug.debug("Second pass: handling parent-child relationships")
-            parent_child_count = 0
-            for task_id, item in items.items():
-                parent_id = item.data(0, Qt.ItemDataRole.UserRole + 1)
-                if parent_id is not None and parent_id in items:
-                    parent_item = items[parent_id]
-                    parent_item.addChild(item)
-                    parent_child_count += 1
-                    debug.debug(f"Added task {task_id} as child of {parent_id}")
-            
-            debug.debug(f"Processed {parent_child_count} parent-child relationships")
+            # Build the items for the rows that are visible now; links and
+            # files are loaded per fetched batch
+            self._fetch_visible_rows()
+            debug.debug(f"{self.model().rowCount()} top-level rows fetched, "
+                        f"{len(self.model().unfetched_task_ids())} tasks left to fetch")
             end_time = time.time()
             debug.debug(f"Task processing completed in {end_time - start_time:.3f} seconds")
         
@@ -317,6 +249,213 @@ class TabTaskTreeWidget(TaskTreeWidget):
             debug.error(f"Error processing tasks with links and files: {e}")
             debug.error(traceback.format_exc())
         
+    def _status_in_tab(self, status):
+        """Check whether a task with this status belongs in this tab"""
+        if self.filter_type == "current":
+            return status not in ("Backlog", "Completed")
+        elif self.filter_type == "backlog":
+            return status == "Backlog"
+        elif self.filter_type == "completed":
+            return status == "Completed"
+        return True
+
+    def _collect_task_items(self):
+        """Map task_id -> item for every task item currently in the tree"""
+        items = {}
+        for task_id in list(self._items_by_id):
+            item = self._task_item(task_id)
+            if item is not None:
+                items[task_id] = item
+        return items
+
+    def _collect_priority_headers(self):
+        """Map priority name -> header item for the top level of this tree"""
+        headers = {}
+        for i in range(self.topLevelItemCount()):
+            top_item = self.topLevelItem(i)
+            data = top_item.data(0, Qt.ItemDataRole.UserRole)
+            if isinstance(data, dict) and data.get('is_priority_header', False):
+                headers[data.get('priority')] = top_item
+        return headers
+
+    def _get_sibling_ranks(self, parent_id, db_manager):
+        """Get task_id -> position for the children of parent_id, in this tab's sort order"""
+        order_by = "display_order"
+        if self.filter_type == "completed":
+            with db_manager.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("PRAGMA table_info(tasks)")
+                if 'completed_at' in [info[1] for info in cursor.fetchall()]:
+                    order_by = "completed_at DESC"
+        
+        result = db_manager.execute_query(
+            f"SELECT id FROM tasks WHERE parent_id IS ? ORDER BY {order_by}",
+            (parent_id,)
+        )
+        return {row[0]: rank for rank, row in enumerate(result)}
+
+    def _detach_task_item(self, item, items):
+        """Remove item and its subtree, fetched or not, from the tree and from the items map"""
+        if item.treeWidget() is self:
+            parent = item.parent() or self.invisibleRootItem()
+            parent.takeChild(parent.indexOfChild(item))
+        
+        model = self.model()
+        stack = [item]
+        while stack:
+            current = stack.pop()
+            task_id = getattr(current, 'task_id', None)
+            items.pop(task_id, None)
+            self._items_by_id.pop(task_id, None)
+            model.discard_unfetched_children(current)
+            stack.extend(current.child(i) for i in range(current.childCount()))
+
+    def _place_task_item(self, item, container, ranks):
+        """Insert or move item so it sits in rank order among container's fetched children"""
+        rank = ranks.get(item.task_id, len(ranks))
+        index = 0
+        for i in range(container.childCount()):
+            sibling = container.child(i)
+            if sibling is not item and ranks.get(getattr(sibling, 'task_id', None), -1) < rank:
+                index += 1
+        
+        if item.treeWidget() is self:
+            # Moving the row keeps the expanded state of its subtree
+            self.model().move_item(item, container, index)
+        else:
+            container.insertChild(index, item)
+        debug.debug(f"Placed task {item.task_id} at index {index}")
+
+    def _place_unfetched(self, task_id, row, holder, ranks):
+        """Index a task row in rank order among holder's unfetched children"""
+        rank = ranks.get(task_id, len(ranks))
+        siblings = self.model().unfetched_ids(holder)
+        position = sum(1 for sibling_id in siblings if ranks.get(sibling_id, -1) < rank)
+        self.model().add_unfetched(holder, task_id, row, position)
+        debug.debug(f"Indexed unfetched task {task_id} at position {position}")
+
+    def _fetches_later(self, task_id, container, ranks):
+        """Whether a task placed in container belongs among its unfetched children.
+
+        That is the case when container has no item yet (it is a task ID), or
+        the task sorts after the first of container's children not fetched yet.
+        """
+        if not isinstance(container, TaskItem):
+            return True
+        siblings = [sibling_id for sibling_id in self.model().unfetched_ids(container) if sibling_id != task_id]
+        if not siblings:
+            return False
+        return ranks.get(task_id, len(ranks)) > ranks.get(siblings[0], -1)
+
+    def _refresh_task_item(self, item, row, links, files):
+        """Update an existing task item in place from a task row"""
+        data = item.data(0, Qt.ItemDataRole.UserRole) or {}
+        data.update({
+            'title': row[1] or "",
+            'description': row[2] or "",
+            'status': row[4] or "Not Started",
+            'priority': row[5] or "Medium",
+            'due_date': row[6] or "",
+            'category': row[7] or "",
+            'links': links,
+            'files': files
+        })
+        item.setData(0, Qt.ItemDataRole.UserRole, data)
+        item.setText(0, row[1] or "")
+        
+        category_color = get_lookup_cache().get_color("category", row[7]) if row[7] else None
+        item.setBackground(0, QBrush(QColor(category_color)) if category_color else QBrush())
+
+    @debug_method
+    def apply_task_changes(self, task_ids, rows, links_by_task, files_by_task):
+        """Bring the given tasks and their subtrees up to date without reloading the tab.
+        
+        rows come from get_task_subtrees (parents before children). Items are
+        updated in place, moved, inserted or removed depending on whether the
+        task still belongs in this tab and where. Tasks that land among rows
+        the view has not fetched yet only update the model's task index.
+        """
+        start_time = time.time()
+        db_manager = get_memory_db_manager()
+        model = self.model()
+        items = self._collect_task_items()
+        headers = self._collect_priority_headers() if self.use_priority_headers else {}
+        sibling_ranks = {}
+        
+        # Tasks that were deleted from the database
+        present_ids = {row[0] for row in rows}
+        for task_id in task_ids:
+            if task_id in present_ids:
+                continue
+            if task_id in items:
+                debug.debug("Removing deleted task %s from %s tab", task_id, self.filter_type)
+                self._detach_task_item(items[task_id], items)
+            elif model.is_unfetched(task_id):
+                model.discard_unfetched(task_id)
+        
+        for row in rows:
+            task_id = row[0]
+            parent_id = row[9]
+            item = items.get(task_id)
+            
+            # Work out what this task should hang under in this tab, if anything:
+            # an item, or the ID of a parent task that was not fetched yet
+            container = None
+            if self._status_in_tab(row[4]):
+                if parent_id is not None:
+                    container = items.get(parent_id)
+                    if container is None and model.is_unfetched(parent_id):
+                        container = parent_id
+                elif self.use_priority_headers:
+                    container = headers.get(row[5] or "Medium", headers.get("Medium"))
+                else:
+                    container = self.invisibleRootItem()
+            
+            if container is None:
+                if item is not None:
+                    debug.debug("Task %s no longer belongs in %s tab", task_id, self.filter_type)
+                    self._detach_task_item(item, items)
+                elif model.is_unfetched(task_id):
+                    model.discard_unfetched(task_id)
+                continue
+            
+            if parent_id not in sibling_ranks:
+                sibling_ranks[parent_id] = self._get_sibling_ranks(parent_id, db_manager)
+            ranks = sibling_ranks[parent_id]
+            
+            if self._fetches_later(task_id, container, ranks):
+                # Its fetched children, if any, follow it into the index as
+                # they come up in rows
+                if item is not None:
+                    self._detach_task_item(item, items)
+                elif model.is_unfetched(task_id):
+                    model.take_unfetched(task_id)
+                self._place_unfetched(task_id, row, container, ranks)
+                continue
+            
+            task_links = links_by_task.get(task_id, [])
+            task_files = files_by_task.get(task_id, [])
+            if item is None:
+                debug.debug("Adding task %s to %s tab", task_id, self.filter_type)
+                if model.is_unfetched(task_id):
+                    model.take_unfetched(task_id)
+                item = self.add_task_item(
+                    row[0], row[1], row[2], '', row[4], row[5], row[6], row[7], row[8],
+                    links=task_links,
+                    files=task_files
+                )
+                items[task_id] = item
+            else:
+                self._refresh_task_item(item, row, task_links, task_files)
+            
+            self._place_task_item(item, container, ranks)
+        
+        # Parents may have gained or lost unfetched children
+        self.scheduleDelayedItemsLayout()
+        self.viewport().update()
+        debug.debug(f"Applied changes for {len(rows)} tasks to {self.filter_type} tab "
+                    f"in {time.time() - start_time:.3f} seconds")
+
     @debug_method
     def _format_tasks_with_priority_headers(self, tasks):
         """Format tasks with priority headers (for Current Tasks tab)"""
@@ -664,6 +803,7 @@ class TaskTabWidget(QTabWidget):
         super().__init__()
         self.main_window = main_window
         self.setup_tabs()
+        self.setup_search_bar()
         
         # Connect tab change signal
         debug.debug("Connecting tab change signal")
@@ -678,15 +818,16 @@ class TaskTabWidget(QTabWidget):
         debug.debug("Creating 'current' tab")
         self.current_tasks_tab = self.create_tab("current")
         
+        # Backlog and Completed build their trees on first activation
         debug.debug("Creating 'backlog' tab")
-        self.backlog_tab = self.create_tab("backlog")
+        self.backlog_tab = self.create_tab("backlog", lazy=True)
         
         # Create Bee To Dos tab
         debug.debug("Creating 'bee_todos' tab")
         self.bee_todos_tab = self.create_bee_todos_tab()
         
         debug.debug("Creating 'completed' tab")
-        self.completed_tab = self.create_tab("completed")
+        self.completed_tab = self.create_tab("completed", lazy=True)
         
         # Add them to the tab widget in the new order
         debug.debug("Adding tabs to widget")
@@ -695,9 +836,9 @@ class TaskTabWidget(QTabWidget):
         self.addTab(self.bee_todos_tab, "Bee To Dos")  # New tab
         self.addTab(self.completed_tab, "Completed Tasks")
         
-        # Force load the current tasks tab data
+        # Load the current tasks tab data
         debug.debug("Loading current tasks tab data")
-        self.current_tasks_tab.task_tree.load_tasks_tab()
+        self.current_tasks_tab.task_tree._init_load_tasks_tab()
         
         # Set tab tool tips for better UX
         debug.debug("Setting tab tooltips")
@@ -708,23 +849,104 @@ class TaskTabWidget(QTabWidget):
         debug.debug("Tab setup complete")
         
     @debug_method
-    def create_tab(self, filter_type):
-        """Create a tab widget with a task tree for the given filter type"""
+    def create_tab(self, filter_type, lazy=False):
+        """Create a tab widget with a task tree for the given filter type.
+        
+        With lazy=True the tree (and its delegate) is only created by
+        _ensure_task_tree when the tab is first activated; until then the
+        widget has no task_tree attribute.
+        """
         debug.debug(f"Creating tab for filter type: {filter_type}")
         tab_widget = QWidget()
-        layout = QVBoxLayout(tab_widget)
+        QVBoxLayout(tab_widget)
+        tab_widget.filter_type = filter_type
         
-        # Create specialized task tree for this tab
-        debug.debug(f"Creating TabTaskTreeWidget for filter type: {filter_type}")
-        task_tree = TabTaskTreeWidget(filter_type)
-        layout.addWidget(task_tree)
-        
-        # Store the task tree as an attribute on the widget for easy access
-        tab_widget.task_tree = task_tree
-        debug.debug(f"Tab creation for {filter_type} completed")
+        if not lazy:
+            self._ensure_task_tree(tab_widget)
+        debug.debug(f"Tab creation for {filter_type} completed (lazy={lazy})")
         
         return tab_widget
     
+    def _ensure_task_tree(self, tab_widget):
+        """Return the tab's task tree, creating it on first use"""
+        if not hasattr(tab_widget, 'task_tree'):
+            # Create specialized task tree for this tab
+            debug.debug(f"Creating TabTaskTreeWidget for filter type: {tab_widget.filter_type}")
+            task_tree = TabTaskTreeWidget(tab_widget.filter_type)
+            tab_widget.layout().addWidget(task_tree)
+            
+            # Store the task tree as an attribute on the widget for easy access
+            tab_widget.task_tree = task_tree
+        return tab_widget.task_tree
+    
+    @debug_method
+    def setup_search_bar(self):
+        """Search field in the corner of the tab bar; Enter lists matching tasks"""
+        self.search_field = QLineEdit()
+        self.search_field.setPlaceholderText("Search tasks...")
+        self.search_field.setClearButtonEnabled(True)
+        self.search_field.setMinimumWidth(220)
+        self.search_field.returnPressed.connect(self.show_search_results)
+        self.setCornerWidget(self.search_field, Qt.Corner.TopRightCorner)
+        
+        search_shortcut = QShortcut(QKeySequence.StandardKey.Find, self)
+        search_shortcut.activated.connect(self.search_field.setFocus)
+        search_shortcut.activated.connect(self.search_field.selectAll)
+    
+    @debug_method
+    def show_search_results(self):
+        """Search every task and offer the hits, best first, in a menu"""
+        text = self.search_field.text().strip()
+        if not text:
+            return
+        
+        try:
+            start_time = time.time()
+            hits = search_tasks(get_memory_db_manager().get_connection(), text)
+            debug.debug(f"Search for '{text}' found {len(hits)} tasks in {(time.time() - start_time) * 1000:.1f} ms")
+        except Exception as e:
+            debug.error(f"Error searching tasks: {e}")
+            debug.error(traceback.format_exc())
+            QMessageBox.warning(self, "Search Error", f"Search failed: {str(e)}")
+            return
+        
+        menu = QMenu(self)
+        if not hits:
+            menu.addAction(f"No tasks match '{text}'").setEnabled(False)
+        for task_id, title, status, parent_id in hits:
+            index = self._tab_index_for_status(status)
+            action = menu.addAction(f"{title}  ({self.tabText(index)})")
+            action.triggered.connect(
+                lambda checked=False, i=index, t=task_id: self.highlight_task(i, t))
+        menu.exec(self.search_field.mapToGlobal(self.search_field.rect().bottomLeft()))
+    
+    def _tab_index_for_status(self, status):
+        """Index of the task tab that shows tasks with this status"""
+        if status == "Backlog":
+            filter_type = "backlog"
+        elif status == "Completed":
+            filter_type = "completed"
+        else:
+            filter_type = "current"
+        for i in range(self.count()):
+            if getattr(self.widget(i), 'filter_type', None) == filter_type:
+                return i
+        return 0
+    
+    @debug_method
+    def highlight_task(self, index, task_id):
+        """Switch to tab index and select the task, expanding its parents"""
+        # Switching tabs builds or reloads the tree if needed
+        self.setCurrentIndex(index)
+        task_tree = self._ensure_task_tree(self.widget(index))
+        if task_tree.data_version is None:
+            task_tree._init_load_tasks_tab()
+        
+        if task_tree._highlight_task(task_id):
+            task_tree.setFocus()
+        else:
+            debug.debug(f"Search hit {task_id} is not shown in tab {index}")
+    
     @debug_method
     def get_current_tree(self):
         """Get the task tree for the currently active tab"""
@@ -742,62 +964,123 @@ class TaskTabWidget(QTabWidget):
         """Reload all task trees while preserving expanded states"""
         debug.debug("Reloading all task trees with expanded state preservation")
         
-        # Get the current tab's tree and save its expanded states
+        # Get the current tab's tree and its expanded task IDs
         current_tab = self.currentWidget()
         expanded_items = None
         if hasattr(current_tab, 'task_tree'):
-            expanded_items = current_tab.task_tree._save_expanded_states()
-            debug.debug(f"Saved {len(expanded_items)} expanded states from current tab")
+            expanded_items = current_tab.task_tree.expanded_task_ids()
+            debug.debug(f"{len(expanded_items)} expanded tasks in current tab")
         
-        # Reload all tabs
+        # Reload the visible tree; hidden ones reload when next activated
         for i in range(self.count()):
             tab = self.widget(i)
             if hasattr(tab, 'task_tree'):
-                tab.task_tree.load_tasks_tab()
+                if tab is current_tab:
+                    tab.task_tree.load_tasks_tab()
+                else:
+                    tab.task_tree.data_version = None
         
         # Restore expanded states to the current tab
         if expanded_items and self.currentWidget() == current_tab:
             current_tab.task_tree._restore_expanded_states(expanded_items)
             debug.debug(f"Restored {len(expanded_items)} expanded states to current tab")
     
+    @debug_method
+    def refresh_tasks(self, task_ids):
+        """Apply changes to specific tasks (and their subtrees) to every tab.
+        
+        Unlike reload_all this only touches the affected items, so a single
+        status or priority change does not rebuild every tree.
+        """
+        task_ids = [task_id for task_id in task_ids if task_id is not None]
+        if not task_ids:
+            return
+        
+        start_time = time.time()
+        debug.debug(f"Refreshing {len(task_ids)} tasks across all tabs")
+        try:
+            db_manager = get_memory_db_manager()
+            conn = db_manager.get_connection()
+            rows = get_task_subtrees(conn, task_ids)
+            links_by_task, files_by_task = get_task_attachments(conn, [row[0] for row in rows])
+            
+            # Trees whose only changes since they were loaded are the ones
+            # applied here are up to date again and need no reload later
+            covered = set(task_ids) | {row[0] for row in rows}
+            version = get_data_version(conn)
+            for i in range(self.count()):
+                tab = self.widget(i)
+                if hasattr(tab, 'task_tree'):
+                    task_tree = tab.task_tree
+                    task_tree.apply_task_changes(task_ids, rows, links_by_task, files_by_task)
+                    if task_tree.data_version is not None:
+                        changed = changed_task_ids(conn, task_tree.data_version)
+                        if changed is not None and changed <= covered:
+                            task_tree.data_version = version
+            self._prune_data_changes(conn)
+            
+            debug.debug(f"Incremental refresh completed in {time.time() - start_time:.3f} seconds")
+        except Exception as e:
+            debug.error(f"Error applying incremental task changes, reloading all tabs: {e}")
+            debug.error(traceback.format_exc())
+            self.reload_all()
+    
+    def _prune_data_changes(self, conn):
+        """Drop changelog entries older than every loaded tree"""
+        versions = [self.widget(i).task_tree.data_version for i in range(self.count())
+                    if hasattr(self.widget(i), 'task_tree')]
+        versions = [version for version in versions if version is not None]
+        prune_data_changes(conn, min(versions) if versions else get_data_version(conn))
+    
     @debug_method
     def create_bee_todos_tab(self):
-        """Create the Bee To Dos tab"""
-        debug.debug("Creating Bee To Dos tab")
+        """Create the Bee To Dos tab with a placeholder.
         
-        # Create tab widget
-        debug.debug("Creating tab widget for Bee To Dos")
+        The Bee UI (and with it the Bee SDK and asyncio workers) is only
+        imported by _ensure_bee_todos_widget when the tab is first opened.
+        """
+        debug.debug("Creating Bee To Dos placeholder tab")
         tab_widget = QWidget()
         layout = QVBoxLayout(tab_widget)
         
-        # Create Bee To Dos widget
-        debug.debug("Creating BeeToDoWidget instance")
-        from ui.bee_todos import BeeToDoWidget
-        bee_todos_widget = BeeToDoWidget(self.main_window)
-        layout.addWidget(bee_todos_widget)
+        tab_widget.placeholder_label = QLabel("Loading Bee To Dos...")
+        tab_widget.placeholder_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(tab_widget.placeholder_label)
+        
+        return tab_widget
+    
+    @debug_method
+    def _ensure_bee_todos_widget(self, tab_widget):
+        """Return the tab's BeeToDoWidget, importing and creating it on first use"""
+        if hasattr(tab_widget, 'bee_todos_widget'):
+            return tab_widget.bee_todos_widget
+        
+        try:
+            debug.debug("Creating BeeToDoWidget instance")
+            from ui.bee_todos import BeeToDoWidget
+            bee_todos_widget = BeeToDoWidget(self.main_window)
+        except Exception as e:
+            debug.error(f"Error loading Bee To Dos: {e}")
+            debug.error(traceback.format_exc())
+            tab_widget.placeholder_label.setText(f"Bee To Dos unavailable: {str(e)}")
+            return None
+        
+        tab_widget.layout().removeWidget(tab_widget.placeholder_label)
+        tab_widget.placeholder_label.deleteLater()
+        tab_widget.layout().addWidget(bee_todos_widget)
         
         # Store the widget for easy access
         tab_widget.bee_todos_widget = bee_todos_widget
-        debug.debug("Bee To Dos tab creation complete")
-        
-        return tab_widget
+        debug.debug("Bee To Dos widget created")
+        return bee_todos_widget
     
     @debug_method
     def handle_tab_changed(self, index):
         """Handle tab changed event"""
         debug.debug(f"Tab changed to index: {index}")
         
-        # Save expanded states of previous tab
-        if hasattr(self, 'previous_tab_index'):
-            previous_tab = self.widget(self.previous_tab_index)
-            if previous_tab and hasattr(previous_tab, 'task_tree'):
-                debug.debug(f"Saving expanded states for tab: {self.tabText(self.previous_tab_index)}")
-                # Save expanded states with a unique key for this tab
-                tab_key = f"expanded_states_tab_{self.previous_tab_index}"
-                expanded_items = previous_tab.task_tree._save_expanded_states()
-                # Store in settings with tab-specific key
-                self.main_window.settings.set_setting(tab_key, expanded_items)
-                debug.debug(f"Saved {len(expanded_items) if expanded_items else 0} expanded states with key: {tab_key}")
+        # Expanded states need no saving here: the expanded-state store is
+        # updated as items are expanded and collapsed
         
         # Store current tab index for reference
         self.previous_tab_index = index
@@ -811,10 +1094,9 @@ class TaskTabWidget(QTabWidget):
         if index == 2:  # Bee To Dos tab
             debug.debug("Bee To Dos tab selected, checking API key")
             
-            # Get the bee_todos_widget from the tab
-            if hasattr(tab, 'bee_todos_widget'):
-                bee_todos_widget = tab.bee_todos_widget
-                debug.debug("Found bee_todos_widget")
+            # Load the Bee UI the first time the tab is opened
+            bee_todos_widget = self._ensure_bee_todos_widget(tab)
+            if bee_todos_widget:
                 
                 # Check if we have an API key
                 api_key = self.main_window.settings.get_setting("bee_api_key", "")
@@ -855,29 +1137,25 @@ class TaskTabWidget(QTabWidget):
                     # API key exists, make sure Bee To Dos widget is initialized
                     bee_todos_widget.initialize_with_api_key(api_key)
             else:
-                debug.debug("ERROR: bee_todos_widget not found in tab")
+                debug.debug("ERROR: Bee To Dos widget could not be loaded")
                 
-        elif hasattr(tab, 'task_tree'):
-            # Regular task tab - load tasks first
+        elif hasattr(tab, 'filter_type'):
+            # Regular task tab - build the tree on first activation, and only
+            # reload it if the data changed since it was last loaded
+            task_tree = self._ensure_task_tree(tab)
+            if not task_tree.is_stale():
+                debug.debug(f"Reusing loaded tree for tab: {tab_name}")
+                return
+            
             debug.debug(f"Regular task tab selected, loading tasks for tab: {tab_name}")
             load_start = time.time()
-            tab.task_tree.load_tasks_tab()
+            task_tree.load_tasks_tab()
             load_end = time.time()
             debug.debug(f"Tab load completed in {load_end - load_start:.3f} seconds")
             
-            # After loading tasks, restore expanded states specific to this tab
-            tab_key = f"expanded_states_tab_{index}"
-            expanded_items = self.main_window.settings.get_setting(tab_key, [])
-            debug.debug(f"Restoring {len(expanded_items)} expanded states for key: {tab_key}")
-            
-            # Use a short delay to ensure the tree is fully loaded
-            QTimer.singleShot(50, lambda: self._restore_tab_expanded_states(tab.task_tree, expanded_items))
+            # After loading tasks, restore this tab's stored expanded states
+            # after a short delay to ensure the tree is fully loaded
+            QTimer.singleShot(50, lambda: task_tree._restore_expanded_states())
         
         else:
-            debug.debug(f"Tab has no recognized content to load: {tab_name}")
-
-    @debug_method
-    def _restore_tab_expanded_states(self, tree, expanded_items):
-        """Helper to restore expanded states with a delay"""
-        debug.debug(f"Restoring {len(expanded_items)} expanded states to tree")
-        tree._restore_expanded_states(expanded_items)
\ No newline at end of file
+            debug.debug(f"Tab has no recognized content to load: {tab_name}")
\ No newline at end of file
@@ -1,13 +1,14 @@
 # src/ui/task_tree.py
 
-from PyQt6.QtWidgets import QTreeWidget, QTreeWidgetItem, QMenu, QHeaderView, QMessageBox, QDateEdit, QApplication
-from PyQt6.QtCore import Qt, QDate, QSize, QTimer
+from PyQt6.QtWidgets import QTreeView, QAbstractItemView, QMenu, QHeaderView, QMessageBox, QDateEdit, QApplication
+from PyQt6.QtCore import Qt, QDate, QSize, QTimer, QModelIndex, pyqtSignal
 from PyQt6.QtGui import QBrush, QColor
 import sqlite3
 from pathlib import Path
 import webbrowser
 import logging
 from .task_pill_delegate import TaskPillDelegate
+from .task_tree_model import TaskTreeModel, TaskItem, PriorityHeaderItem
 from datetime import datetime, date
 import sys
 from pathlib import Path
@@ -18,6 +19,13 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 # Now import directly from the database package
 from database.memory_db_manager import get_memory_db_manager
+from database.task_queries import (get_task_attachments, get_descendant_ids, delete_subtree,
+                                   set_subtree_priority, reparent_task, next_display_order,
+                                   apply_sibling_order, insert_tasks)
+from database.lookup_cache import get_lookup_cache
+from database.write_behind import mark_database_dirty
+from database.unit_of_work import transaction
+from ui.expanded_state import get_expanded_state_store, task_ids_from_keys
 
 # Import the debug logger
 from utils.debug_decorator import debug_method
@@ -28,7 +36,17 @@ debug = get_debug_logger()
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
-class TaskTreeWidget(QTreeWidget):
+class TaskTreeWidget(QTreeView):
+    """Task tree view over a TaskTreeModel.
+
+    Rows are fetched as parents are expanded or scrolled into view. The
+    view keeps the item-based API (topLevelItem, itemFromIndex, expandItem,
+    itemExpanded and so on) the rest of the task code is written against.
+    """
+
+    itemExpanded = pyqtSignal(object)
+    itemCollapsed = pyqtSignal(object)
+    itemDoubleClicked = pyqtSignal(object, int)
 
     def __init__(self):
         debug.debug("Initializing TaskTreeWidget")
@@ -36,13 +54,15 @@ class TaskTreeWidget(QTreeWidget):
         self.setRootIsDecorated(False)
         self.setDragEnabled(True)
         self.setAcceptDrops(True)
-        self.setDragDropMode(QTreeWidget.DragDropMode.InternalMove)
-        
-        # Change to just one column
+        self.setDragDropMode(QAbstractItemView.DragDropMode.InternalMove)
+
+        # Single-column model whose rows are built when they are fetched
         debug.debug("Setting up single column view")
-        self.setColumnCount(1)
-        self.setHeaderLabels(['Tasks'])
-        
+        self.setModel(TaskTreeModel(self._create_fetched_items, self))
+        self.model().itemsFetched.connect(self._expand_fetched_items)
+        self._visible_fetch_scheduled = False
+        self._fetched_compact = None
+
         # Hide the header
         self.setHeaderHidden(True)
         self.setIndentation(40)  # Increased indentation for better hierarchy view
@@ -63,15 +83,29 @@ class TaskTreeWidget(QTreeWidget):
         # Set alternating row colors to false to prevent default styling
         self.setAlternatingRowColors(False)
         
+        # task_id -> item, filled by add_task_item and reset by clear(), so
+        # lookups by ID do not walk the tree
+        self._items_by_id = {}
+        
         # Set spacing between items
-        self.setVerticalScrollMode(QTreeWidget.ScrollMode.ScrollPerPixel)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
         self.setUniformRowHeights(False)
-        
+
+        # Qt fetches more top-level rows on its own; rows under the priority
+        # headers are fetched as the view scrolls or grows
+        self.verticalScrollBar().valueChanged.connect(self._schedule_visible_fetch)
+        self.verticalScrollBar().rangeChanged.connect(self._schedule_visible_fetch)
+
         # Set context menu
         debug.debug("Setting up context menu")
         self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.customContextMenuRequested.connect(self.show_context_menu)
 
+        # Relay the view's index signals as item signals
+        self.expanded.connect(self._emit_item_expanded)
+        self.collapsed.connect(self._emit_item_collapsed)
+        self.doubleClicked.connect(self._emit_item_double_clicked)
+
         # Connect expansion/collapse signals
         debug.debug("Connecting expansion/collapse signals")
         self.itemExpanded.connect(self.onItemExpanded)
@@ -105,20 +139,16 @@ class TaskTreeWidget(QTreeWidget):
         """Add a new task with proper expanded state preservation"""
         debug.debug(f"Adding new task: {data.get('title', 'No Title')}")
         
-        # Save expanded states before adding
-        expanded_items = self._save_expanded_states()
-        debug.debug(f"Saved {len(expanded_items)} expanded states before adding task")
-        
         # Original task creation logic
         try:
             # Import database manager
             from database.memory_db_manager import get_memory_db_manager
             db_manager = get_memory_db_manager()
             
-            # Use a single connection for the entire operation
-            debug.debug("Opening database connection")
-            with db_manager.get_connection() as conn:
-                cursor = conn.cursor()
+            # Run the whole insert (task, links, files) as one transaction
+            debug.debug("Opening database transaction")
+            with transaction(db_manager) as uow:
+                cursor = uow.cursor()
                 
                 # Get category ID
                 category_name = data.get('category')
@@ -135,22 +165,10 @@ class TaskTreeWidget(QTreeWidget):
                         category_id = result[0]
                         debug.debug(f"Found category ID: {category_id}")
                 
-                # Get next display order
+                # Get next display order (spaced out so later moves can slot in between)
                 parent_id = data.get('parent_id')
                 debug.debug(f"Getting next display order for parent_id: {parent_id}")
-                if parent_id:
-                    cursor.execute(
-                        "SELECT MAX(display_order) FROM tasks WHERE parent_id = ?",
-                        (parent_id,)
-                    )
-                else:
-                    cursor.execute(
-                        "SELECT MAX(display_order) FROM tasks WHERE parent_id IS NULL"
-                    )
-                
-                result = cursor.fetchone()
-                max_order = result[0] if result and result[0] else 0
-                display_order = max_order + 1
+                display_order = next_display_order(uow.connection, parent_id)
                 debug.debug(f"Next display order will be: {display_order}")
                 
                 # Check if is_compact column exists
@@ -162,7 +180,6 @@ class TaskTreeWidget(QTreeWidget):
                     # Column doesn't exist, need to add it
                     debug.debug("is_compact column does not exist, adding it")
                     cursor.execute("ALTER TABLE tasks ADD COLUMN is_compact INTEGER NOT NULL DEFAULT 0")
-                    conn.commit()
                 
                 # Default is_compact value (new tasks are expanded by default)
                 is_compact = 0
@@ -248,21 +265,18 @@ class TaskTreeWidget(QTreeWidget):
                                 (new_id, file_path, file_name, i)
                             )
 
-                # Commit changes
+                # Changes are committed when the transaction block ends
                 debug.debug("Committing changes to database")
-                conn.commit()
+            mark_database_dirty()
 
-            # Now reload the tree and restore expanded states
-            if hasattr(self, 'load_tasks_tab'):
-                debug.debug("Reloading tasks with filtered method")
-                self.load_tasks_tab()
-            else:
+            # Insert the new task into whichever tabs it belongs to
+            if not self._refresh_tasks_in_tabs([new_id]):
+                # Not in a tabbed interface - reload the tree and restore expanded states
+                expanded_items = self.expanded_task_ids()
                 debug.debug("Reloading tasks with standard method")
                 self.load_tasks_tree()
-            
-            # Restore expanded states
-            self._restore_expanded_states(expanded_items)
-            debug.debug(f"Restored {len(expanded_items)} expanded states")
+                self._restore_expanded_states(expanded_items)
+                debug.debug(f"Restored {len(expanded_items)} expanded states")
             
             # Try to find and highlight the new task
             self._highlight_task(new_id)
@@ -277,12 +291,34 @@ class TaskTreeWidget(QTreeWidget):
             QMessageBox.critical(None, "Error", f"Failed to add task: {str(e)}")
             return None    
 
+    def add_new_tasks(self, tasks):
+        """Add many tasks in one transaction and refresh the tabs once.
+
+        tasks are dicts in the add_new_task format. Tasks whose bee_item_id
+        is already in the database are skipped. Returns (new_ids, skipped_count).
+        """
+        debug.debug("Adding %d tasks in one batch", len(tasks))
+        from database.memory_db_manager import get_memory_db_manager
+        db_manager = get_memory_db_manager()
+        
+        with transaction(db_manager) as uow:
+            new_ids, skipped = insert_tasks(uow.connection, tasks)
+        
+        if new_ids:
+            mark_database_dirty()
+            if not self._refresh_tasks_in_tabs(new_ids):
+                # Not in a tabbed interface - reload the tree and restore expanded states
+                expanded_items = self.expanded_task_ids()
+                self.load_tasks_tree()
+                self._restore_expanded_states(expanded_items)
+        return new_ids, skipped
+
     def _highlight_task(self, task_id):
         """Find and highlight/select a task by its ID"""
         debug.debug(f"Attempting to highlight task: {task_id}")
         
-        # Find the task item
-        task_item = self._find_task_item_by_id(task_id)
+        # Find the task item, fetching the rows down to it if needed
+        task_item = self._fetched_task_item(task_id)
         
         if task_item:
             # Select the item
@@ -422,6 +458,7 @@ class TaskTreeWidget(QTreeWidget):
                         )
                         
                 debug.debug(f"Updated status of {len(child_tasks)} child tasks to {new_status}")
+            mark_database_dirty()
             
             # Force a repaint
             debug.debug("Forcing viewport update")
@@ -430,15 +467,8 @@ class TaskTreeWidget(QTreeWidget):
             # Notify parent about status change if we're in a tabbed interface
             # The task needs to move to another tab
             if is_tab_transition:
-                debug.debug("Requesting tab reload due to status transition")
-                parent = self.parent()
-                while parent and not hasattr(parent, 'reload_all'):
-                    parent = parent.parent()
-                    
-                if parent and hasattr(parent, 'reload_all'):
-                    # Use a short timer to let the current operation complete first
-                    debug.debug("Scheduling reload of all tabs")
-                    QTimer.singleShot(100, parent.reload_all)
+                debug.debug("Moving task between tabs due to status transition")
+                self._refresh_tasks_in_tabs([item.task_id])
             
             return True
             
@@ -455,7 +485,7 @@ class TaskTreeWidget(QTreeWidget):
         # Store the expanded states in a way that will survive across tabs
         # We can use main_window's settings for temporary storage
         if hasattr(parent, 'main_window') and hasattr(parent.main_window, 'settings'):
-            parent.main_window.settings.set_setting("temp_expanded_states", expanded_items)
+            parent.main_window.settings.set_setting("temp_expanded_states", expanded_items, deferred=True)
             debug.debug(f"Stored {len(expanded_items)} expanded states in settings")
         
         # Trigger the reload_all method
@@ -480,16 +510,16 @@ class TaskTreeWidget(QTreeWidget):
             self._restore_expanded_states(expanded_items)
             
             # Clear the temporary storage
-            parent.main_window.settings.set_setting("temp_expanded_states", [])
+            parent.main_window.settings.set_setting("temp_expanded_states", [], deferred=True)
             
     def add_task_item(self, task_id, title, description, link, status, priority, due_date, category, is_compact=0, links=None, files=None):
-        debug.debug(f"Adding task item: ID={task_id}, title={title}")
+        debug.debug("Adding task item: ID=%s, title=%s", task_id, title)
         # Create a single-column item
-        item = QTreeWidgetItem([title or ""])
+        item = TaskItem([title or ""])
         
         # Debug prints
-        debug.debug(f"Links parameter: {links}")
-        debug.debug(f"Files parameter: {files}")
+        debug.debug("Links parameter: %s", links)
+        debug.debug("Files parameter: %s", files)
         
         # Store all data as item data
         user_data = {
@@ -505,49 +535,50 @@ class TaskTreeWidget(QTreeWidget):
             'expanded': False
         }
         
-        debug.debug(f"Setting user data with links: {user_data.get('links', [])}")
-        debug.debug(f"Setting user data with files: {user_data.get('files', [])}")
+        debug.debug("Setting user data with links: %s", user_data.get('links', []))
+        debug.debug("Setting user data with files: %s", user_data.get('files', []))
         item.setData(0, Qt.ItemDataRole.UserRole, user_data)
         
-        # Verify the data was set correctly
-        verify_data = item.data(0, Qt.ItemDataRole.UserRole)
-        debug.debug(f"Verified user data links: {verify_data.get('links', [])}")
-        debug.debug(f"Verified user data files: {verify_data.get('files', [])}")
+        # Verify the data was set correctly (the round trip copies the dict, so only when logging)
+        if debug.isEnabledFor():
+            verify_data = item.data(0, Qt.ItemDataRole.UserRole)
+            debug.debug("Verified user data links: %s", verify_data.get('links', []))
+            debug.debug("Verified user data files: %s", verify_data.get('files', []))
         
         
         item.task_id = task_id
+        self._items_by_id[task_id] = item
         item.setFlags(item.flags() | Qt.ItemFlag.ItemIsDragEnabled | Qt.ItemFlag.ItemIsDropEnabled)
         
+        # Children of the task that were indexed but not fetched yet
+        self.model().adopt_unfetched(item)
+        
         # Set item height based on compact state
         delegate = self.itemDelegate()
         if isinstance(delegate, TaskPillDelegate):
             # If this item is marked as compact in the database, add it to delegate's compact set
             if is_compact:
-                debug.debug(f"Task {task_id} is compact, adding to delegate compact set")
+                debug.debug("Task %s is compact, adding to delegate compact set", task_id)
                 delegate.compact_items.add(task_id)
+            else:
+                delegate.compact_items.discard(task_id)
             
             # Set appropriate height
             height = delegate.compact_height if is_compact else delegate.pill_height
             item.setSizeHint(0, QSize(100, height + delegate.item_margin * 2))
-            debug.debug(f"Set item size hint to height: {height + delegate.item_margin * 2}")
+            debug.debug("Set item size hint to height: %s", height + delegate.item_margin * 2)
         
         # Apply background color based on category
         if category:
             try:
-                debug.debug(f"Setting background color for category: {category}")
-                from database.database_manager import get_db_manager
-                db_manager = get_db_manager()
-                
-                result = db_manager.execute_query(
-                    "SELECT color FROM categories WHERE name = ?", 
-                    (category,)
-                )
-                if result and result[0]:
-                    color = QColor(result[0][0])
+                debug.debug("Setting background color for category: %s", category)
+                category_color = get_lookup_cache().get_color("category", category)
+                if category_color:
+                    color = QColor(category_color)
                     item.setBackground(0, QBrush(color))
-                    debug.debug(f"Background color set to: {result[0][0]}")
+                    debug.debug("Background color set to: %s", category_color)
             except Exception as e:
-                debug.error(f"Error setting category color: {e}")
+                debug.error("Error setting category color: %s", e)
         
         return item
 
@@ -608,22 +639,15 @@ class TaskTreeWidget(QTreeWidget):
                 debug.debug("Removed completed_at from item data")
                 
             item.setData(0, Qt.ItemDataRole.UserRole, data)
+            mark_database_dirty()
             
             # Force a repaint
             debug.debug("Forcing viewport update")
             self.viewport().update()
             
-            # Notify parent about status change if we're in a tabbed interface
-            parent = self.parent()
-            while parent and not hasattr(parent, 'reload_all'):
-                parent = parent.parent()
-                
-            if parent and hasattr(parent, 'reload_all'):
-                # This is a TabTaskTreeWidget within a TaskTabWidget
-                # Reload all tabs to reflect the status change
-                debug.debug("Requesting tab reload")
-                from PyQt6.QtCore import QTimer
-                QTimer.singleShot(100, parent.reload_all)
+            # Move the task between tabs if we're in a tabbed interface
+            debug.debug("Applying status change to tabs")
+            self._refresh_tasks_in_tabs([item.task_id])
                 
         except Exception as e:
             debug.error(f"Error changing task status: {e}")
@@ -643,6 +667,7 @@ class TaskTreeWidget(QTreeWidget):
                 (new_priority, item.task_id)
             )
             debug.debug("Updated priority in database")
+            mark_database_dirty()
             
             # Update item
             data = item.data(0, Qt.ItemDataRole.UserRole)
@@ -654,18 +679,9 @@ class TaskTreeWidget(QTreeWidget):
             debug.debug("Forcing viewport update")
             self.viewport().update()
             
-            # Notify parent about priority change if we're in a tabbed interface
-            # and force a reload of all tabs
-            parent = self.parent()
-            while parent and not hasattr(parent, 'reload_all'):
-                parent = parent.parent()
-                
-            if parent and hasattr(parent, 'reload_all'):
-                # This is a TabTaskTreeWidget within a TaskTabWidget
-                # Use a short timer to let the current operation complete first
-                debug.debug("Scheduling reload of all tabs")
-                from PyQt6.QtCore import QTimer
-                QTimer.singleShot(100, parent.reload_all)
+            # Move the task under its new priority header if we're in a tabbed interface
+            debug.debug("Applying priority change to tabs")
+            self._refresh_tasks_in_tabs([item.task_id])
                 
         except Exception as e:
             debug.error(f"Error changing task priority: {e}")
@@ -792,42 +808,29 @@ class TaskTreeWidget(QTreeWidget):
                 from database.memory_db_manager import get_memory_db_manager
                 db_manager = get_memory_db_manager()
                 
-                # Delete the item and all its children
-                def delete_item_and_children(task_id):
-                    # First get all children
-                    debug.debug(f"Getting children of task {task_id}")
-                    children = db_manager.execute_query(
-                        "SELECT id FROM tasks WHERE parent_id = ?", 
-                        (task_id,)
-                    )
-                    # Delete children recursively
-                    for child in children:
-                        debug.debug(f"Recursively deleting child task {child[0]}")
-                        delete_item_and_children(child[0])
-                    # Delete this item
-                    debug.debug(f"Deleting task {task_id}")
-                    db_manager.execute_update(
-                        "DELETE FROM tasks WHERE id = ?", 
-                        (task_id,)
-                    )
-                
-                delete_item_and_children(item.task_id)
-                debug.debug("Task and all children deleted from database")
-                
-                # THIS IS THE CRITICAL PART - Explicitly save changes to file
-                debug.debug("Explicitly saving memory database to file")
-                db_manager.save_to_file()
-                debug.debug("Database saved to file after deletion")
-                
-                # Remove from tree
-                parent = item.parent()
-                if parent:
-                    debug.debug("Removing task from parent")
-                    parent.removeChild(item)
-                else:
-                    debug.debug("Removing top-level task")
-                    index = self.indexOfTopLevelItem(item)
-                    self.takeTopLevelItem(index)
+                # Delete the item and all its children in one transaction
+                conn = db_manager.get_connection()
+                deleted_ids = [item.task_id] + get_descendant_ids(conn, item.task_id)
+                delete_subtree(conn, item.task_id)
+                debug.debug(f"Task and {len(deleted_ids) - 1} descendants deleted from database")
+                
+                # Persist the deletion - written to file in the background
+                debug.debug("Scheduling memory database save after deletion")
+                mark_database_dirty()
+                
+                # Remove the subtree from every tab, or just from this tree.
+                # The tabs find the items through the task index, so it is
+                # only cleared once they are detached.
+                if not self._refresh_tasks_in_tabs(deleted_ids):
+                    parent = item.parent()
+                    if parent:
+                        debug.debug("Removing task from parent")
+                        parent.removeChild(item)
+                    else:
+                        debug.debug("Removing top-level task")
+                        index = self.indexOfTopLevelItem(item)
+                        self.takeTopLevelItem(index)
+                    self._forget_task_items(deleted_ids)
                 debug.debug("Task removed from UI")
                 
             except Exception as e:
@@ -836,72 +839,25 @@ class TaskTreeWidget(QTreeWidget):
                         
     def _scroll_to_task(self, task_id):
         """Find a task by ID and scroll to it"""
-        debug.debug(f"Attempting to scroll to task: {task_id}")
-        try:
-            # Try to find the task in the tree
-            for i in range(self.topLevelItemCount()):
-                top_item = self.topLevelItem(i)
-                
-                # Check if this is a priority header
-                top_data = top_item.data(0, Qt.ItemDataRole.UserRole)
-                if isinstance(top_data, dict) and top_data.get('is_priority_header', False):
-                    # Search in children of this header
-                    debug.debug(f"Searching in priority header: {top_data.get('priority', 'Unknown')}")
-                    for j in range(top_item.childCount()):
-                        child_item = top_item.child(j)
-                        if hasattr(child_item, 'task_id') and child_item.task_id == task_id:
-                            # Found it! Scroll to it
-                            debug.debug(f"Found task in priority header, scrolling to it")
-                            self.scrollToItem(child_item)
-                            self.setCurrentItem(child_item)
-                            return True
-                        
-                        # Check for grandchildren
-                        if self._find_and_scroll_to_child(child_item, task_id):
-                            return True
-                
-                # Could also be a direct top-level task
-                elif hasattr(top_item, 'task_id') and top_item.task_id == task_id:
-                    # Found it! Scroll to it
-                    debug.debug(f"Found task as top-level item, scrolling to it")
-                    self.scrollToItem(top_item)
-                    self.setCurrentItem(top_item)
-                    return True
-                    
-            debug.debug(f"Task {task_id} not found for scrolling")
-            return False
-        except Exception as e:
-            debug.error(f"Error scrolling to task: {e}")
+        debug.debug("Attempting to scroll to task: %s", task_id)
+        item = self._fetched_task_item(task_id)
+        if item is None:
+            debug.debug("Task %s not found for scrolling", task_id)
             return False
+        self.scrollToItem(item)
+        self.setCurrentItem(item)
+        return True
 
     @debug_method
     def _update_children_priorities(self, parent_id, new_priority, db_manager):
-        """Recursively update priorities of all children to match parent's priority"""
+        """Update priorities of all descendants to match parent's priority"""
         debug.debug(f"Updating priorities for children of task {parent_id}")
         
         try:
-            # Get all direct children
-            children = db_manager.execute_query(
-                "SELECT id, title FROM tasks WHERE parent_id = ?",
-                (parent_id,)
-            )
-            
-            for child_row in children:
-                child_id = child_row[0]
-                child_title = child_row[1]
-                debug.debug(f"Updating child task {child_id} '{child_title}' to priority: {new_priority}")
-                print('Updaging child task', child_id, child_title, 'to priority:', new_priority)
-                # Update this child's priority
-                db_manager.execute_update(
-                    "UPDATE tasks SET priority = ? WHERE id = ?",
-                    (new_priority, child_id)
-                )
-                
-                # Recursively update this child's children
-                self._update_children_priorities(child_id, new_priority, db_manager)
-            
-            debug.debug(f"Updated priorities for {len(children)} children of task {parent_id}")
-            print('Updated priorities for', len(children), 'children of task', parent_id)
+            # One recursive UPDATE covers the whole subtree
+            updated = set_subtree_priority(db_manager.get_connection(), parent_id, new_priority, include_root=False)
+            debug.debug(f"Updated priorities for {updated} descendants of task {parent_id}")
+            mark_database_dirty()
         except Exception as e:
             debug.error(f"Error updating children priorities: {e}")
             import traceback
@@ -913,237 +869,321 @@ class TaskTreeWidget(QTreeWidget):
         debug.debug("=== DRAG & DROP EVENT START ===")
         debug.debug(f"Drop position: {event.position().x()}, {event.position().y()}")
 
-        # Save the dragged item BEFORE calling super().dropEvent()
         dragged_item = self.currentItem()
         if not dragged_item or not hasattr(dragged_item, 'task_id'):
             debug.debug("No valid dragged item with task_id, canceling drop")
             event.ignore()
             return
 
-        dragged_id = dragged_item.task_id
-        dragged_title = dragged_item.text(0)
-        debug.debug(f"Dragged item: ID={dragged_id}, Title='{dragged_title}'")
+        debug.debug(f"Dragged item: ID={dragged_item.task_id}, Title='{dragged_item.text(0)}'")
 
         # Get the drop target information
-        drop_pos = event.position().toPoint()
-        drop_index = self.indexAt(drop_pos)
-        drop_item = self.itemAt(drop_pos) if drop_index.isValid() else None
-        
-        # Log drop target information
-        drop_is_header = False
-        drop_target_id = None
-        if drop_item:
-            drop_data = drop_item.data(0, Qt.ItemDataRole.UserRole)
-            
-            if isinstance(drop_data, dict) and drop_data.get('is_priority_header', False):
-                drop_is_header = True
-                priority = drop_data.get('priority', 'Unknown')
-                debug.debug(f"Drop target is priority header: '{priority}'")
-            elif hasattr(drop_item, 'task_id'):
-                drop_target_id = drop_item.task_id
-                drop_title = drop_item.text(0)
-                debug.debug(f"Drop target task: ID={drop_target_id}, Title='{drop_title}'")
-            else:
-                debug.debug(f"Drop target is unknown type: {drop_item}")
-        else:
+        drop_item = self.itemAt(event.position().toPoint())
+        if drop_item is None:
             debug.debug("Drop target is empty space (no item)")
+        elif hasattr(drop_item, 'task_id'):
+            debug.debug(f"Drop target task: ID={drop_item.task_id}, Title='{drop_item.text(0)}'")
+        else:
+            debug.debug(f"Drop target is priority header: '{drop_item.text(0)}'")
+
+        self._drop_task(dragged_item, drop_item)
+
+        # The model was rearranged by _drop_task, so the drag must not remove
+        # the source row the way a plain move would
+        event.setDropAction(Qt.DropAction.IgnoreAction)
+        event.accept()
+        self.setState(QAbstractItemView.State.NoState)
+        self.viewport().update()
+        debug.debug("=== DRAG & DROP EVENT END ===")
+
+    def _drop_task(self, dragged_item, drop_item):
+        """Move dragged_item to the end of the task or priority header it was dropped on.
+
+        Dropping on empty space moves it back to the top level, under its
+        priority header if the tree has them. The new parent, subtree
+        priority and sibling order are written in one transaction; returns
+        whether the task was moved.
+        """
+        dragged_id = dragged_item.task_id
+        container = drop_item
+        if container is None:
+            container = dragged_item
+            while container.parent() is not None:
+                container = container.parent()
+            if hasattr(container, 'task_id'):
+                container = self.invisibleRootItem()
+        
+        if container is dragged_item or self._is_descendant(container, dragged_item):
+            debug.debug(f"Cannot drop task {dragged_id} into its own subtree")
+            return False
         
-        # Save expanded states before the drop
-        expanded_items = self._save_expanded_states()
-        debug.debug(f"Saved expanded states for {len(expanded_items)} items")
-        
-        # Log tree structure before drop
-        debug.debug("--- Tree structure before drop ---")
-        self._debug_tree_structure()
-        
-        # First, let Qt handle the visual drop
-        debug.debug("Letting Qt handle the visual drop")
-        super().dropEvent(event)
-        
-        # Log tree structure after Qt's handling
-        debug.debug("--- Tree structure after Qt handling ---")
-        self._debug_tree_structure()
-        
-        # IMPORTANT: We need to find the dragged item again after Qt's handling
-        # since currentItem() might have changed
-        dragged_item = self._find_task_item_by_id(dragged_id)
+        # Remember expanded states before the drop
+        expanded_items = self.expanded_task_ids()
         
-        if not dragged_item:
-            debug.debug(f"ERROR: Could not find dragged item with ID {dragged_id} after drop")
-            return
+        # The task goes after all of its new siblings, fetched or not. Root
+        # display orders are not rewritten, so the root is not fetched for it.
+        root = self.invisibleRootItem()
+        if container is not root:
+            self.model().fetch(container)
+        self.model().move_item(dragged_item, container)
         
-        debug.debug(f"Found dragged item after drop: {dragged_item.text(0)}")
+        parent_id = getattr(container, 'task_id', None)
+        debug.debug(f"Moved task {dragged_id} under {container.text(0) or 'the top level'}")
         
-        # Now update database to match the visual state
         try:
             # Get database manager
-            from database.memory_db_manager import get_memory_db_manager
             db_manager = get_memory_db_manager()
             
-            # Get the new parent after the drop
-            new_parent = dragged_item.parent()
-            
-            # Determine parent_id for database update
-            parent_id = None
-            if new_parent:
-                if hasattr(new_parent, 'task_id'):
-                    parent_id = new_parent.task_id
-                    debug.debug(f"New parent has task_id: {parent_id}")
-                else:
-                    # Check if this is a priority header
-                    new_parent_data = new_parent.data(0, Qt.ItemDataRole.UserRole)
-                    if isinstance(new_parent_data, dict) and new_parent_data.get('is_priority_header', False):
-                        priority = new_parent_data.get('priority', 'Unknown')
-                        debug.debug(f"New parent is priority header: '{priority}'")
-                    else:
-                        debug.debug(f"New parent has no task_id and is not a priority header: {new_parent.text(0)}")
-            else:
-                debug.debug("Task is now a top-level item (no parent)")
-            
-            # If we dropped on a specific task but Qt didn't make it a child, fix it
-            if drop_target_id and not drop_is_header and (not parent_id or parent_id != drop_target_id):
-                debug.debug(f"Qt didn't establish correct parent-child relationship, fixing manually")
-                
-                # Remove the item from its current parent
-                if new_parent:
-                    idx = new_parent.indexOfChild(dragged_item)
-                    if idx >= 0:
-                        new_parent.takeChild(idx)
-                else:
-                    idx = self.indexOfTopLevelItem(dragged_item)
-                    if idx >= 0:
-                        self.takeTopLevelItem(idx)
-                
-                # Find the target item again and add as a child
-                target_item = self._find_task_item_by_id(drop_target_id)
-                if target_item:
-                    target_item.addChild(dragged_item)
-                    parent_id = drop_target_id  # Update parent_id for database
-                    debug.debug(f"Manually added item as child of {drop_target_id}")
-                else:
-                    debug.debug(f"ERROR: Could not find target item with ID {drop_target_id}")
-            
-            # Update the database to reflect the new parent-child relationship
-            debug.debug(f"Updating database: task {dragged_id} → parent {parent_id}")
-            db_manager.execute_update(
-                "UPDATE tasks SET parent_id = ? WHERE id = ?", 
-                (parent_id, dragged_id)
-            )
-            
-            # If parent has a priority, update this task's priority to match
-            if parent_id is not None:
-                # Get parent priority from database
-                result = db_manager.execute_query(
-                    "SELECT priority FROM tasks WHERE id = ?", 
-                    (parent_id,)
-                )
-                if result and len(result) > 0 and result[0][0]:
-                    parent_priority = result[0][0]
-                    debug.debug(f"Updating task priority to match parent: {parent_priority}")
-                    db_manager.execute_update(
-                        "UPDATE tasks SET priority = ? WHERE id = ?",
-                        (parent_priority, dragged_id)
+            # Parent, subtree priority and sibling order change together or not at all
+            with transaction(db_manager) as uow:
+                # The moved subtree takes the priority of its new parent task or header
+                new_priority = None
+                if parent_id is not None:
+                    # Get parent priority from database
+                    result = uow.execute_query(
+                        "SELECT priority FROM tasks WHERE id = ?", 
+                        (parent_id,)
                     )
-                    
-                    # Also update all children recursively
-                    self._update_children_priorities(dragged_id, parent_priority, db_manager)
-            
-            # If we're dropping to a priority header (top level), update the priority too
-            elif new_parent and not hasattr(new_parent, 'task_id'):
-                new_parent_data = new_parent.data(0, Qt.ItemDataRole.UserRole)
-                if isinstance(new_parent_data, dict) and new_parent_data.get('is_priority_header', False):
-                    new_priority = new_parent_data.get('priority', '')
-                    if new_priority:
-                        debug.debug(f"Setting task priority to match header: {new_priority}")
-                        db_manager.execute_update(
-                            "UPDATE tasks SET priority = ? WHERE id = ?",
-                            (new_priority, dragged_id)
-                        )
-                        
-                        # Also update all children recursively
-                        self._update_children_priorities(dragged_id, new_priority, db_manager)
-            
-            # Force a save to the database file after drag and drop operations
-            debug.debug("Saving memory database to file after drag and drop")
-            db_manager.save_to_file()
-            
-            # Update the display orders in the database
-            if new_parent:
-                debug.debug(f"Updating display orders for parent")
-                self._update_display_orders(new_parent)
-            
-            # Reload all tabs to ensure consistency
-            debug.debug("Scheduling reload of all tabs")
-            parent = self.parent()
-            while parent and not hasattr(parent, 'reload_all'):
-                parent = parent.parent()
-                
-            if parent and hasattr(parent, 'reload_all'):
-                # Use a short timer to let the current operation complete first
-                from PyQt6.QtCore import QTimer
-                QTimer.singleShot(100, parent.reload_all)
+                    if result and len(result) > 0 and result[0][0]:
+                        new_priority = result[0][0]
+                        debug.debug(f"Updating subtree priority to match parent: {new_priority}")
+                
+                # If we're dropping to a priority header (top level), update the priority too
+                elif container is not root:
+                    container_data = container.data(0, Qt.ItemDataRole.UserRole)
+                    if isinstance(container_data, dict) and container_data.get('is_priority_header', False):
+                        new_priority = container_data.get('priority', '') or None
+                        debug.debug(f"Setting subtree priority to match header: {new_priority}")
+                
+                debug.debug(f"Updating database: task {dragged_id} → parent {parent_id}")
+                reparent_task(uow.connection, dragged_id, parent_id, new_priority)
+                
+                # Update the display orders in the database
+                if container is not root:
+                    debug.debug(f"Updating display orders for parent")
+                    self._update_display_orders(container, moved_id=dragged_id)
+            
+            # Schedule a save to the database file after drag and drop operations
+            debug.debug("Scheduling memory database save after drag and drop")
+            mark_database_dirty()
+            
+            # Sync the moved subtree into every tab
+            # Use a short timer to let the current operation complete first
+            debug.debug("Scheduling incremental refresh of the dropped task")
+            QTimer.singleShot(100, lambda task_id=dragged_id: self._refresh_tasks_in_tabs([task_id]))
             
         except Exception as e:
             debug.error(f"Error updating database after drop: {e}")
             import traceback
             traceback.print_exc()
-            from PyQt6.QtWidgets import QMessageBox
             QMessageBox.critical(self, "Error", f"Failed to update task hierarchy: {str(e)}")
+            
+            # The transaction rolled back, so put the task back where the database has it
+            if not self._refresh_tasks_in_tabs([dragged_id]):
+                self.load_tasks_tree()
+                self._restore_expanded_states(expanded_items)
         
-        debug.debug("=== DRAG & DROP EVENT END ===")
+        return True
+
+    def clear(self):
+        """Remove all items, and forget them in the task index"""
+        self._items_by_id.clear()
+        self._fetched_compact = None
+        self.model().clear()
+
+    def invisibleRootItem(self):
+        return self.model().invisible_root()
+
+    def topLevelItem(self, index):
+        return self.invisibleRootItem().child(index)
+
+    def topLevelItemCount(self):
+        return self.invisibleRootItem().childCount()
+
+    def addTopLevelItem(self, item):
+        self.invisibleRootItem().addChild(item)
+
+    def insertTopLevelItem(self, index, item):
+        self.invisibleRootItem().insertChild(index, item)
+
+    def takeTopLevelItem(self, index):
+        return self.invisibleRootItem().takeChild(index)
+
+    def indexOfTopLevelItem(self, item):
+        return self.invisibleRootItem().indexOfChild(item)
+
+    def itemFromIndex(self, index):
+        return self.model().item_from_index(index)
+
+    def indexFromItem(self, item, column=0):
+        return self.model().index_for_item(item)
+
+    def itemAt(self, position):
+        return self.itemFromIndex(self.indexAt(position))
+
+    def currentItem(self):
+        return self.itemFromIndex(self.currentIndex())
+
+    def setCurrentItem(self, item):
+        self.setCurrentIndex(self.indexFromItem(item))
+
+    def selectedItems(self):
+        items = (self.itemFromIndex(index) for index in self.selectionModel().selectedIndexes())
+        return [item for item in items if item is not None]
+
+    def scrollToItem(self, item, hint=QAbstractItemView.ScrollHint.EnsureVisible):
+        self.scrollTo(self.indexFromItem(item), hint)
+
+    def visualItemRect(self, item):
+        return self.visualRect(self.indexFromItem(item))
+
+    def expandItem(self, item):
+        index = self.indexFromItem(item)
+        if not index.isValid():
+            return
+        # Fetch first, so the children exist even if item is not laid out yet
+        if item.childCount() == 0 and self.model().canFetchMore(index):
+            self.model().fetchMore(index)
+        self.expand(index)
+
+    def collapseItem(self, item):
+        self.collapse(self.indexFromItem(item))
+
+    def _emit_item_expanded(self, index):
+        item = self.itemFromIndex(index)
+        if item is not None:
+            self.itemExpanded.emit(item)
+
+    def _emit_item_collapsed(self, index):
+        item = self.itemFromIndex(index)
+        if item is not None:
+            self.itemCollapsed.emit(item)
+
+    def _emit_item_double_clicked(self, index):
+        item = self.itemFromIndex(index)
+        if item is not None:
+            self.itemDoubleClicked.emit(item, index.column())
+
+    def _create_fetched_items(self, rows):
+        """Build the items for task rows the model is fetching, with their links and files"""
+        links_by_task, files_by_task = {}, {}
+        try:
+            links_by_task, files_by_task = get_task_attachments(
+                get_memory_db_manager().get_connection(), [row[0] for row in rows]
+            )
+        except Exception as e:
+            debug.error(f"Error bulk loading links and files: {e}")
+
+        items = []
+        for row in rows:
+            # toggle_view_mode also covers tasks that were not fetched yet
+            is_compact = row[8] if self._fetched_compact is None else self._fetched_compact
+            items.append(self.add_task_item(
+                row[0], row[1], row[2], '', row[4], row[5], row[6], row[7], is_compact,
+                links=links_by_task.get(row[0], []),
+                files=files_by_task.get(row[0], [])
+            ))
+        return items
+
+    def _expand_fetched_items(self, items):
+        """Expand just-fetched tasks that are expanded in the stored state"""
+        expanded_ids = get_expanded_state_store().expanded_ids(self._expanded_tab())
+        to_expand = [item for item in items
+                     if getattr(item, 'task_id', None) in expanded_ids and item.has_children()]
+        if not to_expand:
+            return
+        original_state = self.signalsBlocked()
+        self.blockSignals(True)
+        try:
+            for item in to_expand:
+                self.expandItem(item)
+        finally:
+            self.blockSignals(original_state)
+
+    def _index_tasks(self, tasks, top_level_holder):
+        """Index task rows in the model to be fetched later, instead of building items.
+
+        top_level_holder(row) gives the item a top-level task goes under (a
+        priority header or the root), or None to leave it out. Tasks whose
+        parent is not in tasks are left out, as are their subtrees.
+        """
+        rows_by_parent = {}
+        for row in tasks:
+            rows_by_parent.setdefault(row[9], []).append(row)
+
+        model = self.model()
+        for row in rows_by_parent.get(None, []):
+            holder = top_level_holder(row)
+            if holder is not None:
+                model.add_unfetched_rows(holder, [row], rows_by_parent)
+
+    def _schedule_visible_fetch(self, *args):
+        if not self._visible_fetch_scheduled:
+            self._visible_fetch_scheduled = True
+            QTimer.singleShot(0, self._fetch_visible_rows)
+
+    def _fetch_visible_rows(self):
+        """Fetch the next batch under the root or an expanded priority header
+        whose fetched rows end inside the viewport"""
+        self._visible_fetch_scheduled = False
+        model = self.model()
+        bottom = self.viewport().rect().bottom()
+        containers = [self.invisibleRootItem()] + [self.topLevelItem(i) for i in range(self.topLevelItemCount())]
+        for container in containers:
+            index = self.indexFromItem(container)
+            if hasattr(container, 'task_id') or not model.canFetchMore(index):
+                continue
+            if index.isValid() and not self.isExpanded(index):
+                continue
+            last = container.child(container.childCount() - 1)
+            if last is None or self.visualItemRect(last).top() <= bottom:
+                model.fetchMore(index)
+
+    def _task_item(self, task_id):
+        """The item showing task_id in this tree, or None"""
+        item = self._items_by_id.get(task_id)
+        if item is None:
+            return None
+        try:
+            # Items taken out of the tree (or deleted by Qt) are not shown
+            return item if item.treeWidget() is self else None
+        except RuntimeError:
+            del self._items_by_id[task_id]
+            return None
+
+    def _fetched_task_item(self, task_id):
+        """The item showing task_id, fetching it (and its ancestors) if it was not fetched yet"""
+        item = self._task_item(task_id)
+        if item is None:
+            item = self.model().fetch_to(task_id)
+        return item
+
+    def _forget_task_items(self, task_ids):
+        """Drop removed tasks from the task index"""
+        for task_id in task_ids:
+            self._items_by_id.pop(task_id, None)
+
+    def _is_descendant(self, item, ancestor):
+        """Whether item is somewhere below ancestor"""
+        parent = item.parent()
+        while parent is not None:
+            if parent is ancestor:
+                return True
+            parent = parent.parent()
+        return False
 
-    # Add a method to find a task by its ID
-    @debug_method
     def _find_task_item_by_id(self, task_id):
         """Find a task item by its ID anywhere in the tree"""
-        debug.debug(f"Searching for task with ID: {task_id}")
-        
-        # Search in all top-level items
-        for i in range(self.topLevelItemCount()):
-            top_item = self.topLevelItem(i)
-            
-            # Check if this is a priority header (search its children)
-            top_data = top_item.data(0, Qt.ItemDataRole.UserRole)
-            if isinstance(top_data, dict) and top_data.get('is_priority_header', False):
-                # Search all children of this header
-                for j in range(top_item.childCount()):
-                    child = top_item.child(j)
-                    
-                    # Check if this is the item we're looking for
-                    if hasattr(child, 'task_id') and child.task_id == task_id:
-                        debug.debug(f"Found task {task_id} under priority header")
-                        return child
-                    
-                    # Check children of this task recursively
-                    found = self._find_child_task_by_id(child, task_id)
-                    if found:
-                        return found
-                        
-            # Check if this is a top-level task
-            elif hasattr(top_item, 'task_id') and top_item.task_id == task_id:
-                debug.debug(f"Found task {task_id} as top-level item")
-                return top_item
-        
-        debug.debug(f"Task {task_id} not found in tree")
-        return None
+        item = self._task_item(task_id)
+        if item is None:
+            debug.debug("Task %s not found in tree", task_id)
+        return item
 
-    @debug_method
     def _find_child_task_by_id(self, parent_item, task_id):
-        """Recursively search for a child task with the given ID"""
-        # Go through all children
-        for i in range(parent_item.childCount()):
-            child = parent_item.child(i)
-            
-            # Check if this is the task we're looking for
-            if hasattr(child, 'task_id') and child.task_id == task_id:
-                debug.debug(f"Found task {task_id} as child")
-                return child
-            
-            # Recursively check this child's children
-            found = self._find_child_task_by_id(child, task_id)
-            if found:
-                return found
-        
+        """Find a task with the given ID below parent_item"""
+        item = self._task_item(task_id)
+        if item is not None and self._is_descendant(item, parent_item):
+            return item
         return None
 
     @debug_method
@@ -1220,58 +1260,33 @@ class TaskTreeWidget(QTreeWidget):
             QTimer.singleShot(150, lambda tid=task_id: self._scroll_to_task(tid))
 
     def _find_and_scroll_to_child(self, parent_item, task_id):
-        """Recursively search for a child and scroll to it if found"""
-        try:
-            for i in range(parent_item.childCount()):
-                child_item = parent_item.child(i)
-                
-                if hasattr(child_item, 'task_id') and child_item.task_id == task_id:
-                    # Found it! Scroll to it
-                    debug.debug(f"Found task in children, scrolling to it")
-                    self.scrollToItem(child_item)
-                    self.setCurrentItem(child_item)
-                    return True
-                    
-                # Check grandchildren
-                if self._find_and_scroll_to_child(child_item, task_id):
-                    return True
-                    
-            return False
-        except Exception as e:
-            debug.error(f"Error in _find_and_scroll_to_child: {e}")
+        """Scroll to a task below parent_item, if it is there"""
+        item = self._find_child_task_by_id(parent_item, task_id)
+        if item is None:
             return False
+        self.scrollToItem(item)
+        self.setCurrentItem(item)
+        return True
 
     def _update_children_priority(self, parent_item, new_priority):
         """Update all children with the parent's priority"""
         debug.debug(f"Updating children to priority: {new_priority}")
         try:
             # Get database manager
-            from database.database_manager import get_db_manager
-            db_manager = get_db_manager()
+            db_manager = get_memory_db_manager()
             
-            # First, collect all child task IDs to update
-            child_task_ids = []
-            self._collect_child_task_ids(parent_item, child_task_ids)
+            # Update all descendants in one database operation
+            updated = set_subtree_priority(db_manager.get_connection(), parent_item.task_id,
+                                           new_priority, include_root=False)
+            if updated:
+                mark_database_dirty()
             
             # If no children, just return
-            if not child_task_ids:
+            if not updated:
                 debug.debug("No children found to update")
                 return
-                
-            # Update all children in one database operation
-            debug.debug(f"Updating {len(child_task_ids)} children")
-            for task_id in child_task_ids:
-                # Update child priority in database
-                db_manager.execute_update(
-                    """
-                    UPDATE tasks 
-                    SET priority = ?
-                    WHERE id = ?
-                    """, 
-                    (new_priority, task_id)
-                )
             
-            debug.debug(f"Updated priority for {len(child_task_ids)} children to: {new_priority}")
+            debug.debug(f"Updated priority for {updated} children to: {new_priority}")
             
             # Force a tree reload instead of trying to update UI directly
             debug.debug("Reloading tree to reflect changes")
@@ -1309,6 +1324,24 @@ class TaskTreeWidget(QTreeWidget):
             debug.warning("RuntimeError during child collection - item may have been deleted")
             pass
             
+    def _refresh_tasks_in_tabs(self, task_ids):
+        """Push changes to the given tasks into every tab without a full reload.
+        
+        Returns False when this tree is not hosted in a TaskTabWidget so the
+        caller can fall back to reloading itself.
+        """
+        parent = self.parent()
+        while parent and not hasattr(parent, 'refresh_tasks'):
+            parent = parent.parent()
+        
+        if parent and hasattr(parent, 'refresh_tasks'):
+            debug.debug(f"Refreshing tasks {task_ids} in all tabs")
+            parent.refresh_tasks(task_ids)
+            return True
+        
+        debug.debug("Tab parent not found for incremental refresh")
+        return False
+            
     def force_reload_tabs(self):
         """Force reload of all tabs"""
         debug.debug("Forcing reload of all tabs")
@@ -1336,10 +1369,6 @@ class TaskTreeWidget(QTreeWidget):
         """Edit a task while preserving expanded states"""
         debug.debug(f"Editing task: {item.text(0)}")
         
-        # Save expanded states before editing
-        expanded_items = self._save_expanded_states()
-        debug.debug(f"Saved {len(expanded_items)} expanded states before editing")
-        
         # Rest of your original edit_task method...
         from .task_dialogs import EditTaskDialog
         
@@ -1461,100 +1490,105 @@ class TaskTreeWidget(QTreeWidget):
                             category_id = result[0][0]
                             debug.debug(f"Found category ID: {category_id}")
                     
-                    # Update database using execute_update from memory_db_manager
-                    debug.debug("Updating task in database")
-                    db_manager.execute_update(
-                        """
-                        UPDATE tasks 
-                        SET title = ?, description = ?, status = ?, 
-                            priority = ?, due_date = ?, category_id = ?, parent_id = ?
-                        WHERE id = ?
-                        """, 
-                        (
-                            updated_data['title'], 
-                            updated_data['description'], 
-                            updated_data['status'], 
-                            updated_data['priority'],
-                            updated_data['due_date'],
-                            category_id,
-                            updated_data['parent_id'],
-                            updated_data['id']
+                    # Save the task, its links and its files as one unit of work, so a
+                    # failure part way through leaves the task exactly as it was
+                    with transaction(db_manager) as uow:
+                        debug.debug("Updating task in database")
+                        uow.execute_update(
+                            """
+                            UPDATE tasks 
+                            SET title = ?, description = ?, status = ?, 
+                                priority = ?, due_date = ?, category_id = ?, parent_id = ?
+                            WHERE id = ?
+                            """, 
+                            (
+                                updated_data['title'], 
+                                updated_data['description'], 
+                                updated_data['status'], 
+                                updated_data['priority'],
+                                updated_data['due_date'],
+                                category_id,
+                                updated_data['parent_id'],
+                                updated_data['id']
+                            )
                         )
-                    )
-                    
-                    # Update links - use specialized methods from memory_db_manager
-                    debug.debug("Updating links")
-                    new_links = updated_data.get('links', [])
-                    existing_links = db_manager.get_task_links(updated_data['id'])
-                    
-                    # Track existing link IDs for deletion
-                    existing_ids = set(link_id for link_id, _, _ in existing_links if link_id is not None)
-                    new_link_ids = set(link_id for link_id, _, _ in new_links if link_id is not None)
-                    
-                    # Delete links that no longer exist
-                    links_to_delete = existing_ids - new_link_ids
-                    if links_to_delete:
-                        debug.debug(f"Deleting {len(links_to_delete)} links")
-                        for link_id in links_to_delete:
-                            db_manager.delete_task_link(link_id)
-                    
-                    # Add or update links
-                    debug.debug(f"Adding/updating {len(new_links)} links")
-                    for i, (link_id, url, label) in enumerate(new_links):
-                        if url and url.strip():
-                            if link_id is None:
-                                # New link - add it
-                                debug.debug(f"Adding new link: {url}")
-                                db_manager.add_task_link(updated_data['id'], url, label)
-                            else:
-                                # Existing link - update it
-                                debug.debug(f"Updating existing link: {link_id}")
-                                db_manager.update_task_link(link_id, url, label)
-                    
-                    # Update files - use specialized methods from memory_db_manager
-                    debug.debug("Updating files")
-                    new_files = updated_data.get('files', [])
-                    existing_files = db_manager.get_task_files(updated_data['id'])
-                    
-                    # Track existing file IDs for deletion
-                    existing_file_ids = set(file_id for file_id, _, _ in existing_files if file_id is not None)
-                    new_file_ids = set(file_id for file_id, _, _ in new_files if file_id is not None)
-                    
-                    # Delete files that no longer exist
-                    files_to_delete = existing_file_ids - new_file_ids
-                    if files_to_delete:
-                        debug.debug(f"Deleting {len(files_to_delete)} files")
-                        for file_id in files_to_delete:
-                            db_manager.delete_task_file(file_id)
-                    
-                    # Add or update files
-                    debug.debug(f"Adding/updating {len(new_files)} files")
-                    for i, (file_id, file_path, file_name) in enumerate(new_files):
-                        if file_path and file_path.strip():
-                            if file_id is None:
-                                # New file - add it
-                                debug.debug(f"Adding new file: {file_path}")
-                                db_manager.add_task_file(updated_data['id'], file_path, file_name)
-                            else:
-                                # Existing file - update it
-                                debug.debug(f"Updating existing file: {file_id}")
-                                db_manager.update_task_file(file_id, file_path, file_name)
+                        
+                        # Update links
+                        debug.debug("Updating links")
+                        new_links = updated_data.get('links', [])
+                        existing_ids = set(row[0] for row in uow.execute_query(
+                            "SELECT id FROM links WHERE task_id = ?", (updated_data['id'],)
+                        ))
+                        new_link_ids = set(link_id for link_id, _, _ in new_links if link_id is not None)
+                        
+                        # Delete links that no longer exist
+                        links_to_delete = existing_ids - new_link_ids
+                        if links_to_delete:
+                            debug.debug("Deleting %d links", len(links_to_delete))
+                            uow.execute_many("DELETE FROM links WHERE id = ?",
+                                             [(link_id,) for link_id in links_to_delete])
+                        
+                        # Add or update links, keeping the order shown in the dialog
+                        debug.debug("Adding/updating %d links", len(new_links))
+                        for i, (link_id, url, label) in enumerate(new_links):
+                            if url and url.strip():
+                                if link_id is None:
+                                    debug.debug("Adding new link: %s", url)
+                                    uow.execute_update(
+                                        "INSERT INTO links (task_id, url, label, display_order) VALUES (?, ?, ?, ?)",
+                                        (updated_data['id'], url, label, i)
+                                    )
+                                else:
+                                    debug.debug("Updating existing link: %s", link_id)
+                                    uow.execute_update(
+                                        "UPDATE links SET url = ?, label = ?, display_order = ? WHERE id = ?",
+                                        (url, label, i, link_id)
+                                    )
+                        
+                        # Update files
+                        debug.debug("Updating files")
+                        new_files = updated_data.get('files', [])
+                        existing_file_ids = set(row[0] for row in uow.execute_query(
+                            "SELECT id FROM files WHERE task_id = ?", (updated_data['id'],)
+                        ))
+                        new_file_ids = set(file_id for file_id, _, _ in new_files if file_id is not None)
+                        
+                        # Delete files that no longer exist
+                        files_to_delete = existing_file_ids - new_file_ids
+                        if files_to_delete:
+                            debug.debug("Deleting %d files", len(files_to_delete))
+                            uow.execute_many("DELETE FROM files WHERE id = ?",
+                                             [(file_id,) for file_id in files_to_delete])
+                        
+                        # Add or update files
+                        debug.debug("Adding/updating %d files", len(new_files))
+                        for i, (file_id, file_path, file_name) in enumerate(new_files):
+                            if file_path and file_path.strip():
+                                if file_id is None:
+                                    debug.debug("Adding new file: %s", file_path)
+                                    uow.execute_update(
+                                        "INSERT INTO files (task_id, file_path, file_name, display_order) VALUES (?, ?, ?, ?)",
+                                        (updated_data['id'], file_path, file_name, i)
+                                    )
+                                else:
+                                    debug.debug("Updating existing file: %s", file_id)
+                                    uow.execute_update(
+                                        "UPDATE files SET file_path = ?, file_name = ?, display_order = ? WHERE id = ?",
+                                        (file_path, file_name, i, file_id)
+                                    )
                     
-                    # Explicitly save to file after editing task
-                    debug.debug("Saving memory database to file after task edit")
-                    db_manager.save_to_file()
+                    # Schedule a save to file after editing task
+                    debug.debug("Scheduling memory database save after task edit")
+                    mark_database_dirty()
                     
-                    # Reload the tree and restore expanded states
-                    if hasattr(self, 'load_tasks_tab'):
-                        debug.debug("Reloading tasks with filtered method")
-                        self.load_tasks_tab()
-                    else:
+                    # Apply the edit to the affected items in every tab
+                    if not self._refresh_tasks_in_tabs([task_id]):
+                        # Not in a tabbed interface - reload the tree and restore expanded states
+                        expanded_items = self.expanded_task_ids()
                         debug.debug("Reloading tasks with standard method")
                         self.load_tasks_tree()
-                    
-                    # Restore expanded states
-                    self._restore_expanded_states(expanded_items)
-                    debug.debug(f"Restored {len(expanded_items)} expanded states")
+                        self._restore_expanded_states(expanded_items)
+                        debug.debug(f"Restored {len(expanded_items)} expanded states")
                     
                     # Highlight the edited task
                     self._highlight_task(task_id)
@@ -1585,9 +1619,9 @@ class TaskTreeWidget(QTreeWidget):
             debug.error(f"Error getting settings manager from parent: {e}")
         
         # Fallback to creating a new instance
-        debug.debug("Creating new SettingsManager instance")
-        from ui.app_settings import SettingsManager
-        return SettingsManager()
+        debug.debug("Using shared SettingsManager instance")
+        from ui.app_settings import get_settings_manager
+        return get_settings_manager()
 
     @staticmethod
     def get_connection():
@@ -2091,9 +2125,9 @@ class TaskTreeWidget(QTreeWidget):
         start_time = time.time()
         
         try:
-            # Save the expanded states before clearing
-            expanded_items = self._save_expanded_states()
-            debug.debug(f"Saved expanded states for {len(expanded_items)} items")
+            # Remember the expanded states before clearing
+            expanded_items = self.expanded_task_ids()
+            debug.debug("%s expanded items before clearing", len(expanded_items))
             
             self.clear()
             
@@ -2108,11 +2142,11 @@ class TaskTreeWidget(QTreeWidget):
                 cursor.execute("PRAGMA table_info(tasks)")
                 columns = [info[1] for info in cursor.fetchall()]
                 has_completed_at = 'completed_at' in columns
-                debug.debug(f"Has completed_at column: {has_completed_at}")
+                debug.debug("Has completed_at column: %s", has_completed_at)
             
             # Create query to load ALL tasks (no filtering)
             completed_at_field = ", t.completed_at" if has_completed_at else ""
-            debug.debug(f"Completed_at field in query: {completed_at_field}")
+            debug.debug("Completed_at field in query: %s", completed_at_field)
             
             query = f"""
                 SELECT t.id, t.title, t.description, '', t.status, t.priority, 
@@ -2123,7 +2157,7 @@ class TaskTreeWidget(QTreeWidget):
                 """
             debug.debug("Executing query to load all tasks")
             tasks = db_manager.execute_query(query)
-            debug.debug(f"Query returned {len(tasks)} total tasks")
+            debug.debug("Query returned %s total tasks", len(tasks))
             
             # Process tasks with priority headers (like Current Tasks tab)
             debug.debug("Processing all tasks with priority headers")
@@ -2131,13 +2165,13 @@ class TaskTreeWidget(QTreeWidget):
             
             # Restore expanded states
             self._restore_expanded_states(expanded_items)
-            debug.debug(f"Restored expanded states for {len(expanded_items)} items")
+            debug.debug("Restored expanded states for %s items", len(expanded_items))
             
             end_time = time.time()
-            debug.debug(f"Load tasks tree completed in {end_time - start_time:.3f} seconds")
+            debug.debug("Load tasks tree completed in %.3f seconds", end_time - start_time)
             
         except Exception as e:
-            debug.error(f"Error loading tasks tree: {e}")
+            debug.error("Error loading tasks tree: %s", e)
             import traceback
             traceback.print_exc()
             from PyQt6.QtWidgets import QMessageBox
@@ -2171,17 +2205,21 @@ class TaskTreeWidget(QTreeWidget):
             priority_headers = {}
             for priority, color in priority_colors.items():
                 debug.debug(f"Creating header for priority: {priority}, color: {color}")
-                header_item = PriorityHeaderItem(priority, color)
-                self.addTopLevelItem(header_item)
-                priority_headers[priority] = header_item
+                priority_headers[priority] = PriorityHeaderItem(priority, color)
             
             # Ensure "Unprioritized" header exists if not in database
             if "Unprioritized" not in priority_headers:
                 debug.debug("Creating Unprioritized header (not found in database)")
                 unprioritized_color = "#AAAAAA"  # Medium gray
-                unprioritized_header = PriorityHeaderItem("Unprioritized", unprioritized_color)
-                self.addTopLevelItem(unprioritized_header)
-                priority_headers["Unprioritized"] = unprioritized_header
+                priority_headers["Unprioritized"] = PriorityHeaderItem("Unprioritized", unprioritized_color)
+            
+            # Index the tasks under their headers; items are built as the
+            # headers are expanded and scrolled through
+            debug.debug("Indexing tasks under priority headers")
+            self._index_tasks(tasks, lambda row: priority_headers.get(row[5] or "Unprioritized",
+                                                                      priority_headers["Unprioritized"]))
+            for header_item in priority_headers.values():
+                self.addTopLevelItem(header_item)
             
             # Restore expanded state from settings
             debug.debug("Restoring expanded states from settings")
@@ -2213,85 +2251,7 @@ class TaskTreeWidget(QTreeWidget):
                         'expanded': False
                     })
             
-            items = {}
-            
-            # First pass: create all items with proper links and files
-            debug.debug("First pass: creating all items with links and files")
-            for i, row in enumerate(tasks):
-                if i % 20 == 0:  # Log progress every 20 items
-                    debug.debug(f"Processing task {i+1}/{len(tasks)}")
-                
-                task_id = row[0]
-                
-                # Load links for this task
-                debug.debug(f"Loading links for task {task_id}")
-                task_links = []
-                try:
-                    task_links = db_manager.get_task_links(task_id)
-                    debug.debug(f"Found {len(task_links)} links for task {task_id}")
-                except Exception as e:
-                    debug.error(f"Error loading links for task {task_id}: {e}")
-                
-                # Load files for this task
-                debug.debug(f"Loading files for task {task_id}")
-                task_files = []
-                try:
-                    task_files = db_manager.get_task_files(task_id)
-                    debug.debug(f"Found {len(task_files)} files for task {task_id}")
-                except Exception as e:
-                    debug.error(f"Error loading files for task {task_id}: {e}")
-                
-                # Create the task item WITH links and files
-                debug.debug(f"Creating task item for ID: {task_id}")
-                item = self.add_task_item(
-                    row[0],      # task_id
-                    row[1],      # title
-                    row[2],      # description
-                    '',          # link (empty legacy field)
-                    row[4],      # status
-                    row[5],      # priority
-                    row[6],      # due_date
-                    row[7],      # category
-                    row[8],      # is_compact
-                    links=task_links,  # Pass links as named parameter
-                    files=task_files   # Pass files as named parameter
-                )
-                items[task_id] = item
-                
-                # Store parent info for second pass
-                parent_id = row[9]  # parent_id
-                debug.debug(f"Task {task_id} has parent_id: {parent_id}")
-                
-                # Process using priority headers logic
-                priority = row[5] or "Unprioritized"  # Default to Unprioritized if None
-                debug.debug(f"Task {task_id} has priority: {priority}")
-                
-                if parent_id is None:
-                    # This is a top-level task, add it to the priority header
-                    if priority in priority_headers:
-                        debug.debug(f"Adding task {task_id} to priority header: {priority}")
-                        priority_headers[priority].addChild(item)
-                    else:
-                        # If no matching header, use Unprioritized
-                        debug.debug(f"No header found for priority '{priority}', using Unprioritized for task {task_id}")
-                        priority_headers["Unprioritized"].addChild(item)
-                else:
-                    # This is a child task, will be handled in second pass
-                    debug.debug(f"Task {task_id} is a child task, will be handled in second pass")
-                    item.setData(0, Qt.ItemDataRole.UserRole + 1, parent_id)
-                            
-            # Second pass: handle parent-child relationships for non-top-level tasks
-            debug.debug("Second pass: handling parent-child relationships")
-            parent_child_count = 0
-            for task_id, item in items.items():
-                parent_id = item.data(0, Qt.ItemDataRole.UserRole + 1)
-                if parent_id is not None and parent_id in items:
-                    parent_item = items[parent_id]
-                    parent_item.addChild(item)
-                    parent_child_count += 1
-                    debug.debug(f"Added task {task_id} as child of {parent_id}")
-            
-            debug.debug(f"Processed {parent_child_count} parent-child relationships")
+            self._fetch_visible_rows()
             end_time = time.time()
             debug.debug(f"Task processing completed in {end_time - start_time:.3f} seconds")
         
@@ -2440,15 +2400,9 @@ class TaskTreeWidget(QTreeWidget):
             self._save_priority_expanded_states()
         
         # Handle regular task items with children
-        elif isinstance(data, dict) and 'id' in data and hasattr(item, 'task_id') and item.childCount() > 0:
-            # Update data
-            task_id = data['id']
-            debug.debug(f"Task item expanded: {task_id}")
-            data['expanded'] = False
-            item.setData(0, Qt.ItemDataRole.UserRole, data)
-            
-            # Save to settings
-            self._save_expanded_states()
+        elif isinstance(data, dict) and 'id' in data and hasattr(item, 'task_id') and item.has_children():
+            debug.debug("Task item collapsed: %s", item.task_id)
+            get_expanded_state_store().set_expanded(self._expanded_tab(), item.task_id, False)
 
     def onItemExpanded(self, item):
         """Keep data in sync when item is expanded by the tree widget"""
@@ -2466,15 +2420,9 @@ class TaskTreeWidget(QTreeWidget):
             self._save_priority_expanded_states()
         
         # Handle regular task items with children
-        elif isinstance(data, dict) and 'id' in data and hasattr(item, 'task_id') and item.childCount() > 0:
-            # Update data
-            task_id = data['id']
-            debug.debug(f"Task item expanded: {task_id}")
-            data['expanded'] = True
-            item.setData(0, Qt.ItemDataRole.UserRole, data)
-            
-            # Save to settings
-            self._save_expanded_states()
+        elif isinstance(data, dict) and 'id' in data and hasattr(item, 'task_id') and item.has_children():
+            debug.debug("Task item expanded: %s", item.task_id)
+            get_expanded_state_store().set_expanded(self._expanded_tab(), item.task_id, True)
 
     def onItemDoubleClicked(self, item, column):
         """Route double-clicks to appropriate handlers based on item type"""
@@ -2983,6 +2931,7 @@ class TaskTreeWidget(QTreeWidget):
                 "UPDATE tasks SET category_id = ? WHERE id = ?", 
                 (category_id, item.task_id)
             )
+            mark_database_dirty()
             
             # Update item data
             data = item.data(0, Qt.ItemDataRole.UserRole)
@@ -3093,6 +3042,9 @@ class TaskTreeWidget(QTreeWidget):
                 self._collect_child_items(self.topLevelItem(i), items)
             debug.debug(f"Found {len(items)} items to process")
             
+            # Tasks that were not fetched yet count too
+            unfetched_ids = self.model().unfetched_task_ids()
+            
             # If any items are in normal view, collapse all. Otherwise, expand all
             any_normal = False
             for item in items:
@@ -3102,6 +3054,15 @@ class TaskTreeWidget(QTreeWidget):
                         any_normal = True
                         debug.debug(f"Found normal (non-compact) item: {user_data.get('id')}")
                         break
+            else:
+                any_normal = any(task_id not in delegate.compact_items for task_id in unfetched_ids)
+            
+            # Tasks fetched from now on take the new mode
+            self._fetched_compact = any_normal
+            if any_normal:
+                delegate.compact_items.update(unfetched_ids)
+            else:
+                delegate.compact_items.difference_update(unfetched_ids)
             
             # Toggle all items
             debug.debug(f"Any normal items found: {any_normal}, toggling accordingly")
@@ -3179,12 +3140,13 @@ class TaskTreeWidget(QTreeWidget):
                 "UPDATE tasks SET priority = ?, parent_id = NULL WHERE id = ?",
                 (priority, item.task_id)
             )
+            mark_database_dirty()
             
             debug.debug(f"Task moved to priority header: {priority}")
             
             # Update display orders
             debug.debug("Updating display orders")
-            self._update_display_orders(header)
+            self._update_display_orders(header, moved_id=item.task_id)
             
             # Force a reload of all tabs to reflect the change
             debug.debug("Requesting reload of all tabs")
@@ -3201,9 +3163,9 @@ class TaskTreeWidget(QTreeWidget):
         """Handle dropping a task onto another task or empty area"""
         debug.debug(f"Handling drop of task onto another task")
         try:
-            # Save the expanded state of all items before the drop
-            expanded_items = self._save_expanded_states()
-            debug.debug(f"Saved expanded states for {len(expanded_items)} items")
+            # Remember the expanded state of all items before the drop
+            expanded_items = self.expanded_task_ids()
+            debug.debug(f"{len(expanded_items)} expanded items before the drop")
             
             # Let the standard QTreeWidget implementation handle the visual aspects
             debug.debug("Using standard drop handling first")
@@ -3229,11 +3191,12 @@ class TaskTreeWidget(QTreeWidget):
                 "UPDATE tasks SET parent_id = ? WHERE id = ?", 
                 (parent_id, item.task_id)
             )
+            mark_database_dirty()
             
             # If the item was added to a parent, update display orders
             if new_parent:
                 debug.debug(f"Updating display orders for new parent")
-                self._update_display_orders(new_parent)
+                self._update_display_orders(new_parent, moved_id=item.task_id)
             
             # Recursively update all children
             debug.debug("Updating children hierarchy")
@@ -3252,151 +3215,67 @@ class TaskTreeWidget(QTreeWidget):
             from PyQt6.QtWidgets import QMessageBox
             QMessageBox.critical(self, "Error", f"Failed to update task hierarchy: {str(e)}")
 
-    @debug_method
-    def _save_expanded_states(self):
-        """Save expanded states of all items with improved task hierarchy tracking"""
-        debug.debug("Saving expanded states of all items")
-        expanded_items = []
-        
-        # First collect all items
-        all_items = []
-        for i in range(self.topLevelItemCount()):
-            top_item = self.topLevelItem(i)
-            all_items.append(top_item)
-            self._collect_child_items(top_item, all_items)
-            
-        debug.debug(f"Collected {len(all_items)} total items")
-        print(f"Collected {len(all_items)} total items")
-        
-        # Count items with children
-        items_with_children = [item for item in all_items if item.childCount() > 0]
-        debug.debug(f"Found {len(items_with_children)} items with children")
-        print(f"Found {len(items_with_children)} items with children")
-        
-        # Now check expanded state for each item
-        for item in all_items:
-            index = self.indexFromItem(item)
-            
-            # Skip invalid items
-            if not index.isValid():
-                continue
-                
-            if self.isExpanded(index):
-                # Get the item's data dictionary
-                data = item.data(0, Qt.ItemDataRole.UserRole)
-                
-                # For priority headers
-                if isinstance(data, dict) and data.get('is_priority_header', False):
-                    priority = data.get('priority', 'Unknown')
-                    expanded_items.append(f"priority:{priority}")
-                    debug.debug(f"Saved expanded state for priority header: {priority}")
-                    print(f"Saved expanded state for priority header: {priority}")
-                
-                # For regular task items with children
-                elif hasattr(item, 'task_id') and item.childCount() > 0:
-                    # Only save items that actually have children
-                    expanded_items.append(f"task:{item.task_id}")
-                    debug.debug(f"Saved expanded state for task: {item.task_id} '{item.text(0)}'")
-                    print(f"Saved expanded state for task: {item.task_id} '{item.text(0)}'")
-        
-        # Store in settings
-        settings = self.get_settings_manager()
-        settings.set_setting("expanded_task_states", expanded_items)
-        debug.debug(f"Saved {len(expanded_items)} expanded states to settings")
-        print(f"Saved {len(expanded_items)} expanded states to settings")
-                
-        # Also store in tab-specific setting
-        parent = self.parent()
-        while parent and not hasattr(parent, 'main_window'):
-            parent = parent.parent()
-        
-        if parent and hasattr(parent, 'main_window'):
-            
-            # Get the tab widget
-            tabs = parent.main_window.tabs
-            for i in range(tabs.count()):
-                tab = tabs.widget(i)
-                if hasattr(tab, 'task_tree') and tab.task_tree == self:
-                    tab_key = f"expanded_states_tab_{i}"
-                    settings.set_setting(tab_key, expanded_items)
-                    debug.debug(f"Saved expanded states to tab-specific key: {tab_key}")
-                    break
-        
-        return expanded_items
+    def _expanded_tab(self):
+        """Name this tree's expanded states are stored under"""
+        return getattr(self, 'filter_type', None) or "tree"
+
+    def expanded_task_ids(self):
+        """Return the IDs of this tree's expanded tasks.
+        
+        The expanded-state store is kept up to date by onItemExpanded and
+        onItemCollapsed, so this is just a copy of its set.
+        """
+        tab = self._expanded_tab()
+        expanded_ids = sorted(get_expanded_state_store().expanded_ids(tab))
+        debug.debug("%d expanded tasks in %s tree", len(expanded_ids), tab)
+        return expanded_ids
+
+    def sync_expanded_from_tree(self):
+        """Re-read which tasks are expanded into the store in one pass.
+        
+        Needed after expanding or collapsing with signals blocked, when
+        onItemExpanded and onItemCollapsed did not run.
+        """
+        expanded = set()
+        stack = [self.topLevelItem(i) for i in range(self.topLevelItemCount())]
+        while stack:
+            item = stack.pop()
+            if hasattr(item, 'task_id') and item.has_children() and item.isExpanded():
+                expanded.add(item.task_id)
+            stack.extend(item.child(i) for i in range(item.childCount()))
+        get_expanded_state_store().replace(self._expanded_tab(), expanded)
 
-    @debug_method
     def _restore_expanded_states(self, expanded_items=None):
-        """Restore expanded states with improved persistence"""
-        debug.debug("Restoring expanded states")
+        """Expand exactly the stored tasks (or expanded_items, which become the stored set).
+        
+        One pass over the fetched items with signals blocked; tasks fetched
+        later are expanded as they arrive. Priority headers are left as the
+        loaders set them from the expanded_priorities setting.
+        """
+        store = get_expanded_state_store()
+        tab = self._expanded_tab()
+        if expanded_items is not None:
+            store.replace(tab, task_ids_from_keys(expanded_items))
+        expanded_ids = store.expanded_ids(tab)
         
-        # If expanded_items not provided, get from settings
-        if expanded_items is None:
-            settings = self.get_settings_manager()
-            expanded_items = settings.get_setting("expanded_task_states", [])
-            print('EXPANDED ITEMS:', expanded_items)
-        
-        # If no items to restore, just return
-        if not expanded_items:
-            debug.debug("No expanded states to restore")
-            return 0
-        
-        debug.debug(f"Restoring {len(expanded_items)} expanded states")
-        
-        # Temporarily block signals to prevent interference
         original_state = self.signalsBlocked()
         self.blockSignals(True)
-        
+        expanded_count = 0
         try:
-            # FIRST STEP: Collapse everything first
-            debug.debug("First collapsing all items")
-            for i in range(self.topLevelItemCount()):
-                item = self.topLevelItem(i)
-                self.collapseItem(item)
-                
-                # Recursively collapse all children
-                self._collapse_children_recursive(item)
-            
-            # SECOND STEP: Now expand only specified items
-            # Collect all items for restoration
-            all_items = []
-            for i in range(self.topLevelItemCount()):
-                top_item = self.topLevelItem(i)
-                all_items.append(top_item)
-                self._collect_child_items(top_item, all_items)
-            
-            # First expand priority headers
-            priority_headers_expanded = 0
-            for item in all_items:
-                data = item.data(0, Qt.ItemDataRole.UserRole)
-                if isinstance(data, dict) and data.get('is_priority_header', False):
-                    priority = data.get('priority', 'Unknown')
-                    if f"priority:{priority}" in expanded_items:
-                        debug.debug(f"Expanding priority header: {priority}")
-                        self.expandItem(item)
-                        # Also update the data state
-                        data['expanded'] = True
-                        item.setData(0, Qt.ItemDataRole.UserRole, data)
-                        priority_headers_expanded += 1
-            
-            # Then expand task items
-            task_items_expanded = 0
-            for item in all_items:
-                if hasattr(item, 'task_id') and item.childCount() > 0:
-                    if f"task:{item.task_id}" in expanded_items:
-                        debug.debug(f"Expanding task item: {item.task_id}")
-                        self.expandItem(item)
-                        task_items_expanded += 1
-                        # Update the data state if possible
-                        data = item.data(0, Qt.ItemDataRole.UserRole)
-                        if isinstance(data, dict):
-                            data['expanded'] = True
-                            item.setData(0, Qt.ItemDataRole.UserRole, data)
-            
-            debug.debug(f"Successfully expanded {priority_headers_expanded} priority headers and {task_items_expanded} task items")
-            return priority_headers_expanded + task_items_expanded
+            stack = [self.topLevelItem(i) for i in range(self.topLevelItemCount())]
+            while stack:
+                item = stack.pop()
+                if hasattr(item, 'task_id') and item.has_children():
+                    should_expand = item.task_id in expanded_ids
+                    if item.isExpanded() != should_expand:
+                        item.setExpanded(should_expand)
+                    expanded_count += should_expand
+                stack.extend(item.child(i) for i in range(item.childCount()))
         finally:
-            # Restore original signal blocking state
             self.blockSignals(original_state)
+        
+        debug.debug("Restored %d expanded tasks in %s tree", expanded_count, tab)
+        return expanded_count
   
     @debug_method
     def _collapse_children_recursive(self, parent_item):
@@ -3465,122 +3344,65 @@ class TaskTreeWidget(QTreeWidget):
             traceback.print_exc()
 
     def _update_children_hierarchy(self, parent_item):
-        """Update all children's hierarchy in the database"""
+        """Update all children's hierarchy in the database (errors propagate to the caller)"""
         debug.debug(f"Updating hierarchy for children of: {parent_item.text(0)}")
-        try:
-            debug.debug(f"Parent has {parent_item.childCount()} children")
-            for i in range(parent_item.childCount()):
-                child = parent_item.child(i)
-                
+        # Collect (parent_id, child_id) for the whole visual subtree first
+        updates = []
+        pending = [parent_item]
+        while pending:
+            current = pending.pop()
+            parent_id = current.task_id if hasattr(current, 'task_id') else None
+            for i in range(current.childCount()):
+                child = current.child(i)
                 # Skip if not a task item
-                if not hasattr(child, 'task_id'):
-                    debug.debug("Child is not a task item, skipping")
-                    continue
-                    
-                # Import database manager
-                from database.database_manager import get_db_manager
-                db_manager = get_db_manager()
-                
-                # Update child's parent_id
-                parent_id = parent_item.task_id if hasattr(parent_item, 'task_id') else None
-                debug.debug(f"Updating child task {child.task_id} with parent_id: {parent_id}")
-                db_manager.execute_update(
-                    """
-                    UPDATE tasks 
-                    SET parent_id = ?
-                    WHERE id = ?
-                    """, 
-                    (parent_id, child.task_id)
-                )
-                
-                # Recursively update all grandchildren
-                debug.debug(f"Recursing for grandchildren of task {child.task_id}")
-                self._update_children_hierarchy(child)
-        except Exception as e:
-            debug.error(f"Error updating child hierarchy: {e}")
-
-    def _update_display_orders(self, parent_item):
-        """Update display orders for all children of the parent item"""
-        debug.debug(f"Updating display orders for children of: {parent_item.text(0)}")
-        try:
-            from database.memory_db_manager import get_memory_db_manager
-            db_manager = get_memory_db_manager()
-            
-            # Determine parent_id for database query
-            parent_id = None
-            if hasattr(parent_item, 'task_id'):
-                parent_id = parent_item.task_id
-                debug.debug(f"Parent ID: {parent_id}")
-            
-            # Get all child items
-            child_count = parent_item.childCount()
-            debug.debug(f"Parent has {child_count} children")
-            new_orders = []
-            
-            # Assign new display orders based on visual position
-            for i in range(child_count):
-                child = parent_item.child(i)
                 if hasattr(child, 'task_id'):
-                    new_orders.append((child.task_id, i+1))  # Display orders start at 1
-                    debug.debug(f"Assigning order {i+1} to task {child.task_id}")
-            
-            # Update all display orders in one batch
-            debug.debug(f"Updating {len(new_orders)} display orders in database")
-            for task_id, order in new_orders:
-                db_manager.execute_update(
-                    "UPDATE tasks SET display_order = ? WHERE id = ?",
-                    (order, task_id)
-                )
-                
-            debug.debug(f"Updated display orders for {len(new_orders)} items")
+                    updates.append((parent_id, child.task_id))
+                    pending.append(child)
+        
+        if not updates:
+            return
+        
+        # Write them all with one statement, joining the caller's transaction if any
+        with transaction(get_memory_db_manager()) as uow:
+            uow.execute_many("UPDATE tasks SET parent_id = ? WHERE id = ?", updates)
+        mark_database_dirty()
+        debug.debug(f"Updated parent_id for {len(updates)} descendants")
+
+    def _update_display_orders(self, parent_item, moved_id=None):
+        """Update display orders for all children of the parent item.
+
+        Pass moved_id (the task that was just dropped) so that, when there is
+        room between its new neighbours, only that one row is rewritten.
+        Errors propagate so a caller's transaction rolls back as a whole.
+        """
+        debug.debug("Updating display orders for children of: %s", parent_item.text(0))
+        from database.memory_db_manager import get_memory_db_manager
+        db_manager = get_memory_db_manager()
+        
+        # Child task IDs in their visual order
+        ordered_ids = []
+        for i in range(parent_item.childCount()):
+            child = parent_item.child(i)
+            if hasattr(child, 'task_id'):
+                ordered_ids.append(child.task_id)
+        # Children not fetched yet follow the fetched ones
+        ordered_ids.extend(self.model().unfetched_ids(parent_item))
+        
+        # Joins the caller's transaction, if any
+        with transaction(db_manager) as uow:
+            written = apply_sibling_order(uow.connection, ordered_ids, moved_id)
+        if written:
+            mark_database_dirty()
             
-        except Exception as e:
-            debug.error(f"Error updating display orders: {e}")
-            import traceback
-            traceback.print_exc()
+        debug.debug("Wrote %d display orders for %d children", written, len(ordered_ids))
 
     def _find_item_by_id(self, item_id):
         """Find a task item by its ID"""
-        debug.debug(f"Searching for item with ID: {item_id}")
-        # Check all priority headers
-        for i in range(self.topLevelItemCount()):
-            header_item = self.topLevelItem(i)
-            
-            # Check all tasks in this priority
-            for j in range(header_item.childCount()):
-                task_item = header_item.child(j)
-                
-                # Check if this is the item we want
-                task_data = task_item.data(0, Qt.ItemDataRole.UserRole)
-                if isinstance(task_data, dict) and task_data.get('id') == item_id:
-                    debug.debug(f"Found item in priority header")
-                    return task_item
-                
-                # Recursively check children
-                result = self._find_child_by_id(task_item, item_id)
-                if result:
-                    return result
-        
-        debug.debug(f"Item with ID {item_id} not found")
-        return None
+        return self._find_task_item_by_id(item_id)
 
     def _find_child_by_id(self, parent_item, item_id):
-        """Recursively search for a child item by ID"""
-        for i in range(parent_item.childCount()):
-            child_item = parent_item.child(i)
-            
-            # Check if this is the item we want
-            child_data = child_item.data(0, Qt.ItemDataRole.UserRole)
-            if isinstance(child_data, dict) and child_data.get('id') == item_id:
-                debug.debug(f"Found child item with ID {item_id}")
-                return child_item
-            
-            # Recursively check children
-            result = self._find_child_by_id(child_item, item_id)
-            if result:
-                return result
-        
-        return None
+        """Find a task item with the given ID below parent_item"""
+        return self._find_child_task_by_id(parent_item, item_id)
     
     def _find_parent_and_add_child(self, parent_item, parent_id, new_item):
         """Helper method to recursively find a parent item and add a child to it"""
@@ -3620,6 +3442,9 @@ class TaskTreeWidget(QTreeWidget):
             if hasattr(item, 'task_id'):
                 tasks_list.append(item.task_id)
                 debug.debug(f"Added task ID: {item.task_id}")
+        
+        # Plus the tasks below it that were not fetched yet
+        tasks_list.extend(self.model().unfetched_ids_below(parent_item))
 
     def _debug_add_buttons_to_children(self, parent_item, delegate):
         """Helper for debug_toggle_buttons to add buttons to child items"""
@@ -3654,7 +3479,7 @@ class TaskTreeWidget(QTreeWidget):
             
             # Save to settings
             settings = self.get_settings_manager()
-            settings.set_setting("expanded_priorities", expanded_priorities)
+            settings.set_setting("expanded_priorities", expanded_priorities, deferred=True)
             debug.debug(f"Saved expanded priorities: {expanded_priorities}")
         except Exception as e:
             debug.error(f"Error saving priority expanded states: {e}")
@@ -3673,8 +3498,8 @@ class TaskTreeWidget(QTreeWidget):
                 item = self.topLevelItem(i)
                 expanded_count += self._expand_item_recursively(item)
             
-            # Save the expanded states
-            self._save_expanded_states()
+            # Record the expanded states
+            self.sync_expanded_from_tree()
             
             # Also save priority expanded states if applicable
             if hasattr(self, '_save_priority_expanded_states'):
@@ -3710,8 +3535,8 @@ class TaskTreeWidget(QTreeWidget):
                 item = self.topLevelItem(i)
                 collapsed_count += self._collapse_item_recursively(item)
             
-            # Save the expanded states (which should now be mostly empty)
-            self._save_expanded_states()
+            # Record the expanded states (which should now be mostly empty)
+            self.sync_expanded_from_tree()
             
             # Also save priority expanded states if applicable
             if hasattr(self, '_save_priority_expanded_states'):
@@ -3738,8 +3563,8 @@ class TaskTreeWidget(QTreeWidget):
         """Recursively expand an item and all its children"""
         expanded_count = 0
         
-        if item.childCount() > 0:
-            # Expand this item
+        if item.has_children():
+            # Expand this item (which fetches its children)
             self.expandItem(item)
             expanded_count += 1
             
@@ -3777,32 +3602,4 @@ class TaskTreeWidget(QTreeWidget):
                 data['expanded'] = False
                 item.setData(0, Qt.ItemDataRole.UserRole, data)
         
-        return collapsed_count  
-class PriorityHeaderItem(QTreeWidgetItem):
-    """Custom tree widget item for priority headers"""
-    
-    def __init__(self, priority_name, priority_color):
-        debug.debug(f"Creating priority header item: {priority_name}")
-        super().__init__()
-        self.priority_name = priority_name
-        self.priority_color = priority_color
-        self.setText(0, priority_name.upper())
-        
-        # Add a flag to identify this as a priority header
-        self.setData(0, Qt.ItemDataRole.UserRole, {
-            'is_priority_header': True,
-            'priority': priority_name,
-            'color': priority_color,
-            'expanded': True,  # Track expanded state
-        })
-        
-        # Make it selectable to improve click behavior
-        self.setFlags(self.flags() | Qt.ItemFlag.ItemIsSelectable)
-        
-        # Set the background color
-        self.setBackground(0, QBrush(QColor(priority_color)))
-        debug.debug(f"Set background color to: {priority_color}")
-        
-        # Use custom height
-        self.setSizeHint(0, QSize(0, 25))
-        debug.debug("Priority header item created")
\ No newline at end of file
+        return collapsed_count
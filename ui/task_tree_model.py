@@ -0,0 +1,517 @@
+# src/ui/task_tree_model.py
+
+from PyQt6.QtCore import Qt, QAbstractItemModel, QModelIndex, QSize, pyqtSignal
+from PyQt6.QtGui import QBrush, QColor
+
+# Import the debug logger
+from utils.debug_logger import get_debug_logger
+debug = get_debug_logger()
+
+# Rows fetched at a time under the root and the priority headers. A task's
+# own children are always fetched together.
+FETCH_BATCH_SIZE = 100
+
+# The flags a new QTreeWidgetItem starts with
+DEFAULT_ITEM_FLAGS = (Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsUserCheckable |
+                      Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsDragEnabled |
+                      Qt.ItemFlag.ItemIsDropEnabled)
+
+
+class TaskItem:
+    """A row of the task tree.
+
+    Offers the part of the QTreeWidgetItem API the task tree code uses, so
+    items are built, read and rearranged the same way. Items only exist for
+    rows the view has fetched; TaskTreeModel keeps the others as task rows.
+    """
+
+    def __init__(self, texts=None):
+        self._values = {}
+        self._flags = DEFAULT_ITEM_FLAGS
+        self._parent = None
+        self._children = []
+        # IDs of child tasks that have no item yet, in order after _children
+        self._pending = []
+        # Only set on the model's invisible root
+        self._model = None
+        self._row_hint = 0
+        if texts:
+            self._values[Qt.ItemDataRole.DisplayRole.value] = texts[0]
+
+    def _tree_model(self):
+        """The model this item is shown in, or None"""
+        item = self
+        while item._parent is not None:
+            item = item._parent
+        return item._model
+
+    @staticmethod
+    def _role(role):
+        role = int(role.value if isinstance(role, Qt.ItemDataRole) else role)
+        return Qt.ItemDataRole.DisplayRole.value if role == Qt.ItemDataRole.EditRole.value else role
+
+    def data(self, column, role):
+        value = self._values.get(self._role(role))
+        # QTreeWidgetItem hands out copies, so callers edit a dict and set it back
+        return dict(value) if isinstance(value, dict) else value
+
+    def setData(self, column, role, value):
+        role = self._role(role)
+        self._values[role] = value
+        model = self._tree_model()
+        if model is not None:
+            model.item_changed(self, role)
+
+    def text(self, column):
+        return self._values.get(Qt.ItemDataRole.DisplayRole.value) or ""
+
+    def setText(self, column, text):
+        self.setData(column, Qt.ItemDataRole.DisplayRole, text)
+
+    def background(self, column):
+        return self._values.get(Qt.ItemDataRole.BackgroundRole.value) or QBrush()
+
+    def setBackground(self, column, brush):
+        self.setData(column, Qt.ItemDataRole.BackgroundRole, brush)
+
+    def sizeHint(self, column):
+        return self._values.get(Qt.ItemDataRole.SizeHintRole.value) or QSize()
+
+    def setSizeHint(self, column, size):
+        self.setData(column, Qt.ItemDataRole.SizeHintRole, size)
+
+    def flags(self):
+        return self._flags
+
+    def setFlags(self, flags):
+        self._flags = flags
+        model = self._tree_model()
+        if model is not None:
+            model.item_changed(self)
+
+    def parent(self):
+        """The parent item, or None for top-level items"""
+        parent = self._parent
+        return None if parent is None or parent._model is not None else parent
+
+    def child(self, index):
+        return self._children[index] if 0 <= index < len(self._children) else None
+
+    def childCount(self):
+        """Number of fetched children"""
+        return len(self._children)
+
+    def has_children(self):
+        """Whether the item has children, fetched or not"""
+        return bool(self._children or self._pending)
+
+    def indexOfChild(self, child):
+        hint = child._row_hint
+        if hint < len(self._children) and self._children[hint] is child:
+            return hint
+        for row, sibling in enumerate(self._children):
+            if sibling is child:
+                child._row_hint = row
+                return row
+        return -1
+
+    def addChild(self, child):
+        self.insertChildren(len(self._children), [child])
+
+    def addChildren(self, children):
+        self.insertChildren(len(self._children), children)
+
+    def insertChild(self, index, child):
+        self.insertChildren(index, [child])
+
+    def insertChildren(self, index, children):
+        # Like QTreeWidgetItem, items that already have a parent are left alone
+        children = [child for child in children if child._parent is None and child is not self]
+        if not children:
+            return
+        index = max(0, min(index, len(self._children)))
+        model = self._tree_model()
+        if model is not None:
+            model.insert_items(self, index, children)
+            return
+        for child in children:
+            child._parent = self
+        self._children[index:index] = children
+
+    def takeChild(self, index):
+        if not 0 <= index < len(self._children):
+            return None
+        model = self._tree_model()
+        if model is not None:
+            return model.take_items(self, index)[0]
+        child = self._children.pop(index)
+        child._parent = None
+        return child
+
+    def removeChild(self, child):
+        index = self.indexOfChild(child)
+        if index >= 0:
+            self.takeChild(index)
+
+    def treeWidget(self):
+        model = self._tree_model()
+        return model._view if model is not None else None
+
+    def isExpanded(self):
+        model = self._tree_model()
+        return (model is not None and model._view is not None and
+                model._view.isExpanded(model.index_for_item(self)))
+
+    def setExpanded(self, expanded):
+        tree = self.treeWidget()
+        if tree is None:
+            return
+        if expanded:
+            tree.expandItem(self)
+        else:
+            tree.collapseItem(self)
+
+
+class PriorityHeaderItem(TaskItem):
+    """Custom tree widget item for priority headers"""
+
+    def __init__(self, priority_name, priority_color):
+        debug.debug(f"Creating priority header item: {priority_name}")
+        super().__init__()
+        self.priority_name = priority_name
+        self.priority_color = priority_color
+        self.setText(0, priority_name.upper())
+
+        # Add a flag to identify this as a priority header
+        self.setData(0, Qt.ItemDataRole.UserRole, {
+            'is_priority_header': True,
+            'priority': priority_name,
+            'color': priority_color,
+            'expanded': True,  # Track expanded state
+        })
+
+        # Make it selectable to improve click behavior
+        self.setFlags(self.flags() | Qt.ItemFlag.ItemIsSelectable)
+
+        # Set the background color
+        self.setBackground(0, QBrush(QColor(priority_color)))
+        debug.debug(f"Set background color to: {priority_color}")
+
+        # Use custom height
+        self.setSizeHint(0, QSize(0, 25))
+        debug.debug("Priority header item created")
+
+
+class TaskTreeModel(QAbstractItemModel):
+    """Single-column model of TaskItems whose rows are fetched as they are shown.
+
+    Tasks the view has not fetched yet are kept as plain rows in a compact
+    index (task_id -> row, task_id -> child IDs). The view asks for children
+    through canFetchMore/fetchMore when a parent is expanded or scrolled to,
+    and create_items turns those rows into items then, so memory and load
+    time follow what is visible rather than the number of tasks.
+    """
+
+    # Items just built from fetched rows
+    itemsFetched = pyqtSignal(list)
+
+    def __init__(self, create_items, parent=None):
+        super().__init__(parent)
+        self._view = parent
+        self._create_items = create_items
+        self._root = TaskItem()
+        self._root._model = self
+        # id(item) -> item for every item in the model. Indexes carry the
+        # item's address, which is looked up here rather than dereferenced.
+        self._nodes = {}
+        # task_id -> row, for tasks without an item
+        self._rows = {}
+        # task_id -> child task IDs, for tasks without an item
+        self._children = {}
+        # task_id -> the item it will be fetched under, or the parent's ID
+        # while the parent has no item either
+        self._owners = {}
+
+    def invisible_root(self):
+        return self._root
+
+    def item_from_index(self, index):
+        if not index.isValid() or index.model() is not self:
+            return None
+        return self._nodes.get(index.internalId())
+
+    def index_for_item(self, item):
+        if item is None or item._parent is None or self._nodes.get(id(item)) is not item:
+            return QModelIndex()
+        return self.createIndex(item._parent.indexOfChild(item), 0, item)
+
+    def _container(self, parent):
+        return self.item_from_index(parent) if parent.isValid() else self._root
+
+    def index(self, row, column, parent=QModelIndex()):
+        container = self._container(parent)
+        if container is None or column != 0 or not 0 <= row < len(container._children):
+            return QModelIndex()
+        item = container._children[row]
+        item._row_hint = row
+        return self.createIndex(row, 0, item)
+
+    def parent(self, index=None):
+        if index is None:
+            return super().parent()
+        item = self.item_from_index(index)
+        if item is None or item._parent is None or item._parent is self._root:
+            return QModelIndex()
+        return self.index_for_item(item._parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        container = self._container(parent)
+        return len(container._children) if container is not None else 0
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def hasChildren(self, parent=QModelIndex()):
+        container = self._container(parent)
+        return container is not None and container.has_children()
+
+    def canFetchMore(self, parent):
+        container = self._container(parent)
+        return container is not None and bool(container._pending)
+
+    def fetchMore(self, parent):
+        container = self._container(parent)
+        if container is None:
+            return
+        # The root and priority headers fill up in batches as the view
+        # scrolls; a task's children are few enough to fetch in one go
+        self.fetch(container, None if hasattr(container, 'task_id') else FETCH_BATCH_SIZE)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        item = self.item_from_index(index)
+        if item is None:
+            return None
+        return item._values.get(TaskItem._role(role))
+
+    def flags(self, index):
+        item = self.item_from_index(index)
+        if item is None:
+            # Dropping on empty space is allowed
+            return Qt.ItemFlag.ItemIsDropEnabled
+        return item._flags
+
+    def supportedDropActions(self):
+        return Qt.DropAction.MoveAction
+
+    def supportedDragActions(self):
+        return Qt.DropAction.MoveAction
+
+    def item_changed(self, item, role=None):
+        index = self.index_for_item(item)
+        if index.isValid():
+            self.dataChanged.emit(index, index, [role] if role is not None else [])
+
+    def _register(self, item):
+        stack = [item]
+        while stack:
+            current = stack.pop()
+            self._nodes[id(current)] = current
+            stack.extend(current._children)
+
+    def _unregister(self, item):
+        stack = [item]
+        while stack:
+            current = stack.pop()
+            self._nodes.pop(id(current), None)
+            stack.extend(current._children)
+
+    def insert_items(self, container, position, items):
+        """Insert items (and their subtrees) at position among container's children"""
+        self.beginInsertRows(self.index_for_item(container), position, position + len(items) - 1)
+        for item in items:
+            item._parent = container
+            self._register(item)
+        container._children[position:position] = items
+        self.endInsertRows()
+
+    def take_items(self, container, position, count=1):
+        """Remove count children of container from position on, and return them"""
+        self.beginRemoveRows(self.index_for_item(container), position, position + count - 1)
+        taken = container._children[position:position + count]
+        del container._children[position:position + count]
+        for item in taken:
+            item._parent = None
+            self._unregister(item)
+        self.endRemoveRows()
+        return taken
+
+    def move_item(self, item, container, position=None):
+        """Move item to position (default: the end) among container's children.
+
+        The row is moved rather than taken out and put back, so the view keeps
+        the expanded state and selection of its subtree.
+        """
+        source = item._parent
+        row = source.indexOfChild(item)
+        if position is None:
+            position = len(container._children) - (1 if source is container else 0)
+        destination = position
+        if source is container:
+            if position == row:
+                return
+            # beginMoveRows counts the destination before the row is removed
+            if position > row:
+                destination = position + 1
+
+        if not self.beginMoveRows(self.index_for_item(source), row, row,
+                                  self.index_for_item(container), destination):
+            self.take_items(source, row)
+            self.insert_items(container, position, [item])
+            return
+        del source._children[row]
+        container._children.insert(position, item)
+        item._parent = container
+        self.endMoveRows()
+
+    def clear(self):
+        """Remove every item and forget every unfetched task"""
+        self.beginResetModel()
+        for item in self._root._children:
+            item._parent = None
+        self._root._children = []
+        self._root._pending = []
+        self._nodes.clear()
+        self._rows.clear()
+        self._children.clear()
+        self._owners.clear()
+        self.endResetModel()
+
+    def _pending_ids(self, holder):
+        if isinstance(holder, TaskItem):
+            return holder._pending
+        return self._children.setdefault(holder, [])
+
+    def add_unfetched(self, holder, task_id, row, position=None):
+        """Index a task row without building its item.
+
+        holder is the item it will be fetched under, or the ID of an unfetched
+        parent task. position counts among holder's unfetched children.
+        """
+        self._rows[task_id] = row
+        self._owners[task_id] = holder
+        siblings = self._pending_ids(holder)
+        if position is None:
+            siblings.append(task_id)
+        else:
+            siblings.insert(position, task_id)
+
+    def add_unfetched_rows(self, holder, rows, rows_by_parent):
+        """Index rows under holder, and below each one its children from rows_by_parent"""
+        stack = [(holder, rows)]
+        while stack:
+            holder, rows = stack.pop()
+            for row in rows:
+                self.add_unfetched(holder, row[0], row)
+                if row[0] in rows_by_parent:
+                    stack.append((row[0], rows_by_parent[row[0]]))
+
+    def is_unfetched(self, task_id):
+        return task_id in self._rows
+
+    def unfetched_ids(self, holder):
+        """IDs of holder's unfetched children, in order"""
+        if isinstance(holder, TaskItem):
+            return list(holder._pending)
+        return list(self._children.get(holder, []))
+
+    def unfetched_ids_below(self, item):
+        """IDs of every unfetched task in item's subtree"""
+        task_ids = []
+        items = [item]
+        while items:
+            current = items.pop()
+            items.extend(current._children)
+            stack = list(current._pending)
+            while stack:
+                task_id = stack.pop()
+                task_ids.append(task_id)
+                stack.extend(self._children.get(task_id, []))
+        return task_ids
+
+    def unfetched_task_ids(self):
+        return list(self._rows)
+
+    def take_unfetched(self, task_id):
+        """Remove a task from the index and return its row.
+
+        Its own unfetched children stay indexed under its ID, for the item
+        built for it next (see adopt_unfetched).
+        """
+        holder = self._owners.pop(task_id)
+        siblings = self._pending_ids(holder)
+        siblings.remove(task_id)
+        if not siblings and not isinstance(holder, TaskItem):
+            del self._children[holder]
+        return self._rows.pop(task_id)
+
+    def discard_unfetched(self, task_id):
+        """Remove a task and everything below it from the index"""
+        if task_id in self._owners:
+            self.take_unfetched(task_id)
+        stack = self._children.pop(task_id, [])
+        while stack:
+            child_id = stack.pop()
+            self._rows.pop(child_id, None)
+            self._owners.pop(child_id, None)
+            stack.extend(self._children.pop(child_id, []))
+
+    def discard_unfetched_children(self, item):
+        """Remove item's unfetched children, and everything below them, from the index"""
+        for task_id in list(item._pending):
+            self.discard_unfetched(task_id)
+
+    def adopt_unfetched(self, item):
+        """Give a newly built task item the unfetched children indexed under its ID"""
+        pending = self._children.pop(item.task_id, None)
+        if pending:
+            item._pending.extend(pending)
+            for task_id in pending:
+                self._owners[task_id] = item
+
+    def fetch(self, container, count=None):
+        """Build items for the first count (default: all) unfetched children of container"""
+        task_ids = container._pending[:count] if count else list(container._pending)
+        if not task_ids:
+            return []
+        del container._pending[:len(task_ids)]
+        rows = []
+        for task_id in task_ids:
+            self._owners.pop(task_id, None)
+            rows.append(self._rows.pop(task_id))
+
+        items = self._create_items(rows)
+        container.addChildren(items)
+        debug.debug("Fetched %d rows, %d left unfetched", len(items), len(self._rows))
+        self.itemsFetched.emit(items)
+        return items
+
+    def fetch_to(self, task_id):
+        """Fetch the rows down to task_id and return its item, or None if it is not indexed"""
+        chain = []
+        holder = task_id
+        while not isinstance(holder, TaskItem):
+            if holder not in self._owners:
+                return None
+            chain.append(holder)
+            holder = self._owners[holder]
+
+        item = holder
+        for current_id in reversed(chain):
+            if hasattr(item, 'task_id'):
+                fetched = self.fetch(item)
+            else:
+                fetched = self.fetch(item, item._pending.index(current_id) + 1)
+            item = next(child for child in fetched if getattr(child, 'task_id', None) == current_id)
+        return item
@@ -0,0 +1,118 @@
+# src/tests/test_app_settings.py
+
+import os
+import sys
+from pathlib import Path
+import unittest
+from unittest import mock
+import tempfile
+import shutil
+import json
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+try:
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtTest import QTest
+    from ui import app_settings
+    from ui.app_settings import SettingsManager, flush_pending_settings, get_settings_manager
+except ImportError:  # PyQt6 or the OS style manager is not available
+    SettingsManager = None
+
+@unittest.skipIf(SettingsManager is None, "PyQt6 and the OS style manager are required")
+class TestSettingsManager(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        # Keep settings.json in a temporary home directory
+        self.test_dir = tempfile.mkdtemp()
+        self.home_patch = mock.patch.object(app_settings.Path, "home", return_value=Path(self.test_dir))
+        self.home_patch.start()
+        self.manager = SettingsManager()
+        self.save = mock.patch.object(self.manager, "save_settings", wraps=self.manager.save_settings).start()
+
+    def tearDown(self):
+        mock.patch.stopall()
+        flush_pending_settings()
+        shutil.rmtree(self.test_dir)
+
+    def _stored(self):
+        with open(self.manager.settings_file) as f:
+            return json.load(f)
+
+    def test_batch_writes_once(self):
+        """Every change inside a batch, nested or not, goes out in one write"""
+        with self.manager.batch():
+            self.manager.set_setting("theme", "dark")
+            with self.manager.batch():
+                self.manager.set_setting("left_panel_width", 120)
+            self.manager.remove_settings(["auto_backup"])
+            self.assertEqual(self.save.call_count, 0)
+        self.assertEqual(self.save.call_count, 1)
+        stored = self._stored()
+        self.assertEqual((stored["theme"], stored["left_panel_width"]), ("dark", 120))
+        self.assertNotIn("auto_backup", stored)
+
+    def test_deferred_writes_coalesce(self):
+        """A burst of deferred changes is written once, after the debounce delay"""
+        with mock.patch.object(app_settings, "SETTINGS_FLUSH_DELAY_MS", 20):
+            for width in range(100, 110):
+                self.manager.set_setting("left_panel_width", width, deferred=True)
+            self.assertEqual(self.save.call_count, 0)
+            QTest.qWait(100)
+        self.assertEqual(self.save.call_count, 1)
+        self.assertEqual(self._stored()["left_panel_width"], 109)
+
+    def test_flush_pending_settings_writes_deferred_changes(self):
+        """Deferred changes still outstanding at exit are written by flush_pending_settings"""
+        self.manager.set_setting("theme", "dark", deferred=True)
+        flush_pending_settings()
+        self.assertEqual(self.save.call_count, 1)
+        self.assertEqual(self._stored()["theme"], "dark")
+
+        # Nothing is left to write afterwards
+        flush_pending_settings()
+        self.assertEqual(self.save.call_count, 1)
+
+    def test_failed_replace_keeps_previous_file(self):
+        """A write that fails at the rename leaves the old settings.json intact and no temp file"""
+        self.manager.set_setting("theme", "dark")
+        with mock.patch.object(app_settings.os, "replace", side_effect=OSError("disk full")):
+            self.assertFalse(self.manager.set_setting("theme", "light"))
+        self.assertEqual(self._stored()["theme"], "dark")
+        self.assertEqual(os.listdir(self.manager.settings_dir), ["settings.json"])
+
+    def test_setting_changed_fires_only_for_changes(self):
+        """setting_changed fires for new values, in-place edits and removals, not for repeats"""
+        fired = []
+        self.manager.setting_changed.connect(fired.append)
+
+        self.manager.set_setting("theme", "dark")
+        self.manager.set_setting("theme", "dark")
+        self.manager.set_setting("left_panel_contents", ["Category"])
+        self.manager.set_setting("left_panel_contents", ["Category"])
+
+        # Edit the stored list in place and set it back
+        contents = self.manager.get_setting("left_panel_contents")
+        contents.append("Status")
+        self.manager.set_setting("left_panel_contents", contents)
+        self.manager.set_setting("left_panel_contents", contents)
+
+        self.manager.remove_settings(["theme", "missing"])
+        self.assertEqual(fired, ["theme", "left_panel_contents", "left_panel_contents", "theme"])
+
+    def test_shared_manager(self):
+        """get_settings_manager hands every caller the same instance"""
+        with mock.patch.object(app_settings, "_shared_settings", None):
+            shared = get_settings_manager()
+            self.assertIsInstance(shared, SettingsManager)
+            self.assertIs(get_settings_manager(), shared)
+
+if __name__ == '__main__':
+    unittest.main()
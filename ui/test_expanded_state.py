@@ -0,0 +1,65 @@
+# src/tests/test_expanded_state.py
+
+import sys
+from pathlib import Path
+import unittest
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from ui.expanded_state import SETTINGS_KEY, LEGACY_SETTINGS_KEY, ExpandedStateStore, task_ids_from_keys
+
+class DictSettings:
+    """Settings with the SettingsManager get/set/remove interface, counting writes"""
+
+    def __init__(self, values=None):
+        self.settings = dict(values or {})
+        self.writes = 0
+
+    def get_setting(self, key, default=None):
+        return self.settings.get(key, default)
+
+    def set_setting(self, key, value, deferred=False):
+        self.settings[key] = value
+        self.writes += 1
+
+    def remove_settings(self, keys):
+        for key in keys:
+            self.settings.pop(key, None)
+        self.writes += 1
+
+class TestExpandedStateStore(unittest.TestCase):
+
+    def test_task_ids_from_legacy_keys(self):
+        self.assertEqual(task_ids_from_keys(["task:3", "priority:High", 5, "task:x"]), {3, 5})
+
+    def test_tabs_start_from_legacy_list(self):
+        settings = DictSettings({LEGACY_SETTINGS_KEY: ["task:1", "priority:Low", "task:2"],
+                                 "expanded_states_tab_0": ["task:1"], "expanded_states_tab_2": []})
+        store = ExpandedStateStore(settings)
+        self.assertEqual(store.expanded_ids("current"), {1, 2})
+        self.assertEqual(store.expanded_ids("backlog"), {1, 2})
+        # The per-tab keys are dropped
+        self.assertEqual(list(settings.settings), [LEGACY_SETTINGS_KEY])
+
+    def test_changes_are_saved_once_per_tab_set(self):
+        settings = DictSettings({SETTINGS_KEY: {"current": [4]}})
+        store = ExpandedStateStore(settings)
+        store.set_expanded("current", 7, True)
+        store.set_expanded("current", 4, False)
+        store.replace("completed", [9, 8])
+
+        self.assertTrue(store.save())
+        self.assertEqual(settings.writes, 1)
+        self.assertEqual(settings.settings[SETTINGS_KEY], {"current": [7], "completed": [8, 9]})
+
+    def test_unchanged_store_is_not_saved(self):
+        settings = DictSettings({SETTINGS_KEY: {"current": [4]}})
+        store = ExpandedStateStore(settings)
+        store.set_expanded("current", 4, True)
+        store.replace("current", [4])
+        self.assertFalse(store.save())
+        self.assertEqual(settings.writes, 0)
+
+if __name__ == '__main__':
+    unittest.main()
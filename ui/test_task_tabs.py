@@ -0,0 +1,252 @@
+# src/tests/test_task_tabs.py
+
+import os
+import sys
+from pathlib import Path
+import unittest
+from unittest import mock
+import sqlite3
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from database.db_config import db_config
+from database.task_queries import get_task_attachments, get_task_subtrees, reparent_task
+from database.unit_of_work import transaction
+
+try:
+    from PyQt6.QtWidgets import QApplication, QWidget, QMessageBox
+    from ui.task_tabs import TabTaskTreeWidget
+    from ui.expanded_state import ExpandedStateStore
+except ImportError:  # PyQt6 or the memory database manager is not available
+    TabTaskTreeWidget = None
+
+class MemoryDatabase:
+    """The memory database manager interface over a throwaway connection"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def get_connection(self):
+        return self.conn
+
+    def execute_query(self, query, params=None):
+        return self.conn.execute(query, params or ()).fetchall()
+
+    def save_to_file(self):
+        pass
+
+@unittest.skipIf(TabTaskTreeWidget is None, "PyQt6 and the memory database manager are required")
+class TestTabTaskTreeDelete(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        db_config._create_tables(self.conn.cursor())
+        self.conn.executemany(
+            "INSERT INTO tasks (id, title, status, parent_id, display_order) VALUES (?, ?, 'Backlog', ?, ?)",
+            [(1, "Parent", None, 1), (2, "Child", 1, 1), (3, "Grandchild", 2, 1), (4, "Other", None, 2)]
+        )
+        self.conn.commit()
+        self.db_manager = MemoryDatabase(self.conn)
+
+        self.patches = [
+            mock.patch("database.memory_db_manager.get_memory_db_manager", return_value=self.db_manager),
+            mock.patch("ui.task_tabs.get_memory_db_manager", return_value=self.db_manager),
+            mock.patch("ui.task_tree.get_memory_db_manager", return_value=self.db_manager),
+            mock.patch("ui.task_tree.mark_database_dirty"),
+            mock.patch("ui.task_tree.QMessageBox.question", return_value=QMessageBox.StandardButton.Yes),
+        ]
+        for patch in self.patches:
+            patch.start()
+
+        # Host the tree the way TaskTabWidget does, pushing changes through apply_task_changes
+        self.tree = TabTaskTreeWidget("backlog")
+        self.host = QWidget()
+        self.host.refresh_tasks = self._refresh_tasks
+        self.tree.setParent(self.host)
+
+        items = {}
+        for task_id, title, parent_id in [(1, "Parent", None), (2, "Child", 1), (3, "Grandchild", 2), (4, "Other", None)]:
+            item = self.tree.add_task_item(task_id, title, "", "", "Backlog", "Medium", "", "")
+            if parent_id is None:
+                self.tree.addTopLevelItem(item)
+            else:
+                items[parent_id].addChild(item)
+            items[task_id] = item
+        self.items = items
+
+    def tearDown(self):
+        for patch in reversed(self.patches):
+            patch.stop()
+        self.host.deleteLater()
+        self.conn.close()
+
+    def _refresh_tasks(self, task_ids):
+        rows = get_task_subtrees(self.conn, task_ids)
+        links_by_task, files_by_task = get_task_attachments(self.conn, [row[0] for row in rows])
+        self.tree.apply_task_changes(task_ids, rows, links_by_task, files_by_task)
+
+    def test_delete_parent_removes_subtree(self):
+        """Deleting a parent takes its subtree out of the tree and the task index"""
+        self.tree.delete_task(self.items[1])
+
+        self.assertEqual(self.conn.execute("SELECT id FROM tasks").fetchall(), [(4,)])
+        self.assertEqual(self.tree.topLevelItemCount(), 1)
+        self.assertEqual(self.tree.topLevelItem(0).task_id, 4)
+        self.assertEqual(set(self.tree._items_by_id), {4})
+        for task_id in (1, 2, 3):
+            self.assertIsNone(self.tree._task_item(task_id))
+
+    def test_failed_display_orders_roll_back_the_move(self):
+        """A failure writing sibling orders undoes the reparent made in the same transaction"""
+        with mock.patch("ui.task_tree.apply_sibling_order", side_effect=sqlite3.OperationalError("disk I/O error")):
+            with self.assertRaises(sqlite3.OperationalError):
+                with transaction(self.db_manager) as uow:
+                    reparent_task(uow.connection, 4, 1)
+                    self.tree._update_display_orders(self.items[1], moved_id=4)
+        self.assertEqual(self.conn.execute("SELECT parent_id FROM tasks WHERE id = 4").fetchone(), (None,))
+
+@unittest.skipIf(TabTaskTreeWidget is None, "PyQt6 and the memory database manager are required")
+class TestTabTaskTreeLazyLoad(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        # 250 top-level tasks; task 1 has a child (1001) with a child of its own (1002)
+        self.conn = sqlite3.connect(":memory:")
+        db_config._create_tables(self.conn.cursor())
+        self.conn.executemany(
+            "INSERT INTO tasks (id, title, status, priority, parent_id, display_order) VALUES (?, ?, ?, 'High', ?, ?)",
+            [(task_id, f"Task {task_id}", "Backlog", None, task_id) for task_id in range(1, 251)] +
+            [(1001, "Child", "Backlog", 1, 1), (1002, "Grandchild", "Backlog", 1001, 1)]
+        )
+        self.conn.commit()
+        self.db_manager = MemoryDatabase(self.conn)
+
+        self.patches = [
+            mock.patch("database.memory_db_manager.get_memory_db_manager", return_value=self.db_manager),
+            mock.patch("ui.task_tabs.get_memory_db_manager", return_value=self.db_manager),
+            mock.patch("ui.task_tree.get_memory_db_manager", return_value=self.db_manager),
+            mock.patch("ui.task_tree.mark_database_dirty"),
+        ]
+        for patch in self.patches:
+            patch.start()
+
+        # Settings and expanded states live in a dict for the test
+        self.settings = {}
+        settings = mock.Mock(settings=self.settings)
+        settings.get_setting.side_effect = lambda key, default=None: self.settings.get(key, default)
+        settings.set_setting.side_effect = lambda key, value, deferred=False: self.settings.update({key: value})
+        store = ExpandedStateStore(settings)
+        self.patches.append(mock.patch("ui.task_tree.get_expanded_state_store", return_value=store))
+        self.patches[-1].start()
+
+        self.host = QWidget()
+        self.host.refresh_tasks = self._refresh_tasks
+        self.host.settings = settings
+
+    def tearDown(self):
+        for patch in reversed(self.patches):
+            patch.stop()
+        self.host.deleteLater()
+        self.conn.close()
+
+    def _load(self, filter_type):
+        tree = TabTaskTreeWidget(filter_type)
+        tree.setParent(self.host)
+        tree.load_tasks_tab()
+        return tree
+
+    def _refresh_tasks(self, task_ids):
+        rows = get_task_subtrees(self.conn, task_ids)
+        links_by_task, files_by_task = get_task_attachments(self.conn, [row[0] for row in rows])
+        self.tree.apply_task_changes(task_ids, rows, links_by_task, files_by_task)
+
+    def test_items_are_built_when_fetched(self):
+        """Loading builds a first batch of top-level items; children wait for their parent to expand"""
+        self.tree = self._load("backlog")
+        model = self.tree.model()
+        self.assertLess(self.tree.topLevelItemCount(), 250)
+        self.assertEqual(len(self.tree._items_by_id), self.tree.topLevelItemCount())
+        self.assertTrue(model.is_unfetched(250))
+
+        parent = self.tree._task_item(1)
+        self.assertEqual(parent.childCount(), 0)
+        self.assertTrue(model.hasChildren(self.tree.indexFromItem(parent)))
+        self.assertTrue(model.canFetchMore(self.tree.indexFromItem(parent)))
+
+        self.tree.expandItem(parent)
+        self.assertEqual(parent.child(0).task_id, 1001)
+        self.assertIsNone(self.tree._task_item(1002))
+
+    def test_highlight_fetches_the_path_to_a_task(self):
+        """Highlighting a task that was not fetched yet builds it and its ancestors"""
+        self.tree = self._load("backlog")
+        self.assertTrue(self.tree._highlight_task(1002))
+        item = self.tree._task_item(1002)
+        self.assertIs(self.tree.currentItem(), item)
+        self.assertEqual(item.parent().task_id, 1001)
+        self.assertEqual(item.parent().parent().task_id, 1)
+
+        self.assertTrue(self.tree._highlight_task(250))
+        self.assertEqual(self.tree.currentItem().task_id, 250)
+
+        # The expanded path comes back as its rows are fetched after a reload
+        self.tree.load_tasks_tab()
+        self.assertTrue(self.tree._task_item(1).isExpanded())
+        self.assertTrue(self.tree._task_item(1001).isExpanded())
+        self.assertIsNotNone(self.tree._task_item(1002))
+
+    def test_changes_to_unfetched_tasks_update_the_index(self):
+        """Edits and deletes of tasks that were never fetched do not build items"""
+        self.tree = self._load("backlog")
+        self.conn.execute("UPDATE tasks SET title = 'Renamed' WHERE id = 1002")
+        self._refresh_tasks([1002])
+        self.assertIsNone(self.tree._task_item(1002))
+        self.assertEqual(self.tree.model().fetch_to(1002).text(0), "Renamed")
+
+        self.conn.execute("DELETE FROM tasks WHERE id = 250")
+        self._refresh_tasks([250])
+        self.assertFalse(self.tree.model().is_unfetched(250))
+        self.assertIsNone(self.tree.model().fetch_to(250))
+
+    def test_drop_on_task_appends_after_unfetched_siblings(self):
+        """A task dropped on a parent goes after all of its children, fetched or not"""
+        self.tree = self._load("backlog")
+        with mock.patch("ui.task_tree.QTimer.singleShot"):
+            self.assertTrue(self.tree._drop_task(self.tree._task_item(2), self.tree._task_item(1)))
+
+        parent = self.tree._task_item(1)
+        self.assertEqual([parent.child(i).task_id for i in range(parent.childCount())], [1001, 2])
+        self.assertEqual(self.conn.execute(
+            "SELECT id FROM tasks WHERE parent_id = 1 ORDER BY display_order").fetchall(), [(1001,), (2,)])
+
+        # Nothing can be dropped into its own subtree
+        self.assertFalse(self.tree._drop_task(parent, self.tree._task_item(1001)))
+
+    def test_header_rows_are_fetched_under_expanded_headers(self):
+        """In the current tab, tasks are indexed under their priority header and fetched when it is expanded"""
+        self.conn.execute("UPDATE tasks SET status = 'Not Started'")
+        self.conn.commit()
+        self.tree = self._load("current")
+        headers = self.tree._collect_priority_headers()
+        high = headers["High"]
+        self.assertTrue(high.isExpanded())
+        self.assertTrue(0 < high.childCount() < 250)
+        self.assertEqual(high.child(0).task_id, 1)
+
+        # Collapsed headers are left unfetched
+        self.tree.collapseItem(high)
+        self.tree.load_tasks_tab()
+        self.assertEqual(self.tree._collect_priority_headers()["High"].childCount(), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+# src/tests/test_task_tree_model.py
+
+import os
+import sys
+from pathlib import Path
+import unittest
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+try:
+    from PyQt6.QtCore import QModelIndex
+    from PyQt6.QtWidgets import QApplication, QTreeView
+    from ui.task_tree_model import TaskTreeModel, TaskItem, FETCH_BATCH_SIZE
+except ImportError:  # PyQt6 is not available
+    TaskTreeModel = None
+
+@unittest.skipIf(TaskTreeModel is None, "PyQt6 is required")
+class TestTaskTreeModel(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.created = []
+        self.view = QTreeView()
+        self.model = TaskTreeModel(self._create_items, self.view)
+        self.view.setModel(self.model)
+
+        # 250 top-level tasks; task 3 has children 1000-1004 and 1003 has child 5000
+        rows_by_parent = {
+            None: [(task_id, f"Task {task_id}", None) for task_id in range(250)],
+            3: [(task_id, "Child", 3) for task_id in range(1000, 1005)],
+            1003: [(5000, "Grandchild", 1003)],
+        }
+        self.root = self.model.invisible_root()
+        self.model.add_unfetched_rows(self.root, rows_by_parent[None], rows_by_parent)
+
+    def tearDown(self):
+        self.view.deleteLater()
+
+    def _create_items(self, rows):
+        items = []
+        for row in rows:
+            item = TaskItem([row[1]])
+            item.task_id = row[0]
+            self.model.adopt_unfetched(item)
+            items.append(item)
+        self.created.extend(row[0] for row in rows)
+        return items
+
+    def _child_ids(self, item):
+        return [item.child(i).task_id for i in range(item.childCount())]
+
+    def test_root_fetches_in_batches(self):
+        """Top-level rows are built a batch at a time; their children are not"""
+        self.assertEqual(self.model.rowCount(), 0)
+        self.assertTrue(self.model.canFetchMore(QModelIndex()))
+
+        self.model.fetchMore(QModelIndex())
+        self.assertEqual(self.model.rowCount(), FETCH_BATCH_SIZE)
+        self.assertEqual(self.created, list(range(FETCH_BATCH_SIZE)))
+
+        parent = self.model.index(3, 0)
+        self.assertTrue(self.model.hasChildren(parent))
+        self.assertEqual(self.model.rowCount(parent), 0)
+        self.assertFalse(self.model.hasChildren(self.model.index(4, 0)))
+
+    def test_task_children_fetch_together(self):
+        """Fetching under a task builds all of its children, and only them"""
+        self.model.fetchMore(QModelIndex())
+        parent = self.model.index(3, 0)
+        self.model.fetchMore(parent)
+        self.assertEqual(self.model.rowCount(parent), 5)
+        self.assertFalse(self.model.canFetchMore(parent))
+        self.assertTrue(self.model.is_unfetched(5000))
+
+        child = self.model.index(3, 0, parent)
+        self.assertEqual(self.model.parent(child), parent)
+        self.assertEqual(self.model.item_from_index(child).task_id, 1003)
+
+    def test_fetch_to_builds_only_the_path(self):
+        """fetch_to builds a task's ancestors and leaves their other children unfetched"""
+        item = self.model.fetch_to(5000)
+        self.assertEqual(item.text(0), "Grandchild")
+        self.assertEqual(item.parent().task_id, 1003)
+        self.assertEqual(self.model.rowCount(), 4)
+        self.assertTrue(self.model.is_unfetched(4))
+        self.assertIsNone(self.model.fetch_to(9999))
+
+    def test_taken_task_keeps_its_children(self):
+        """A task taken out of the index hands its children to the item built for it"""
+        row = self.model.take_unfetched(3)
+        self.assertEqual(row[0], 3)
+        self.assertNotIn(3, self.model.unfetched_ids(self.root))
+
+        item = self._create_items([row])[0]
+        self.assertEqual(self.model.unfetched_ids(item), [1000, 1001, 1002, 1003, 1004])
+        self.assertEqual(sorted(self.model.unfetched_ids_below(item)), [1000, 1001, 1002, 1003, 1004, 5000])
+
+        self.model.discard_unfetched(1003)
+        self.assertFalse(self.model.is_unfetched(5000))
+        self.assertEqual(self.model.unfetched_ids(item), [1000, 1001, 1002, 1004])
+
+    def test_move_keeps_expanded_state(self):
+        """Moving a row within or between parents keeps it expanded"""
+        self.model.fetchMore(QModelIndex())
+        item = self.model.item_from_index(self.model.index(3, 0))
+        self.view.expand(self.model.index_for_item(item))
+        self.assertTrue(item.isExpanded())
+
+        self.model.move_item(item, self.root, 0)
+        self.assertEqual(self.root.indexOfChild(item), 0)
+        self.model.move_item(item, self.root, 10)
+        self.assertEqual(self.root.indexOfChild(item), 10)
+        self.assertEqual(self._child_ids(self.root)[9:12], [10, 3, 11])
+        self.assertTrue(item.isExpanded())
+
+        new_parent = self.root.child(0)
+        self.model.move_item(item, new_parent)
+        self.assertIs(item.parent(), new_parent)
+        self.assertTrue(item.isExpanded())
+        self.assertEqual(self.model.rowCount(), FETCH_BATCH_SIZE - 1)
+
+    def test_item_changes_reach_the_view(self):
+        """Setting data on an item in the model emits dataChanged for its row"""
+        self.model.fetchMore(QModelIndex())
+        changed = []
+        self.model.dataChanged.connect(lambda first, last, roles: changed.append(first.row()))
+        self.root.child(7).setText(0, "Renamed")
+        self.assertEqual(changed, [7])
+        self.assertEqual(self.model.data(self.model.index(7, 0)), "Renamed")
+
+        # Data handed out is a copy, like QTreeWidgetItem's
+        item = self.root.child(7)
+        item.setData(0, 256, {'id': 7})
+        item.data(0, 256)['id'] = 8
+        self.assertEqual(item.data(0, 256), {'id': 7})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+# src/utils/bee_requests.py
+"""
+Concurrent request helpers for the Bee API.
+
+These only depend on asyncio so they can be tested against a local fake
+client; BeeToDoManager wires them to the Bee SDK.
+"""
+
+import asyncio
+
+from utils.debug_logger import get_debug_logger
+debug = get_debug_logger()
+
+# Requests kept in flight at once
+DEFAULT_CONCURRENCY = 4
+
+# Safety stop in case the API ignores the page number and never runs out
+MAX_PAGES = 500
+
+
+async def fetch_all_pages(fetch_page, concurrency=DEFAULT_CONCURRENCY, progress=None, max_pages=MAX_PAGES):
+    """Fetch pages 1, 2, ... with up to `concurrency` requests in flight.
+
+    fetch_page(page) is a coroutine returning that page's items. Later pages
+    are requested speculatively before earlier ones return; fetching stops
+    at the first empty page and anything after it is discarded. progress is
+    called with the number of items fetched so far. Returns all items in
+    page order.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    pages = {}
+    first_empty = None
+    fetched = 0
+
+    async def fetch(page):
+        async with semaphore:
+            # A page past the end may have been queued before we knew
+            if first_empty is not None and page > first_empty:
+                return page, []
+            return page, await fetch_page(page)
+
+    in_flight = set()
+    next_page = 1
+    try:
+        while True:
+            while (len(in_flight) < concurrency and next_page <= max_pages
+                   and (first_empty is None or next_page < first_empty)):
+                in_flight.add(asyncio.ensure_future(fetch(next_page)))
+                next_page += 1
+            if not in_flight:
+                break
+
+            done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                page, items = future.result()
+                if not items:
+                    first_empty = page if first_empty is None else min(first_empty, page)
+                    continue
+                pages[page] = items
+                fetched += len(items)
+                if progress:
+                    progress(fetched)
+    finally:
+        for future in in_flight:
+            future.cancel()
+
+    if first_empty is None and next_page > max_pages:
+        debug.warning(f"Stopped fetching after {max_pages} pages")
+    items = [item for page in sorted(pages) if first_empty is None or page < first_empty
+             for item in pages[page]]
+    debug.debug(f"Fetched {len(items)} items from {len(pages)} pages")
+    return items
+
+
+# Attempts after the first failure, and the delay before the first retry
+# (doubled for each further attempt)
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF = 0.5
+
+
+async def run_bounded(items, action, concurrency=DEFAULT_CONCURRENCY, retries=DEFAULT_RETRIES,
+                      backoff=DEFAULT_BACKOFF, on_result=None, is_cancelled=None):
+    """Run the coroutine action(item) for every item, `concurrency` at a time.
+
+    Failed items are retried up to `retries` times with exponential backoff.
+    on_result(item, success) is called as each item finishes. Items not yet
+    started when is_cancelled() becomes true are skipped. Returns
+    (item, success) pairs in completion order.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    results = []
+
+    async def run(item):
+        async with semaphore:
+            if is_cancelled and is_cancelled():
+                return
+            for attempt in range(retries + 1):
+                try:
+                    await action(item)
+                    success = True
+                    break
+                except Exception as e:
+                    success = False
+                    if attempt == retries:
+                        debug.error(f"Giving up on {item} after {attempt + 1} attempts: {e}")
+                    else:
+                        debug.warning(f"Attempt {attempt + 1} for {item} failed, retrying: {e}")
+                        await asyncio.sleep(backoff * (2 ** attempt))
+        results.append((item, success))
+        if on_result:
+            on_result(item, success)
+
+    await asyncio.gather(*(run(item) for item in items))
+    debug.debug(f"Finished {len(results)} of {len(items)} items")
+    return results
@@ -19,8 +19,8 @@ print("-" * 60)
 
 # Try to import the settings manager
 try:
-    from ui.app_settings import SettingsManager
-    settings = SettingsManager()
+    from ui.app_settings import get_settings_manager
+    settings = get_settings_manager()
     settings_path = Path(settings.settings_file)
     db_path_from_settings = Path(settings.get_setting("database_path"))
     
@@ -1,45 +1,73 @@
 # In src/utils/debug_decorator.py
 from functools import wraps
+import logging
+import reprlib
+import time
 from .debug_logger import get_debug_logger
 
-def debug_method(func):
+# Bounded repr for arguments and results, so logging a QTreeWidgetItem or a
+# large task dict never costs more than a short string
+_arg_repr = reprlib.Repr()
+_arg_repr.maxstring = 80
+_arg_repr.maxother = 80
+_arg_repr.maxlist = 5
+_arg_repr.maxdict = 5
+_arg_repr.maxlevel = 2
+
+def debug_method(func=None, *, timing=False, capture_args=True):
     """
     Decorator to automatically log method entry, exit and exceptions.
     Uses the format: [log time]: [Class.method]: message
+
+    The decision is made when the decorator runs: if debugging has been
+    configured off the original function is returned unchanged, so decorated
+    methods cost nothing in production. Modules imported before
+    init_debugger runs (main.py needs app settings to configure it) get a
+    wrapper that checks logger.enabled on each call instead. Use @debug_method(timing=True) to log
+    how long a call took, or capture_args=False to skip argument/result reprs.
     """
+    if func is None:
+        # Called with options: @debug_method(timing=True)
+        return lambda f: debug_method(f, timing=timing, capture_args=capture_args)
+
+    logger = get_debug_logger()
+    if logger.configured and not logger.enabled:
+        return func
+
+    method_name = func.__name__
+
     @wraps(func)
     def wrapper(*args, **kwargs):
-        logger = get_debug_logger()
-        
-        # Force debug logger to be enabled, eliminate filtering
-        logger._enabled = False
-        logger._debug_all = False
-        
-        # More accurate class name detection
+        # Logging may have been switched off since import
+        if not logger.enabled:
+            return func(*args, **kwargs)
+
         class_name = args[0].__class__.__name__ if args and hasattr(args[0], '__class__') else None
-        method_name = func.__name__
-        
-        # Add direct console output to verify decorator is running
-        print(f"DEBUG DECORATOR: {class_name}.{method_name} called")
-        
-        # Always log regardless of filters
-        logger.debug(f"ENTER ({', '.join([repr(a) for a in args[1:]] + [f'{k}={repr(v)}' for k, v in kwargs.items()])})")
-        
+        if not logger.should_log(class_name, method_name):
+            return func(*args, **kwargs)
+
+        if capture_args:
+            arg_text = ', '.join([_arg_repr.repr(a) for a in args[1:]] +
+                                 [f'{k}={_arg_repr.repr(v)}' for k, v in kwargs.items()])
+            logger.log_for(class_name, method_name, f"ENTER ({arg_text})")
+        else:
+            logger.log_for(class_name, method_name, "ENTER")
+
+        start_time = time.perf_counter() if timing else None
         try:
             # Call the original function
             result = func(*args, **kwargs)
-            
-            # Log method exit with result
-            if result is not None:
-                logger.debug(f"EXIT -> {repr(result)}")
-            else:
-                logger.debug(f"EXIT")
-                
-            return result
-            
         except Exception as e:
             # Log any exceptions
-            logger.error(f"EXCEPTION: {type(e).__name__}: {str(e)}")
+            logger.log_for(class_name, method_name, f"EXCEPTION: {type(e).__name__}: {str(e)}", level=logging.ERROR)
             raise  # Re-raise the exception
-            
-    return wrapper
\ No newline at end of file
+
+        # Log method exit with result
+        elapsed = f" in {time.perf_counter() - start_time:.4f}s" if timing else ""
+        if result is not None and capture_args:
+            logger.log_for(class_name, method_name, f"EXIT{elapsed} -> {_arg_repr.repr(result)}")
+        else:
+            logger.log_for(class_name, method_name, f"EXIT{elapsed}")
+        return result
+
+    return wrapper
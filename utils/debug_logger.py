@@ -3,10 +3,15 @@
 import logging
 import os
 import sys
-import inspect
 import datetime
 from pathlib import Path
 
+# Frames from this file are skipped when looking for the caller
+_THIS_FILE = __file__
+
+# code object -> whether its first argument is self, so caller lookup never re-inspects a function
+_method_codes = {}
+
 class DebugLogger:
     """
     Flexible debugging utility that can log to file, console, or both.
@@ -35,10 +40,12 @@ class DebugLogger:
         self._class_filters = []
         self._method_filters = []
         self._debug_all = False
+        self._configured = False
    
     def configure(self, enabled=True, log_to_file=True, log_to_console=True, 
                 log_file_path=None, debug_all=False, debug_level=logging.DEBUG):
         """Configure the debug logger settings."""
+        self._configured = True
         self._enabled = enabled
         self._log_to_file = log_to_file
         self._log_to_console = log_to_console
@@ -144,36 +151,63 @@ class DebugLogger:
         # Neither class nor method matched filters
         return False
     
+    def isEnabledFor(self, level=logging.DEBUG):
+        """Cheap guard for call sites that need to do work to build a message."""
+        return self._enabled and self._logger is not None and self._logger.isEnabledFor(level)
+    
+    @property
+    def enabled(self):
+        return self._enabled
+
+    @property
+    def configured(self):
+        """Whether configure() has run (init_debugger always calls it)"""
+        return self._configured
+    
     def _get_caller_info(self):
         """Get information about the caller."""
-        stack = inspect.stack()
-        # Look for the first frame that isn't in this file
-        for frame in stack[2:]:  # Skip this method and the log method
-            module = inspect.getmodule(frame[0])
-            if module and module.__name__ != __name__:
-                # Get frame info
-                function = frame.function
-                
-                # Try to determine class name if method is within a class
-                class_name = None
-                try:
-                    if 'self' in frame[0].f_locals:
-                        class_name = frame[0].f_locals['self'].__class__.__name__
-                except:
-                    pass
-                
-                return {
-                    'function': function,
-                    'class': class_name
-                }
+        # Walk raw frames instead of inspect.stack(), which reads source for every frame
+        frame = sys._getframe(2)  # Skip this method and the log method
+        while frame is not None and frame.f_code.co_filename == _THIS_FILE:
+            frame = frame.f_back
+        if frame is None:
+            return None
+        
+        # Whether a function is a method only depends on its code object
+        code = frame.f_code
+        is_method = _method_codes.get(code)
+        if is_method is None:
+            is_method = code.co_argcount > 0 and code.co_varnames[0] == 'self'
+            _method_codes[code] = is_method
         
-        return None
+        # Use the instance's class so subclasses are reported by their own name
+        class_name = None
+        if is_method:
+            try:
+                class_name = frame.f_locals['self'].__class__.__name__
+            except Exception:
+                pass
+        
+        return {
+            'function': code.co_name,
+            'class': class_name
+        }
     
-    def log(self, message, level=logging.DEBUG):
-        """Log a debug message if it passes the filters."""
+    def log(self, message, *args, level=logging.DEBUG):
+        """Log a debug message if it passes the filters.
+        
+        Extra args are %-formatted into the message only when it is emitted,
+        so disabled logging costs a single attribute check.
+        """
         if not self._enabled or not self._logger:
             return
         
+        if args:
+            try:
+                message = message % args
+            except (TypeError, ValueError):
+                message = f"{message} {args}"
+        
         caller_info = self._get_caller_info()
         
         # Skip debug.py's own logs
@@ -181,45 +215,58 @@ class DebugLogger:
             self._logger.log(level, message)
             return
         
+        if caller_info is None:
+            self._logger.log(level, message)
+            return
+        
         # Check if we should log this message based on caller info
-        if caller_info and not self.should_log(caller_info.get('class'), caller_info.get('function')):
+        if not self.should_log(caller_info.get('class'), caller_info.get('function')):
             return
         
+        self._log_with_prefix(caller_info.get('class'), caller_info.get('function'), message, level)
+    
+    def log_for(self, class_name, method_name, message, level=logging.DEBUG):
+        """Log a message on behalf of a known Class.method (used by @debug_method)."""
+        if not self._enabled or not self._logger:
+            return
+        if not self.should_log(class_name, method_name):
+            return
+        self._log_with_prefix(class_name, method_name, message, level)
+    
+    def _log_with_prefix(self, class_name, method_name, message, level):
         # Format the message with caller info in the specified format: [Class.method]: message
-        formatted_message = message
-        if caller_info:
-            class_name = caller_info.get('class', '')
-            method_name = caller_info.get('function', '')
-            
-            if class_name:
-                prefix = f"[{class_name}.{method_name}]: "
-            else:
-                prefix = f"[{method_name}]: "
-                
-            formatted_message = f"{prefix}{message}"
+        if class_name:
+            prefix = f"[{class_name}.{method_name}]: "
+        else:
+            prefix = f"[{method_name}]: "
         
         # Log the message
-        self._logger.log(level, formatted_message)
+        self._logger.log(level, f"{prefix}{message}")
     
-    def debug(self, message):
+    def debug(self, message, *args):
         """Log a debug level message."""
-        self.log(message, logging.DEBUG)
+        if self._enabled:
+            self.log(message, *args, level=logging.DEBUG)
     
-    def info(self, message):
+    def info(self, message, *args):
         """Log an info level message."""
-        self.log(message, logging.INFO)
+        if self._enabled:
+            self.log(message, *args, level=logging.INFO)
     
-    def warning(self, message):
+    def warning(self, message, *args):
         """Log a warning level message."""
-        self.log(message, logging.WARNING)
+        if self._enabled:
+            self.log(message, *args, level=logging.WARNING)
     
-    def error(self, message):
+    def error(self, message, *args):
         """Log an error level message."""
-        self.log(message, logging.ERROR)
+        if self._enabled:
+            self.log(message, *args, level=logging.ERROR)
     
-    def critical(self, message):
+    def critical(self, message, *args):
         """Log a critical level message."""
-        self.log(message, logging.CRITICAL)
+        if self._enabled:
+            self.log(message, *args, level=logging.CRITICAL)
     
     def disable(self):
         """Disable the debugger."""
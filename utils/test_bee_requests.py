@@ -0,0 +1,109 @@
+# src/tests/test_bee_requests.py
+
+import sys
+from pathlib import Path
+import unittest
+import asyncio
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.bee_requests import fetch_all_pages, run_bounded
+
+class FakeBeeClient:
+    """Local stand-in for the Bee SDK: paged to-dos with a small delay per request"""
+
+    def __init__(self, todo_count, page_size=10, delay=0.01):
+        self.todos = [{"id": i, "text": f"To-do {i}"} for i in range(todo_count)]
+        self.page_size = page_size
+        self.delay = delay
+        self.requested_pages = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.failed_once = set()
+
+    async def get_todos(self, user, page=1):
+        self.requested_pages.append(page)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            start = (page - 1) * self.page_size
+            return {"todos": self.todos[start:start + self.page_size]}
+        finally:
+            self.in_flight -= 1
+
+    async def delete_todo(self, user, todo_id):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            # Every third to-do fails once, like a rate-limited request
+            if todo_id % 3 == 0 and todo_id not in self.failed_once:
+                self.failed_once.add(todo_id)
+                raise ConnectionError("Too many requests")
+            if todo_id < 0:
+                raise ValueError("No such to-do")
+            self.todos = [todo for todo in self.todos if todo["id"] != todo_id]
+        finally:
+            self.in_flight -= 1
+
+class TestBeeRequests(unittest.TestCase):
+
+    def _fetch_all(self, client, **kwargs):
+        async def fetch_page(page):
+            return (await client.get_todos("me", page=page))["todos"]
+        return asyncio.run(fetch_all_pages(fetch_page, **kwargs))
+
+    def test_pages_fetched_concurrently_in_order(self):
+        """All items come back in page order with bounded concurrency"""
+        client = FakeBeeClient(95)
+        progress = []
+        todos = self._fetch_all(client, concurrency=4, progress=progress.append)
+
+        self.assertEqual([todo["id"] for todo in todos], list(range(95)))
+        self.assertEqual(client.max_in_flight, 4)
+        self.assertEqual(progress[-1], 95)
+        # Stops shortly after the first empty page instead of running on
+        self.assertLessEqual(max(client.requested_pages), 11 + 4)
+
+    def test_full_last_page_is_not_mistaken_for_the_end(self):
+        """A page of exactly page_size items is followed by another request"""
+        client = FakeBeeClient(20)
+        self.assertEqual(len(self._fetch_all(client, concurrency=2)), 20)
+        self.assertIn(3, client.requested_pages)
+
+    def test_max_pages_stops_endless_api(self):
+        async def fetch_page(page):
+            return [page]
+        self.assertEqual(asyncio.run(fetch_all_pages(fetch_page, max_pages=7)), list(range(1, 8)))
+
+    def test_bounded_delete_retries_and_streams_results(self):
+        """Deletes run concurrently, transient failures are retried, results arrive per item"""
+        client = FakeBeeClient(30)
+        streamed = []
+
+        async def delete(todo_id):
+            await client.delete_todo("me", todo_id)
+
+        results = asyncio.run(run_bounded(list(range(30)) + [-1], delete, concurrency=5, retries=2,
+                                          backoff=0.001, on_result=lambda *r: streamed.append(r)))
+
+        self.assertEqual(client.todos, [])
+        self.assertEqual(client.max_in_flight, 5)
+        self.assertEqual(streamed, results)
+        self.assertEqual(sorted(todo_id for todo_id, ok in results if not ok), [-1])
+
+    def test_cancel_skips_items_not_started(self):
+        client = FakeBeeClient(20)
+        done = []
+
+        async def delete(todo_id):
+            await client.delete_todo("me", todo_id)
+
+        asyncio.run(run_bounded(list(range(1, 20, 3)), delete, concurrency=1, retries=0,
+                                on_result=lambda *r: done.append(r), is_cancelled=lambda: len(done) >= 2))
+        self.assertEqual(len(done), 2)
+
+if __name__ == '__main__':
+    unittest.main()
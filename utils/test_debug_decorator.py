@@ -0,0 +1,49 @@
+# src/tests/test_debug_decorator.py
+
+import sys
+from pathlib import Path
+import unittest
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.debug_logger import get_debug_logger
+from utils.debug_decorator import debug_method
+
+class TestDebugMethod(unittest.TestCase):
+
+    def setUp(self):
+        self.logger = get_debug_logger()
+        self.saved_state = (self.logger._configured, self.logger._enabled)
+
+    def tearDown(self):
+        self.logger._configured, self.logger._enabled = self.saved_state
+
+    def test_configured_off_returns_original_function(self):
+        self.logger._configured, self.logger._enabled = True, False
+
+        def method(self):
+            return 1
+
+        self.assertIs(debug_method(method), method)
+
+    def test_decorated_before_configure_checks_at_call_time(self):
+        self.logger._configured, self.logger._enabled = False, False
+        calls = []
+
+        def method(self):
+            return 1
+
+        decorated = debug_method(method)
+        self.assertIsNot(decorated, method)
+
+        self.logger._configured, self.logger._enabled = True, True
+        self.logger.log_for = lambda *args, **kwargs: calls.append(args)
+        try:
+            self.assertEqual(decorated(object()), 1)
+        finally:
+            del self.logger.log_for
+        self.assertTrue(calls)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+# src/tests/test_debug_logger.py
+
+import sys
+from pathlib import Path
+import unittest
+import logging
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.debug_logger import get_debug_logger
+
+class TestDebugLogger(unittest.TestCase):
+
+    def setUp(self):
+        self.logger = get_debug_logger()
+        self.saved_state = (self.logger._enabled, self.logger._logger, self.logger._debug_all)
+        self.logger._enabled, self.logger._debug_all = True, True
+        self.logger._logger = logging.getLogger('TaskOrganizerDebugTest')
+        self.logger._logger.setLevel(logging.DEBUG)
+
+    def tearDown(self):
+        self.logger._enabled, self.logger._logger, self.logger._debug_all = self.saved_state
+
+    def test_lazy_args_are_not_taken_as_level(self):
+        """Arguments after the message are formatted into it; the level stays DEBUG"""
+        with self.assertLogs('TaskOrganizerDebugTest', level=logging.DEBUG) as logs:
+            self.logger.log("x=%s y=%s", 30, "b")
+        self.assertEqual(logs.records[0].levelno, logging.DEBUG)
+        self.assertTrue(logs.records[0].getMessage().endswith("x=30 y=b"))
+
+    def test_level_wrappers(self):
+        """error() logs at ERROR with its arguments formatted in"""
+        with self.assertLogs('TaskOrganizerDebugTest', level=logging.DEBUG) as logs:
+            self.logger.log("plain", level=logging.WARNING)
+            self.logger.error("failed %d times", 3)
+        self.assertEqual([record.levelno for record in logs.records], [logging.WARNING, logging.ERROR])
+        self.assertTrue(logs.records[1].getMessage().endswith("failed 3 times"))
+
+if __name__ == '__main__':
+    unittest.main()